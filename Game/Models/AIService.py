@@ -0,0 +1,407 @@
+import os
+import queue
+import socket
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from .GameState import GameState
+from .IA import IA
+from .Plateau import Plateau
+
+
+class AIServer:
+    """Class answering "best move" requests from many game processes in one AI process
+
+    Game processes connect over a Unix socket (a local TCP port where Unix sockets are not
+    available), prove that they know the key of the installation (KEY_FILE) before anything
+    they send is unpickled, and send the snapshot of their position (GameState.to_bytes)
+    with a deadline. Requests arriving within batch_window of each other form a batch: the
+    requests for the same position, or for its mirror, are answered by a single evaluation,
+    and the distinct positions are then evaluated one after another, earliest deadline
+    first, ordered by their moves so that consecutive positions share their first moves and
+    the boards only undo and replay the moves that differ. The answers are kept in a cache
+    shared by all the clients, keyed by the canonical hash of the position and the side to
+    move, and the game history is loaded once for all of them. A request whose deadline has
+    passed before its evaluation gets None, so the client can fall back to its own
+    evaluation.
+    """
+    ADDRESS = '../data/ai_service.sock' if hasattr(socket, "AF_UNIX") else ("127.0.0.1", 5051)
+    KEY_FILE = '../data/ai_service.key'
+
+    def __init__(self, address=ADDRESS, batch_window=0.005, max_batch=64, cache_size=100000, authkey=None):
+        """Initializes a stopped server
+
+        Args:
+            address (str | tuple): The path of the Unix socket, or the (host, port) to listen on.
+            batch_window (float): The time to wait for more requests after the first one of a batch, in seconds.
+            max_batch (int): The largest number of requests answered together.
+            cache_size (int): The largest number of answers kept in the cache.
+            authkey (bytes): The key the clients must know, the one of KEY_FILE when omitted.
+        """
+        self._address = address
+        self._authkey = authkey
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._boards = {}
+        self._requests = queue.Queue()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._listener = None
+        self._running = False
+        self._stats = {"requests": 0, "batches": 0, "shared": 0, "cache_hits": 0, "expired": 0}
+
+    @staticmethod
+    def load_authkey(path=KEY_FILE):
+        """Returns the key shared by the server and the clients of this installation
+
+        The key is random and created on first use, in a file only its owner can read, so
+        that other users of the machine cannot send requests to the server.
+
+        Args:
+            path (str): The path of the key file.
+
+        Returns:
+            bytes: The key.
+        """
+        try:
+            with open(path, 'rb') as key_file:
+                key = key_file.read()
+            if key:
+                return key
+        except FileNotFoundError:
+            pass
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        key = os.urandom(32)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as key_file:
+            key_file.write(key)
+        try:
+            # The first process to create the key wins, the others read it
+            os.link(temporary_path, path)
+        except FileExistsError:
+            with open(path, 'rb') as key_file:
+                key = key_file.read()
+        finally:
+            os.remove(temporary_path)
+        return key
+
+    def get_stats(self):
+        """Getter for the number of requests, batches, requests sharing the evaluation of
+        another request of their batch, cache hits and expired requests
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        """Starts listening and evaluating in background threads
+
+        Returns:
+            bool: True if the server is running, False if the address is already in use.
+        """
+        if self._running:
+            return True
+        if self._authkey is None:
+            self._authkey = AIServer.load_authkey()
+
+        if isinstance(self._address, str) and os.path.exists(self._address):
+            # A socket file left by a server which did not stop cleanly is removed
+            try:
+                Client(self._address, authkey=self._authkey).close()
+                return False
+            except AuthenticationError:
+                return False
+            except OSError:
+                os.remove(self._address)
+
+        try:
+            self._listener = Listener(self._address, authkey=self._authkey)
+        except OSError:
+            return False
+
+        self._running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+        threading.Thread(target=self._run, daemon=True).start()
+        return True
+
+    def stop(self):
+        """Stops the server and disconnects the clients
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._requests.put(None)
+        try:
+            # Wakes up the thread blocked in accept
+            Client(self._address, authkey=self._authkey).close()
+        except (OSError, AuthenticationError):
+            pass
+        self._listener.close()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+
+    def serve_forever(self):
+        """Runs the server until it is interrupted with Ctrl-C
+
+        Returns:
+            bool: False if the server could not start.
+        """
+        if not self.start():
+            return False
+        try:
+            while self._running:
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return True
+
+    def _accept(self):
+        """Accepts the connections of the game processes
+        """
+        while self._running:
+            try:
+                connection = self._listener.accept()
+            except AuthenticationError:
+                # A process which does not know the key, nothing it sent has been unpickled
+                continue
+            except OSError:
+                return
+            if not self._running:
+                connection.close()
+                return
+            with self._lock:
+                self._connections.append(connection)
+            threading.Thread(target=self._receive, args=(connection,), daemon=True).start()
+
+    def _receive(self, connection):
+        """Queues the requests of one game process until it disconnects
+
+        Args:
+            connection (multiprocessing.connection.Connection): The connection of the process.
+        """
+        try:
+            while self._running:
+                request_id, snapshot, deadline = connection.recv()
+                self._requests.put((time.monotonic() + deadline, request_id, snapshot, connection))
+        except (EOFError, OSError, ValueError, TypeError):
+            pass
+        finally:
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            connection.close()
+
+    def _collect_batch(self):
+        """Waits for a request, then gathers those arriving within the batch window
+
+        Returns:
+            list: The requests of the batch, empty when the server stops.
+        """
+        request = self._requests.get()
+        if request is None:
+            return []
+        batch = [request]
+        end = time.monotonic() + self._batch_window
+        while len(batch) < self._max_batch:
+            try:
+                request = self._requests.get(timeout=max(0.0, end - time.monotonic()))
+            except queue.Empty:
+                break
+            if request is None:
+                self._requests.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        """Answers the batches of requests
+        """
+        while self._running:
+            batch = self._collect_batch()
+            if not batch:
+                return
+            with self._lock:
+                self._stats["requests"] += len(batch)
+                self._stats["batches"] += 1
+
+            # The requests for the same position, or for its mirror, share one evaluation
+            positions = {}
+            for request in batch:
+                try:
+                    state = GameState.from_bytes(request[2])
+                except ValueError:
+                    self._answer(request, None)
+                    continue
+                key, mirrored = AIServer._key(state)
+                positions.setdefault(key, (state, mirrored, []))[2].append((request, mirrored))
+
+            # Earliest deadlines first, and positions sharing their first moves next to each other
+            ordered = sorted(positions.values(),
+                             key=lambda position: (min(request[0] for request, _ in position[2]), bytes(position[0].moves)))
+            for state, mirrored, requests in ordered:
+                now = time.monotonic()
+                waiting = sum(1 for request, _ in requests if now <= request[0])
+                with self._lock:
+                    self._stats["expired"] += len(requests) - waiting
+                    self._stats["shared"] += max(0, waiting - 1)
+                column = self.evaluate(state) if waiting else None
+
+                for request, request_mirrored in requests:
+                    answer = None
+                    if now <= request[0] and column is not None:
+                        answer = column if request_mirrored == mirrored else state.variant.mirror_column(column)
+                    self._answer(request, answer)
+
+    @staticmethod
+    def _answer(request, column):
+        """Sends the answer to a request, ignoring the clients which disconnected
+
+        Args:
+            request (tuple): The deadline, id, snapshot and connection of the request.
+            column (int): The column to play, None if there is no answer.
+        """
+        try:
+            request[3].send((request[1], column))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _key(state):
+        """Returns the cache key of a position and whether it is the mirror of the canonical one
+
+        Args:
+            state (GameState): The position.
+
+        Returns:
+            tuple: The key (variant, canonical hash and side to move) and True if the position is mirrored.
+        """
+        variant = state.variant
+        key, mirrored = state.canonical_hash()
+        if state.player_to_move() == -1:
+            key ^= variant.zobrist_side
+        return (variant.rows, variant.columns, variant.connect, key), mirrored
+
+    def _board(self, state):
+        """Returns a board of the server set to a position, replaying only the moves that differ
+
+        Args:
+            state (GameState): The position to reach.
+
+        Returns:
+            Plateau: The board of the variant and starter of the position, set to the position.
+        """
+        variant = state.variant
+        key = (variant.rows, variant.columns, variant.connect, state.starter)
+        board = self._boards.get(key)
+        if board is None:
+            board = Plateau(variant.rows, variant.columns, variant.connect)
+            self._boards[key] = board
+        board.set_position(state)
+        return board
+
+    def evaluate(self, state):
+        """Returns the best move of the player to move, from the cache when possible
+
+        Args:
+            state (GameState): The position.
+
+        Returns:
+            int: The column to play, None if the game is over.
+        """
+        key, mirrored = AIServer._key(state)
+        with self._lock:
+            column = self._cache.get(key)
+            if column is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return state.variant.mirror_column(column) if mirrored else column
+
+        if state.winner() != 0 or state.is_full():
+            return None
+        board = self._board(state)
+        evaluated_moves = IA.evaluate_moves(board, IA.generate_possible_moves(board), verbose=False,
+                                            ia=board.get_player_to_move())
+        _, column = max(evaluated_moves, key=evaluated_moves.get)
+
+        with self._lock:
+            # The column is stored for the canonical position
+            self._cache[key] = state.variant.mirror_column(column) if mirrored else column
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return column
+
+
+class AIClient:
+    """Class asking an AIServer for the moves of a game process
+    """
+    def __init__(self, address=AIServer.ADDRESS, authkey=None):
+        """Initializes a disconnected client
+
+        Args:
+            address (str | tuple): The address of the server.
+            authkey (bytes): The key of the server, the one of AIServer.KEY_FILE when omitted.
+        """
+        self._address = address
+        self._authkey = authkey
+        self._connection = None
+        self._next_id = 0
+
+    def connect(self):
+        """Connects to the server if not connected yet
+
+        Returns:
+            bool: True if the client is connected.
+        """
+        if self._connection is None:
+            try:
+                if self._authkey is None:
+                    self._authkey = AIServer.load_authkey()
+                self._connection = Client(self._address, authkey=self._authkey)
+            except (OSError, AuthenticationError):
+                return False
+        return True
+
+    def close(self):
+        """Closes the connection to the server
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def best_move(self, plateau, deadline=1.0):
+        """Asks the server for the best move of the player to move
+
+        Args:
+            plateau (Plateau): The instance of the game board.
+            deadline (float): The time the answer may take, in seconds.
+
+        Returns:
+            int: The column to play, None if the server is not running or did not answer in time.
+        """
+        if not self.connect():
+            return None
+
+        self._next_id += 1
+        request_id = self._next_id
+        end = time.monotonic() + deadline
+        try:
+            self._connection.send((request_id, plateau.snapshot(), deadline))
+            while self._connection.poll(max(0.0, end - time.monotonic())):
+                answer_id, column = self._connection.recv()
+                # Answers to earlier requests which timed out are skipped
+                if answer_id == request_id:
+                    return column
+        except (EOFError, OSError):
+            self.close()
+        return None
@@ -0,0 +1,206 @@
+import os
+from multiprocessing import Pool
+
+import pandas as pd
+
+from .Database import Database
+from .GameCode import GameCode
+from .Plateau import Plateau
+from .Search import Search
+from .Variant import Variant
+
+
+class Analyzer:
+    """Class annotating stored games with engine evaluations
+
+    Every stored game is replayed from its shots and each position is searched with a
+    fixed node budget. The evaluation of the move played, the best move and the error
+    (evaluation lost by the move played) are stored in a side table keyed by game id.
+    When the search ran out of budget before scoring the move played, its evaluation and
+    error are left empty and the move is left out of the error statistics.
+    Games are spread across processes and each finished game is appended to the side
+    table at once, so an interrupted run resumes where it stopped. Games played move for
+    move more than once are recognized by their packed code and searched only once.
+    """
+    ANALYSIS_FILE = '../data/game_analysis.csv'
+    COLUMNS = ["game_id", "date", "ply", "player", "column", "evaluation", "best_column", "best_evaluation", "error"]
+
+    # Board reused by all the games analyzed in a worker process
+    _worker_plateau = None
+
+    @staticmethod
+    def _init_worker():
+        """Creates the board reused by the worker process
+        """
+        Analyzer._worker_plateau = Plateau()
+
+    @staticmethod
+    def analyze_game(game_id, date, player_who_starts, shots, max_depth, node_budget):
+        """Replays a game and evaluates every move with the engine
+
+        Args:
+            game_id (int): The id of the game.
+            date (str): The date of the game, stored to detect renumbered ids.
+            player_who_starts (int): -1 when the AI started and 1 when the player started.
+            shots (list): The positions of the moves played, in order.
+            max_depth (int): The maximum depth of each search.
+            node_budget (int): The number of nodes searched for each position.
+
+        Returns:
+            list: One row per move, with the columns of Analyzer.COLUMNS, the evaluation and
+            the error being None when the search did not score the move played.
+        """
+        plateau = Analyzer._worker_plateau or Plateau()
+        # Stored games are played on the classic board
+        plateau.set_variant(Variant.get())
+        plateau.set_player_who_starts(player_who_starts)
+        search = Search(plateau, max_depth=max_depth, node_budget=node_budget)
+
+        rows = []
+        for ply, (_, col) in enumerate(shots):
+            player = plateau.get_player_to_move()
+            best_column, best_score, column_scores = search.search()
+            evaluation = column_scores.get(col)
+            error = None if evaluation is None else best_score - evaluation
+            rows.append([game_id, date, ply, player, col, evaluation, best_column, best_score, error])
+            plateau.play(col)
+
+        return rows
+
+    @staticmethod
+    def _analyze_task(task):
+        """Unpacks a task for the process pool
+        """
+        return Analyzer.analyze_game(*task)
+
+    @staticmethod
+    def load_analysis():
+        """Loads the side table of analyzed moves
+
+        Rows cut by an interruption and rows written twice for the same move are dropped.
+        The moves the search did not score are kept, with an empty evaluation and error.
+
+        Returns:
+            pd.DataFrame: The analyzed moves, empty if no game has been analyzed.
+        """
+        try:
+            df = pd.read_csv(Analyzer.ANALYSIS_FILE, on_bad_lines="skip")
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return pd.DataFrame(columns=Analyzer.COLUMNS)
+
+        # A cut row misses its last values, or has an evaluation without its error
+        df = df.dropna(subset=[column for column in Analyzer.COLUMNS if column not in ("evaluation", "error")])
+        df = df[df["evaluation"].isna() == df["error"].isna()]
+        return df.drop_duplicates(subset=["game_id", "date", "ply"], keep="last")
+
+    @staticmethod
+    def analyze_all(processes=None, max_depth=8, node_budget=20000, chunksize=4):
+        """Analyzes every stored game which is not in the side table yet
+
+        Args:
+            processes (int): The number of worker processes, one per CPU when omitted.
+            max_depth (int): The maximum depth of each search.
+            node_budget (int): The number of nodes searched for each position.
+            chunksize (int): The number of games sent to a worker at once.
+
+        Returns:
+            int: The number of games analyzed by this run.
+        """
+        df = Database.load_game_data()
+        if df.empty:
+            return 0
+
+        # A game is done when every one of its moves has been analyzed
+        analysis = Analyzer.load_analysis()
+        analyzed_moves = analysis.groupby(["game_id", "date"]).size().to_dict()
+
+        # Games played move for move more than once are searched once, their rows being copied
+        copies = {}
+        tasks = []
+        for row, code in zip(df.itertuples(index=False), Database.game_codes(df)):
+            if code is None:
+                continue
+            game = (row.id, str(row.date))
+            if analyzed_moves.get(game, 0) >= GameCode.length(code):
+                continue
+            key = (row.player_who_starts, code)
+            if key not in copies:
+                copies[key] = []
+                tasks.append((*game, row.player_who_starts, GameCode.decode(code), max_depth, node_budget))
+            copies[key].append(game)
+        copies = {games[0]: games for games in copies.values()}
+
+        if not tasks:
+            return 0
+        total = sum(len(games) for games in copies.values())
+
+        write_header = not os.path.isfile(Analyzer.ANALYSIS_FILE) or os.path.getsize(Analyzer.ANALYSIS_FILE) == 0
+        if not write_header:
+            # Terminate a line cut by an interruption so that new rows start on their own line
+            with open(Analyzer.ANALYSIS_FILE, 'rb') as analysis_file:
+                analysis_file.seek(-1, os.SEEK_END)
+                cut_line = analysis_file.read(1) != b"\n"
+            if cut_line:
+                with open(Analyzer.ANALYSIS_FILE, 'a') as analysis_file:
+                    analysis_file.write("\n")
+
+        analyzed = 0
+        with open(Analyzer.ANALYSIS_FILE, 'a') as analysis_file, \
+                Pool(processes, initializer=Analyzer._init_worker) as pool:
+            if write_header:
+                analysis_file.write(",".join(Analyzer.COLUMNS) + "\n")
+
+            for rows in pool.imap_unordered(Analyzer._analyze_task, tasks, chunksize=chunksize):
+                # All the moves of a game are written at once, then flushed to disk,
+                # so an interruption never leaves a game half recorded
+                games = copies[(rows[0][0], rows[0][1])]
+                analysis_file.write("".join(",".join("" if value is None else str(value) for value in [*game, *row[2:]]) + "\n"
+                                            for game in games for row in rows))
+                analysis_file.flush()
+                os.fsync(analysis_file.fileno())
+                analyzed += len(games)
+                print(f"\rAnalyzed games: {analyzed}/{total}", end="")
+
+        print()
+        return analyzed
+
+    @staticmethod
+    def blunder_statistics(blunder_threshold=50):
+        """Computes move error statistics per player from the side table
+
+        Args:
+            blunder_threshold (int): The error from which a move counts as a blunder.
+
+        Returns:
+            pd.DataFrame: For each player, the number of moves analyzed, the average error,
+            the number of blunders and the blunder rate, the moves the search did not score
+            being left out.
+        """
+        analysis = Analyzer.load_analysis()
+        if analysis.empty:
+            return pd.DataFrame()
+
+        analysis["player_str"] = analysis["player"].apply(lambda x: "Player" if x == 1 else "IA")
+        analysis["is_blunder"] = analysis["error"] >= blunder_threshold
+        stats = analysis.groupby("player_str").agg(
+            moves=("error", "count"),
+            average_error=("error", "mean"),
+            blunders=("is_blunder", "sum"),
+        )
+        stats["blunder_rate"] = (stats["blunders"] / stats["moves"] * 100).round(2)
+        return stats
+
+    @staticmethod
+    def analysis_menu():
+        """Runs the analysis of the stored games and displays the blunder statistics
+        """
+        print("\nAnalyzing stored games, this can take a while (interrupt at any time, progress is kept)...")
+        Analyzer.analyze_all()
+
+        stats = Analyzer.blunder_statistics()
+        if stats.empty:
+            print("No analyzed games available.")
+            return
+
+        print("\n=== Blunder Statistics ===")
+        print(stats.to_string())
@@ -1,8 +1,19 @@
+import ast
+import atexit
 import datetime
 import os
+import tempfile
+
 import pandas as pd
 
+from .GameCode import GameCode
+from .FileLock import FileLock
+from .GameWriter import GameWriter
+from .History import History
+from .Rollup import Rollup
+from .Snapshot import Snapshot
 from .Utils import Utils
+from .Variant import Variant
 
 class Database:
     """Class for managing game data storage and retrieval
@@ -10,6 +21,13 @@ class Database:
     This class provides methods to save game data to a CSV file and retrieve
     the next game ID for new entries.
     """
+    DATA_FILE = '../data/game_data.csv'
+    # Games of the other variants are kept out of the classic history, one file per variant
+    VARIANT_DATA_FILE = '../data/game_data_{rows}x{columns}x{connect}.csv'
+
+    # Writers queuing the saved games, one per data file, created with the first save
+    _writers = {}
+
     @staticmethod
     def get_next_id():
         """Calculates the number of games recorded in the game_data.csv file and returns the number + 1.
@@ -21,7 +39,7 @@ class Database:
             int: The number of games recorded in the game_data.csv file plus one.
         """
         try:
-            df = pd.read_csv('../data/game_data.csv')
+            df = pd.read_csv(Database.DATA_FILE)
             Database._validate_columns(df)
             return len(df) + 1
         except FileNotFoundError:
@@ -31,11 +49,68 @@ class Database:
             return 1
 
     @staticmethod
-    def save_new_game(player_who_starts: int, winner: int, shots_played_player: int, shots_played_ia: int, shots):
+    def data_file(variant=None):
+        """Returns the data file of the games of a variant
+
+        Classic games are stored in DATA_FILE, which the statistics, the history and the
+        analysis read. Games of the other variants go to a file of their own, so that they
+        are never mixed with them.
+
+        Args:
+            variant (Variant): The variant of the games, the classic one when omitted.
+
+        Returns:
+            str: The game data CSV file of the variant.
+        """
+        if variant is None or variant is Variant.get():
+            return Database.DATA_FILE
+        return Database.VARIANT_DATA_FILE.format(rows=variant.rows, columns=variant.columns, connect=variant.connect)
+
+    @staticmethod
+    def get_writer(data_file=None):
+        """Returns the writer appending saved games to a data file, creating it on first use
+
+        The writers are closed when the program exits, which writes the games still queued.
+
+        Args:
+            data_file (str): The game data CSV file, DATA_FILE when omitted.
+
+        Returns:
+            GameWriter: The writer of the data file.
+        """
+        data_file = data_file or Database.DATA_FILE
+        if data_file not in Database._writers:
+            if not Database._writers:
+                atexit.register(Database.close_writer)
+            storage_config = Utils.load_storage_config()
+            Database._writers[data_file] = GameWriter(data_file,
+                                                      batch_size=storage_config.get("batch_size", 256),
+                                                      flush_interval=storage_config.get("flush_interval", 1.0),
+                                                      fsync=storage_config.get("fsync", "batch"))
+        return Database._writers[data_file]
+
+    @staticmethod
+    def flush_games():
+        """Writes the queued games to the data files, so that reading them sees every saved game
+        """
+        for writer in list(Database._writers.values()):
+            writer.flush()
+
+    @staticmethod
+    def close_writer():
+        """Writes the queued games and stops the writers
+        """
+        writers, Database._writers = Database._writers, {}
+        for writer in writers.values():
+            writer.close()
+
+    @staticmethod
+    def save_new_game(player_who_starts: int, winner: int, shots_played_player: int, shots_played_ia: int, shots,
+                      variant=None):
         """Saves a game to the game_data.csv file
 
-        Appends a new game record to 'Data/game_data.csv' with the following details:
-        - Game ID
+        Queues a new game record for 'Data/game_data.csv' with the following details:
+        - Game ID (given when the record is written)
         - Current date and time
         - Starting player (1 for human, -1 for AI)
         - Winner (1 for human, -1 for AI)
@@ -43,40 +118,35 @@ class Database:
         - Number of moves played by the AI
         - List of moves played during the game
 
+        Records are appended in batches by the game writer (see Config/storage_config.json).
+        Games played on another variant than the classic one are saved to the data file of
+        their variant (see data_file).
+
         Args:
             player_who_starts (int): -1 when the AI starts and 1 when the player starts.
             winner (int): -1 when the AI wins and 1 when the player wins.
             shots_played_player (int): Number of moves the player has played.
             shots_played_ia (int): Number of moves the AI has played.
             shots (list): List containing the positions of the moves played in the order of the game.
+            variant (Variant): The variant the game was played on, the classic one when omitted.
         """
         current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        next_id = Database.get_next_id()
-
-        new_game_data = {
-            "id": [next_id],
-            "date": [current_date],
-            "player_who_starts": [player_who_starts],
-            "winner": [winner],
-            "shots_played_player": [shots_played_player],
-            "shots_played_ia": [shots_played_ia],
-            "shots": [shots]
-        }
-
-        df_new_game = pd.DataFrame(new_game_data)
-
-        file_exists = os.path.isfile('../data/game_data.csv')
-
-        # Append to the existing CSV file
-        df_new_game.to_csv('../data/game_data.csv', mode='a', header=not file_exists, index=False)
+        Database.get_writer(Database.data_file(variant)).submit([current_date, player_who_starts, winner,
+                                      shots_played_player, shots_played_ia, list(shots)])
 
     @staticmethod
-    def evaluate_moves_from_history(current_shots, player_turn):
+    def evaluate_moves_from_history(current_shots, player_turn, verbose=True, columns=7):
         """Evaluates moves based on historical game data
 
+        Historical games are aggregated per position, so every stored game which reached
+        the current position (or its left-right mirror), whatever its move order, supports
+        the next moves.
+
         Args:
             current_shots (list): The list of shots played in the current game.
             player_turn (int): The current player's turn (1 for human, -1 for AI).
+            verbose (bool): Whether to print a message when there is no historical data.
+            columns (int): The number of columns of the board.
 
         Returns:
             dict: A dictionary with suggested moves and their scores based on historical data.
@@ -84,34 +154,77 @@ class Database:
         points_config = Utils.load_points_config()
         move_scores = {}
 
-        # Load historical game data
-        try:
-            df = pd.read_csv('../data/game_data.csv')
-            Database._validate_columns(df)
-            for _, row in df.iterrows():
-                winner = row['winner']
-                shots = eval(row['shots']) # Convert string representation of list to actual list
-
-                # Check if the current game matches the start of a historical game
-                if shots[:len(current_shots)] == current_shots:
-                    # Evaluate the next move in the historical game
-                    next_move = shots[len(current_shots)]
-                    if next_move not in move_scores:
-                        move_scores[next_move] = 0
-
-                    # Adjust score based on the outcome of the historical game
-                    if winner == player_turn:
-                        move_scores[next_move] += points_config["historical_win_score"]
-                    elif winner == -player_turn:
-                        move_scores[next_move] -= points_config["historical_loss_score"]
+        # Historical data is only kept for the classic board
+        if columns != 7:
+            return move_scores
 
+        try:
+            Database.flush_games()
+            history = History.get()
+            history.refresh(Database.DATA_FILE)
+            outcomes = history.lookup(current_shots, player_turn)
         except FileNotFoundError:
-            print("No historical game data found.")
-        except (pd.errors.EmptyDataError, ValueError):
-            Database._recreate_csv_with_columns()
+            if verbose:
+                print("No historical game data found.")
+            return move_scores
+        except (pd.errors.EmptyDataError, ValueError, KeyError):
+            return move_scores
+
+        if outcomes is None:
+            return move_scores
+
+        heights = [5] * columns
+        for row, col in current_shots:
+            heights[col] = row - 1
+
+        for col, (wins, losses, _) in enumerate(outcomes.tolist()):
+            if wins or losses:
+                move_scores[(heights[col], col)] = (wins * points_config["historical_win_score"]
+                                                    - losses * points_config["historical_loss_score"])
 
         return move_scores
 
+    @staticmethod
+    def game_codes(df: pd.DataFrame, columns=7) -> pd.Series:
+        """Returns the packed code of each game of a DataFrame
+
+        The code column added by the snapshot is used when present, otherwise the shots
+        column is parsed.
+
+        Args:
+            df (pd.DataFrame): The game data.
+            columns (int): Number of columns of the board the games were played on.
+
+        Returns:
+            pd.Series: The GameCode of each game, None for unreadable shots.
+        """
+        if "code" in df.columns:
+            return df["code"]
+
+        def to_code(shots):
+            try:
+                return GameCode.encode(ast.literal_eval(shots), columns)
+            except (ValueError, SyntaxError, TypeError):
+                return None
+
+        return pd.Series([to_code(shots) for shots in df["shots"]], index=df.index, dtype=object)
+
+    @staticmethod
+    def drop_duplicate_games(df: pd.DataFrame) -> pd.DataFrame:
+        """Keeps the first occurrence of every game played move for move more than once
+
+        Two games are the same when they have the same starter and the same packed code.
+
+        Args:
+            df (pd.DataFrame): The game data.
+
+        Returns:
+            pd.DataFrame: The game data without the repeated games, unreadable games being kept.
+        """
+        codes = Database.game_codes(df)
+        keys = pd.DataFrame({"starter": df["player_who_starts"], "code": codes}, index=df.index)
+        return df[~keys.duplicated() | codes.isna()]
+
     @staticmethod
     def _validate_columns(df):
         """Validates that the DataFrame contains the required columns
@@ -123,9 +236,44 @@ class Database:
     @staticmethod
     def _recreate_csv_with_columns():
         """Recreates the CSV file with the required columns
+
+        The file is checked again under its lock, so that a file another process has just
+        written is not replaced.
+        """
+        with FileLock(Database.DATA_FILE):
+            try:
+                Database._validate_columns(pd.read_csv(Database.DATA_FILE, nrows=0))
+                return
+            except (FileNotFoundError, pd.errors.EmptyDataError, ValueError):
+                pass
+
+            empty_df = pd.DataFrame(columns=GameWriter.COLUMNS)
+            Database._replace_csv(empty_df)
+
+    @staticmethod
+    def _replace_csv(df):
+        """Replaces the CSV file with a DataFrame atomically, the file lock being held
+
+        The DataFrame is written to a temporary file in the same directory, then renamed over
+        the CSV file, so that readers see either the old or the new file, never a partial one.
+
+        Args:
+            df (pd.DataFrame): The new content of the file.
         """
-        empty_df = pd.DataFrame(columns=["id", "date", "player_who_starts", "winner", "shots_played_player", "shots_played_ia", "shots"])
-        empty_df.to_csv('../data/game_data.csv', index=False)
+        directory = os.path.dirname(Database.DATA_FILE) or "."
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, 'w', newline="") as temporary_file:
+                df.to_csv(temporary_file, index=False)
+                temporary_file.flush()
+                os.fsync(temporary_file.fileno())
+            if os.path.exists(Database.DATA_FILE):
+                os.chmod(temporary_path, os.stat(Database.DATA_FILE).st_mode)
+            os.replace(temporary_path, Database.DATA_FILE)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
 
     @staticmethod
     def export_dataframe(df: pd.DataFrame, filename: str = "exported_game_data.csv"):
@@ -210,25 +358,11 @@ class Database:
         result_choice = input("Your choice: ").strip()
 
         try:
-            df = pd.read_csv("../data/game_data.csv", parse_dates=["date"])
+            df = Database.read_history(date_start, date_end)
             Database._validate_columns(df)
 
-            if date_start:
-                df = df[df["date"] >= pd.to_datetime(date_start)]
-            if date_end:
-                df = df[df["date"] <= pd.to_datetime(date_end) + pd.Timedelta(days=1)]
-
-            if starter_choice == "1":
-                df = df[df["player_who_starts"] == 1]
-            elif starter_choice == "2":
-                df = df[df["player_who_starts"] == -1]
-
-            if result_choice == "1":
-                df = df[df["winner"] == 1]
-            elif result_choice == "2":
-                df = df[df["winner"] == -1]
-
-            return df
+            return Database.apply_game_filters(df, starter=Database._choice_to_side(starter_choice),
+                                               winner=Database._choice_to_side(result_choice))
 
         except FileNotFoundError:
             print("No game data found.")
@@ -237,6 +371,123 @@ class Database:
             Database._recreate_csv_with_columns()
             return None
 
+    @staticmethod
+    def _choice_to_side(choice):
+        """Converts a menu choice (1. Player, 2. IA, 3. No filter) to a side
+
+        Args:
+            choice (str): The menu choice entered by the user.
+
+        Returns:
+            int: 1 for the player, -1 for the AI, None for no filter.
+        """
+        return {"1": 1, "2": -1}.get(choice)
+
+    @staticmethod
+    def apply_game_filters(df: pd.DataFrame, date_start=None, date_end=None, starter=None, winner=None,
+                           include_end_day=True) -> pd.DataFrame:
+        """Filters game data without prompting the user
+
+        Args:
+            df (pd.DataFrame): The game data, with the date column parsed as datetime.
+            date_start (str): Keep games played from this date (YYYY-MM-DD), None for no bound.
+            date_end (str): Keep games played until this date (YYYY-MM-DD), None for no bound.
+            starter (int): Keep games started by this side (1 for human, -1 for AI), None for no filter.
+            winner (int): Keep games won by this side (1 for human, -1 for AI), None for no filter.
+            include_end_day (bool): Whether the whole end day is kept or only its midnight.
+
+        Returns:
+            pd.DataFrame: The filtered DataFrame.
+        """
+        start, end = Database.date_bounds(date_start, date_end, include_end_day)
+        if start is not None:
+            df = df[df["date"] >= start]
+        if end is not None:
+            df = df[df["date"] <= end]
+
+        if starter is not None:
+            df = df[df["player_who_starts"] == starter]
+
+        if winner is not None:
+            df = df[df["winner"] == winner]
+
+        return df
+
+    @staticmethod
+    def keep_columns(df: pd.DataFrame, columns) -> pd.DataFrame:
+        """Keeps the given columns of a DataFrame without prompting the user
+
+        Args:
+            df (pd.DataFrame): The DataFrame from which to select columns.
+            columns (list): The names of the columns to keep, all of them when empty.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing only the selected columns.
+
+        Raises:
+            ValueError: If a column does not exist.
+        """
+        if not columns:
+            return df
+
+        unknown = [column for column in columns if column not in df.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        return df[list(columns)]
+
+    @staticmethod
+    def sort_by(df: pd.DataFrame, sort_keys) -> pd.DataFrame:
+        """Sorts the game data without prompting the user
+
+        Args:
+            df (pd.DataFrame): The DataFrame to sort.
+            sort_keys (list): (column, ascending) pairs, the first one being the main key.
+
+        Returns:
+            pd.DataFrame: The sorted DataFrame.
+
+        Raises:
+            ValueError: If a column does not exist or is the shots column.
+        """
+        if not sort_keys:
+            return df
+
+        columns = [column for column, _ in sort_keys]
+        for column in columns:
+            if column == "shots":
+                raise ValueError("Sorting by 'shots' is not allowed.")
+            if column not in df.columns:
+                raise ValueError(f"Unknown sort column: {column}")
+
+        return df.sort_values(by=columns, ascending=[ascending for _, ascending in sort_keys])
+
+    @staticmethod
+    def write_dataframe(df: pd.DataFrame, path: str, file_format: str = None):
+        """Writes a DataFrame to an explicit path without prompting the user
+
+        Args:
+            df (pd.DataFrame): The DataFrame to write.
+            path (str): The output file path, overwritten if it exists.
+            file_format (str): "csv", "json" or "html", deduced from the extension when omitted.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if file_format == "csv":
+            df.to_csv(path, index=False)
+        elif file_format == "json":
+            df.to_json(path, orient="records", date_format="iso", indent=2)
+        elif file_format == "html":
+            df.to_html(path, index=False)
+        else:
+            raise ValueError(f"Unsupported format: {file_format}")
+
     @staticmethod
     def sort_game_data(df: pd.DataFrame) -> pd.DataFrame:
         """Sorts the game data based on user-defined criteria
@@ -304,13 +555,19 @@ class Database:
         Args:
             df (pd.DataFrame): The DataFrame containing the records to delete.
         """
-        original_df = pd.read_csv("../data/game_data.csv")
-        original_df = original_df[~original_df.index.isin(df.index)]
+        Database.flush_games()
+        # Games saved by other processes in the meantime are kept, records being matched by id and date
+        to_delete = set(zip(df["id"], pd.to_datetime(df["date"])))
 
-        original_df = original_df.reset_index(drop=True)
-        original_df["id"] = original_df.index + 1
+        with FileLock(Database.DATA_FILE):
+            original_df = pd.read_csv(Database.DATA_FILE, parse_dates=["date"])
+            deleted = [key in to_delete for key in zip(original_df["id"], original_df["date"])]
+            original_df = original_df[~pd.Series(deleted, index=original_df.index, dtype=bool)]
 
-        original_df.to_csv("../data/game_data.csv", index=False)
+            original_df = original_df.reset_index(drop=True)
+            original_df["id"] = original_df.index + 1
+
+            Database._replace_csv(original_df)
         print("Data deleted successfully and indices updated.")
 
     @staticmethod
@@ -356,25 +613,11 @@ class Database:
         result_choice = input("Your choice: ").strip()
 
         try:
-            df = pd.read_csv("../data/game_data.csv", parse_dates=["date"])
+            df = Database.read_history(date_start, date_end, include_end_day=False)
             Database._validate_columns(df)
 
-            if date_start:
-                df = df[df["date"] >= pd.to_datetime(date_start)]
-            if date_end:
-                df = df[df["date"] <= pd.to_datetime(date_end)]
-
-            if starter_choice == "1":
-                df = df[df["player_who_starts"] == 1]
-            elif starter_choice == "2":
-                df = df[df["player_who_starts"] == -1]
-
-            if result_choice == "1":
-                df = df[df["winner"] == 1]
-            elif result_choice == "2":
-                df = df[df["winner"] == -1]
-
-            return df
+            return Database.apply_game_filters(df, starter=Database._choice_to_side(starter_choice),
+                                               winner=Database._choice_to_side(result_choice))
 
         except FileNotFoundError:
             print("No game data found.")
@@ -383,6 +626,74 @@ class Database:
             Database._recreate_csv_with_columns()
             return None
 
+    @staticmethod
+    def date_bounds(date_start=None, date_end=None, include_end_day=True):
+        """Converts the dates of a range filter to inclusive bounds
+
+        Args:
+            date_start (str): Keep games played from this date (YYYY-MM-DD), None for no bound.
+            date_end (str): Keep games played until this date (YYYY-MM-DD), None for no bound.
+            include_end_day (bool): Whether the whole end day is kept or only its midnight.
+
+        Returns:
+            tuple: The first and last dates kept, None for no bound.
+
+        Raises:
+            ValueError: If a date cannot be parsed.
+        """
+        start = pd.to_datetime(date_start) if date_start else None
+        end = pd.to_datetime(date_end) if date_end else None
+        if end is not None and include_end_day:
+            end += pd.Timedelta(days=1)
+        return start, end
+
+    @staticmethod
+    def read_history(date_start=None, date_end=None, include_end_day=True):
+        """Reads the game history through its memory-mapped columnar snapshot
+
+        The snapshot is refreshed with the games appended since the last read. If it cannot be
+        used (unreadable rows, read-only data directory), the CSV file is parsed directly.
+        With a date range, the games of the range are found by binary search on the dates and
+        only they are read.
+
+        Args:
+            date_start (str): Keep games played from this date (YYYY-MM-DD), None for no bound.
+            date_end (str): Keep games played until this date (YYYY-MM-DD), None for no bound.
+            include_end_day (bool): Whether the whole end day is kept or only its midnight.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the game data.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+            ValueError: If a date cannot be parsed.
+        """
+        start, end = Database.date_bounds(date_start, date_end, include_end_day)
+        Database.flush_games()
+        try:
+            return Snapshot.load_dataframe(Database.DATA_FILE, date_start=start, date_end=end)
+        except FileNotFoundError:
+            raise
+        except (OSError, ValueError, KeyError, pd.errors.ParserError):
+            df = pd.read_csv(Database.DATA_FILE, parse_dates=["date"] if start or end else None)
+            return Database.apply_game_filters(df, date_start, date_end, include_end_day=include_end_day)
+
+    @staticmethod
+    def read_last_days(days):
+        """Reads the games played during the last days, without reading older games
+
+        Args:
+            days (int): The number of days, today included.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the game data of the last days.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        date_start = (pd.Timestamp.now().normalize() - pd.Timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        return Database.read_history(date_start=date_start)
+
     @staticmethod
     def load_game_data():
         """Loads game data from the CSV file
@@ -391,7 +702,25 @@ class Database:
             pd.DataFrame: A DataFrame containing the game data.
         """
         try:
-            return pd.read_csv('../data/game_data.csv')
+            return Database.read_history()
         except FileNotFoundError:
             print("No game data found.")
             return pd.DataFrame()
+
+    @staticmethod
+    def load_rollup(period="daily"):
+        """Loads the daily or monthly aggregates of the game data
+
+        Args:
+            period (str): "daily" or "monthly".
+
+        Returns:
+            pd.DataFrame: The games, wins by side, draws, starter wins and moves of each day or
+            month, indexed by its first day.
+        """
+        Database.flush_games()
+        try:
+            return Rollup.table(Database.DATA_FILE, period)
+        except FileNotFoundError:
+            print("No game data found.")
+            return pd.DataFrame(columns=Rollup.FIELDS)
@@ -0,0 +1,314 @@
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from .FileLock import FileLock
+
+
+class EvaluationCache:
+    """Class keeping the threat search results and the move scores of the positions met, from one run to the next
+
+    A threat entry holds, for one position, the first move of a forced win of the player to
+    move (-1 if there is none) and the bitmask of the moves after which the opponent has
+    one. A score entry holds the heuristic scores of the moves of a position, for the side
+    they were evaluated for and a set of weights. These scores depend on the position alone;
+    the historical scores, which change with every saved game, are never cached, and
+    IA.evaluate_moves adds them afresh to the cached ones. Positions are keyed by their canonical hash combined with the side to move
+    (and, for scores, with a hash of the weights), so a position and its mirror share their
+    entry, the columns being stored for the canonical orientation. The entries saved by
+    previous runs are opened by memory mapping, sorted by key and searched by bisection,
+    without being read in full; the entries of the current run are kept in a dictionary and
+    merged into the file when the program exits. A lock guards the entries of the current
+    run, which the ponderer thread adds to while the game saves them. Every entry is stamped with the number of
+    the last run which used it, and when the file holds more than max_entries entries, the
+    least recently used ones are evicted. Self-play evaluates its moves without the cache:
+    the weights it tries change at every game, so its entries would never be read again.
+    There is one cache file per variant.
+    """
+    CACHE_FILE = '../data/evaluation_cache_{rows}x{columns}x{connect}.npy'
+    MAX_ENTRIES = 500000
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, variant, path=None, max_entries=MAX_ENTRIES):
+        """Initializes the cache of a variant, opening the entries saved by previous runs
+
+        Args:
+            variant (Variant): The variant of the cached positions.
+            path (str): The cache file, named after the variant in the data directory when omitted.
+            max_entries (int): The largest number of entries kept in the file.
+        """
+        self._variant = variant
+        self._path = path or EvaluationCache.CACHE_FILE.format(rows=variant.rows, columns=variant.columns,
+                                                               connect=variant.connect)
+        self._max_entries = max_entries
+        self._dtype = EvaluationCache.dtype(variant.columns)
+        self._saved = EvaluationCache._open(self._path, self._dtype)
+        self._saved_keys = self._saved["key"]
+        self._stamp = int(self._saved["stamp"].max()) + 1 if len(self._saved) else 1
+        self._new = {}
+        self._used = set()
+        self._weights = None
+        self._weights_key = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def dtype(columns):
+        """Returns the type of the entries of a variant
+
+        Args:
+            columns (int): The number of columns of the variant.
+
+        Returns:
+            np.dtype: The key, forced win, losing moves, move scores and stamp of an entry.
+        """
+        return np.dtype([("key", "<u8"), ("move", "i1"), ("losing", "<u4"),
+                         ("scores", "<f8", (columns,)), ("stamp", "<u4")])
+
+    @classmethod
+    def get(cls, variant):
+        """Returns the cache of a variant, opening it on first use
+
+        The caches are saved when the program exits.
+
+        Args:
+            variant (Variant): The variant of the cached positions.
+
+        Returns:
+            EvaluationCache: The cache of the variant.
+        """
+        instance = cls._instances.get(variant)
+        if instance is None:
+            # The preloader thread and the game may open the cache at the same time
+            with cls._instances_lock:
+                instance = cls._instances.get(variant)
+                if instance is None:
+                    if not cls._instances:
+                        atexit.register(cls.save_all)
+                    instance = cls._instances[variant] = cls(variant)
+        return instance
+
+    @classmethod
+    def save_all(cls):
+        """Saves the caches opened by the program
+        """
+        for cache in cls._instances.values():
+            cache.save()
+
+    @staticmethod
+    def _open(path, dtype):
+        """Opens a cache file by memory mapping
+
+        Args:
+            path (str): The cache file.
+            dtype (np.dtype): The type of the entries of the variant.
+
+        Returns:
+            np.ndarray: The saved entries sorted by key, empty if the file is missing, unreadable
+            or written by another version.
+        """
+        try:
+            entries = np.load(path, mmap_mode='r')
+        except (FileNotFoundError, ValueError, OSError):
+            return np.zeros(0, dtype=dtype)
+        if entries.dtype != dtype or entries.ndim != 1:
+            return np.zeros(0, dtype=dtype)
+        return entries
+
+    def __len__(self):
+        """Returns the number of saved and new entries (a position in both counts twice)
+        """
+        return len(self._saved) + len(self._new)
+
+    def _key(self, state):
+        """Returns the key of a position and whether its columns must be mirrored
+
+        Args:
+            state (GameState): The position.
+
+        Returns:
+            tuple: The key and True if the position is the mirror of the canonical one.
+        """
+        key, mirrored = state.canonical_hash()
+        if state.player_to_move() == -1:
+            key ^= self._variant.zobrist_side
+        return key, mirrored
+
+    def _scores_key(self, state, points_config, ia):
+        """Returns the key of the move scores of a position and whether its columns must be mirrored
+
+        Args:
+            state (GameState): The position.
+            points_config (dict): The weights of the evaluation.
+            ia (int): The side the moves are evaluated for.
+
+        Returns:
+            tuple: The key and True if the position is the mirror of the canonical one.
+        """
+        weights = self._weights
+        if weights is None or weights[0] != points_config:
+            description = json.dumps(points_config, sort_keys=True)
+            weights = dict(points_config), int.from_bytes(hashlib.sha256(description.encode()).digest()[:8], "little")
+            self._weights = weights
+        key, mirrored = state.canonical_hash()
+        if ia == -1:
+            key ^= self._variant.zobrist_side
+        return key ^ weights[1], mirrored
+
+    def _mirror_mask(self, mask):
+        """Mirrors a bitmask of columns
+        """
+        return sum(1 << self._variant.mirror_column(col) for col in range(self._variant.columns) if mask >> col & 1)
+
+    def _entry(self, key):
+        """Returns the forced win, losing moves and move scores of a key, None if it is not cached
+        """
+        with self._lock:
+            entry = self._new.get(key)
+            if entry is None:
+                index = int(np.searchsorted(self._saved_keys, np.uint64(key)))
+                if index == len(self._saved_keys) or int(self._saved_keys[index]) != key:
+                    return None
+                saved_entry = self._saved[index]
+                entry = (int(saved_entry["move"]), int(saved_entry["losing"]), saved_entry["scores"])
+                self._used.add(key)
+        return entry
+
+    def lookup(self, state):
+        """Returns the threat search results of a position, if known
+
+        Args:
+            state (GameState): The position.
+
+        Returns:
+            tuple: The column of the forced win (None if there is none) and the set of losing
+            columns, or None if the position is not in the cache.
+        """
+        key, mirrored = self._key(state)
+        entry = self._entry(key)
+        if entry is None:
+            return None
+
+        move, losing, _ = entry
+        if mirrored:
+            move = self._variant.mirror_column(move) if move >= 0 else move
+            losing = self._mirror_mask(losing)
+        return (move if move >= 0 else None), {col for col in range(self._variant.columns) if losing >> col & 1}
+
+    def store(self, state, forced_win, losing_moves):
+        """Records the threat search results of a position
+
+        Args:
+            state (GameState): The position.
+            forced_win (int): The column of the forced win, None if there is none.
+            losing_moves (set): The columns after which the opponent has a forced win.
+        """
+        key, mirrored = self._key(state)
+        move = -1 if forced_win is None else forced_win
+        losing = sum(1 << col for col in losing_moves)
+        if mirrored:
+            move = self._variant.mirror_column(move) if move >= 0 else move
+            losing = self._mirror_mask(losing)
+        with self._lock:
+            self._new[key] = (move, losing, None)
+
+    def lookup_scores(self, state, points_config, ia):
+        """Returns the heuristic scores of the moves of a position, if known
+
+        Args:
+            state (GameState): The position.
+            points_config (dict): The weights of the evaluation.
+            ia (int): The side the moves are evaluated for.
+
+        Returns:
+            dict: The score of each playable column, None if the position is not in the cache.
+        """
+        key, mirrored = self._scores_key(state, points_config, ia)
+        entry = self._entry(key)
+        if entry is None:
+            return None
+
+        scores = entry[2]
+        variant = self._variant
+        return {col: float(scores[variant.mirror_column(col) if mirrored else col])
+                for col in range(variant.columns) if not state.is_column_full(col)}
+
+    def store_scores(self, state, points_config, ia, scores):
+        """Records the heuristic scores of the moves of a position
+
+        Args:
+            state (GameState): The position.
+            points_config (dict): The weights of the evaluation.
+            ia (int): The side the moves are evaluated for.
+            scores (dict): The score of each playable column.
+        """
+        key, mirrored = self._scores_key(state, points_config, ia)
+        canonical_scores = np.full(self._variant.columns, np.nan)
+        for col, score in scores.items():
+            canonical_scores[self._variant.mirror_column(col) if mirrored else col] = score
+        with self._lock:
+            self._new[key] = (-1, 0, canonical_scores)
+
+    def save(self):
+        """Merges the entries of this run into the cache file
+
+        The file is read again under its lock, so that the entries saved meanwhile by other
+        processes are kept, and replaced atomically. Entries added meanwhile (by the ponderer)
+        stay in memory for the next save.
+        """
+        with self._lock:
+            if not self._new and not self._used:
+                return
+            pending = list(self._new.items())
+            used = set(self._used)
+
+        new = np.zeros(len(pending), dtype=self._dtype)
+        new["scores"] = np.nan
+        if pending:
+            new["key"] = np.fromiter((key for key, _ in pending), dtype=np.uint64, count=len(pending))
+            new["move"] = [move for _, (move, _, _) in pending]
+            new["losing"] = [losing for _, (_, losing, _) in pending]
+            for index, (_, (_, _, scores)) in enumerate(pending):
+                if scores is not None:
+                    new["scores"][index] = scores
+        new["stamp"] = self._stamp
+
+        directory = os.path.dirname(self._path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with FileLock(self._path):
+            saved = np.array(EvaluationCache._open(self._path, self._dtype))
+            if len(saved):
+                saved["stamp"][np.isin(saved["key"], np.fromiter(used, dtype=np.uint64, count=len(used)))] = self._stamp
+                saved = saved[~np.isin(saved["key"], new["key"])]
+            entries = np.concatenate([saved, new])
+            if len(entries) > self._max_entries:
+                # Least recently used entries first
+                entries = entries[np.argsort(entries["stamp"], kind="stable")[-self._max_entries:]]
+            entries.sort(order="key")
+
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(file_descriptor, 'wb') as temporary_file:
+                    np.save(temporary_file, entries)
+                os.chmod(temporary_path, os.stat(self._path).st_mode if os.path.exists(self._path) else 0o644)
+                os.replace(temporary_path, self._path)
+            except BaseException:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+                raise
+
+        saved = EvaluationCache._open(self._path, self._dtype)
+        with self._lock:
+            self._saved = saved
+            self._saved_keys = saved["key"]
+            for key, entry in pending:
+                # An entry replaced during the save is kept for the next one
+                if self._new.get(key) is entry:
+                    del self._new[key]
+            self._used -= used
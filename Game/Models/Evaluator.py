@@ -0,0 +1,189 @@
+from .Variant import Variant
+
+
+class Evaluator:
+    """Class evaluating positions from the precomputed winning lines of the board
+
+    The classic 6x7 board has 69 windows of four cells in which a player can connect four.
+    The evaluator keeps, for each window, the number of tokens of each player and
+    updates these counts incrementally when a token is added or removed, so a move
+    only touches the windows going through its cell instead of re-scanning the board.
+    The windows come from the variant of the game and are shared by all its evaluators.
+    """
+    def __init__(self, points_config, starter=1, variant=None):
+        """Initializes an empty evaluator
+
+        Args:
+            points_config (dict): The points configuration holding the evaluation weights,
+                defaults are used for missing weights.
+            starter (int): The player who started the game (1 for human, -1 for AI).
+            variant (Variant): The variant of the game, the classic one when omitted.
+        """
+        self._variant = variant or Variant.get()
+        self._rows = self._variant.rows
+        self._columns = self._variant.columns
+        self._connect = self._variant.connect
+        self._windows = self._variant.windows
+        self._cell_windows = self._variant.cell_windows
+        self._open_two = points_config.get("open_two_score", 1)
+        self._open_three = points_config.get("open_three_score", 4)
+        self._parity_threat = points_config.get("parity_threat_score", 3)
+        self._starter = starter
+        self._board = [0] * self._variant.size
+        self._counts = {1: [0] * len(self._windows), -1: [0] * len(self._windows)}
+        self._scores = {1: 0, -1: 0}
+        self._complete = {1: 0, -1: 0}
+
+    @classmethod
+    def from_board(cls, board, points_config, starter=1, variant=None):
+        """Builds an evaluator from an existing game board
+
+        Args:
+            board (np.array): The array representing the game board.
+            points_config (dict): The points configuration holding the evaluation weights.
+            starter (int): The player who started the game (1 for human, -1 for AI).
+            variant (Variant): The variant of the game, the classic one when omitted.
+
+        Returns:
+            Evaluator: An evaluator whose window counts match the board.
+        """
+        evaluator = cls(points_config, starter, variant)
+        for row in range(evaluator._rows):
+            for col in range(evaluator._columns):
+                if board[row][col] != 0:
+                    evaluator.add(row, col, int(board[row][col]))
+        return evaluator
+
+    def set_starter(self, starter):
+        """Setter for the player who started the game, recomputing the scores for the new parity
+
+        Args:
+            starter (int): The player who started the game (1 for human, -1 for AI).
+        """
+        self._starter = starter
+        for player in (1, -1):
+            self._scores[player] = sum(self._window_value(window, player) for window in range(len(self._windows)))
+
+    def _window_value(self, window, player):
+        """Computes the value of a window for a player
+
+        A window only has value while the opponent has no token in it. A window missing
+        two tokens is an open two, a window missing one token is an open three (a threat),
+        and a threat whose empty cell lies on the row parity favourable to the player gets
+        a bonus: odd rows (counted from the bottom) for the starter, even rows for the other.
+
+        Args:
+            window (int): The index of the window.
+            player (int): The player for whom to evaluate the window.
+
+        Returns:
+            int: The value of the window.
+        """
+        missing = self._connect - self._counts[player][window]
+        if self._counts[-player][window] or missing > 2 or missing == 0:
+            return 0
+        if missing == 2:
+            return self._open_two
+        if missing == 1:
+            value = self._open_three
+            for cell in self._windows[window]:
+                if self._board[cell] == 0:
+                    row_from_bottom = self._rows - cell // self._columns
+                    if (row_from_bottom % 2 == 1) == (player == self._starter):
+                        value += self._parity_threat
+                    break
+            return value
+
+    def _update(self, row, col, player, delta):
+        """Adds or removes a token and updates the counts and scores of the affected windows
+
+        Args:
+            row (int): The row of the token.
+            col (int): The column of the token.
+            player (int): The owner of the token.
+            delta (int): 1 to add the token, -1 to remove it.
+        """
+        cell = row * self._columns + col
+        windows = self._cell_windows[cell]
+        counts = self._counts[player]
+
+        for window in windows:
+            self._scores[1] -= self._window_value(window, 1)
+            self._scores[-1] -= self._window_value(window, -1)
+
+        self._board[cell] = player if delta > 0 else 0
+        for window in windows:
+            if counts[window] == self._connect:
+                self._complete[player] -= 1
+            counts[window] += delta
+            if counts[window] == self._connect:
+                self._complete[player] += 1
+
+        for window in windows:
+            self._scores[1] += self._window_value(window, 1)
+            self._scores[-1] += self._window_value(window, -1)
+
+    def add(self, row, col, player):
+        """Adds a token of a player on the board
+
+        Args:
+            row (int): The row of the token.
+            col (int): The column of the token.
+            player (int): The owner of the token (1 for human, -1 for AI).
+        """
+        self._update(row, col, player, 1)
+
+    def remove(self, row, col, player):
+        """Removes the token of a player from the board
+
+        Args:
+            row (int): The row of the token.
+            col (int): The column of the token.
+            player (int): The owner of the token (1 for human, -1 for AI).
+        """
+        self._update(row, col, player, -1)
+
+    def score(self, player):
+        """Getter for the threat score of a player
+
+        Args:
+            player (int): The player whose score is returned.
+
+        Returns:
+            int: The sum of the values of the windows still open for the player.
+        """
+        return self._scores[player]
+
+    def winner(self):
+        """Returns the player owning a complete window
+
+        Returns:
+            int: 1 if the human player wins, -1 if the AI wins, 0 if no winner yet.
+        """
+        if self._complete[1]:
+            return 1
+        if self._complete[-1]:
+            return -1
+        return 0
+
+    def is_winning_cell(self, row, col, player):
+        """Checks whether playing on a cell would connect four for a player
+
+        Args:
+            row (int): The row of the cell.
+            col (int): The column of the cell.
+            player (int): The player to check.
+
+        Returns:
+            bool: True if a token of the player on this cell completes a window.
+        """
+        if not (0 <= row < self._rows and 0 <= col < self._columns):
+            return False
+        if self._board[row * self._columns + col] != 0:
+            return False
+        counts = self._counts[player]
+        opponent_counts = self._counts[-player]
+        for window in self._cell_windows[row * self._columns + col]:
+            if counts[window] == self._connect - 1 and opponent_counts[window] == 0:
+                return True
+        return False
@@ -0,0 +1,79 @@
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Class holding an advisory lock shared by every process using a file
+
+    The lock is taken on a separate ".lock" file next to the protected one, so that the
+    protected file can be replaced by a rename while the lock is held. Shared locks let
+    several readers in at once; on Windows every lock is exclusive.
+
+    Use it as a context manager:
+
+        with FileLock(path):
+            ...
+    """
+    def __init__(self, path, shared=False):
+        """Initializes the lock of a file, without taking it
+
+        Args:
+            path (str): The path of the protected file.
+            shared (bool): Whether to take a shared lock instead of an exclusive one.
+        """
+        self._lock_path = path + ".lock"
+        self._shared = shared
+        self._file = None
+
+    def acquire(self):
+        """Waits until the lock is taken
+        """
+        directory = os.path.dirname(self._lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(self._lock_path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if self._shared else fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                # LK_LOCK only retries for 10 seconds, so keep trying
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except BaseException:
+            self._file.close()
+            self._file = None
+            raise
+
+    def release(self):
+        """Releases the lock
+        """
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
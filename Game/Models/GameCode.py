@@ -0,0 +1,179 @@
+class GameCode:
+    """Class packing a complete game into a single integer
+
+    A game is fully described by the columns played, the rows following from the order of
+    the moves. The code keeps the number of moves in its lowest LENGTH_BITS bits, then the
+    column of each move in order, on as many bits as needed for the board width (3 bits
+    for the classic 7 columns, 4 bits for 10 columns). Every game has exactly one code, so
+    codes can be compared, hashed and stored instead of lists of (row, col) tuples, and
+    since the first moves are in the lowest bits, comparing prefixes is a masked comparison.
+    """
+    LENGTH_BITS = 7
+    MAX_MOVES = (1 << LENGTH_BITS) - 1
+
+    @staticmethod
+    def bits_per_move(columns=7):
+        """Returns the number of bits used to store the column of one move
+
+        Args:
+            columns (int): Number of columns of the board.
+
+        Returns:
+            int: The number of bits needed to store a column index.
+        """
+        return max(1, (columns - 1).bit_length())
+
+    @staticmethod
+    def from_columns(move_columns, columns=7):
+        """Packs the columns played during a game
+
+        Args:
+            move_columns (list): The column of each move, in order.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            int: The code of the game.
+
+        Raises:
+            ValueError: If a column is out of the board or the game is too long.
+        """
+        if len(move_columns) > GameCode.MAX_MOVES:
+            raise ValueError(f"A game cannot have more than {GameCode.MAX_MOVES} moves.")
+
+        bits = GameCode.bits_per_move(columns)
+        code = len(move_columns)
+        shift = GameCode.LENGTH_BITS
+        for col in move_columns:
+            if not 0 <= col < columns:
+                raise ValueError(f"Column {col} is out of the board.")
+            code |= col << shift
+            shift += bits
+        return code
+
+    @staticmethod
+    def encode(shots, columns=7):
+        """Packs the shots of a game
+
+        Args:
+            shots (list): The (row, col) positions played, in order.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            int: The code of the game.
+
+        Raises:
+            ValueError: If a column is out of the board or the game is too long.
+        """
+        return GameCode.from_columns([col for _, col in shots], columns)
+
+    @staticmethod
+    def length(code):
+        """Returns the number of moves of a packed game
+        """
+        return code & GameCode.MAX_MOVES
+
+    @staticmethod
+    def move_columns(code, columns=7):
+        """Unpacks the columns played during a game
+
+        Args:
+            code (int): The code of the game.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            list: The column of each move, in order.
+        """
+        bits = GameCode.bits_per_move(columns)
+        mask = (1 << bits) - 1
+        moves = code >> GameCode.LENGTH_BITS
+        return [(moves >> (index * bits)) & mask for index in range(GameCode.length(code))]
+
+    @staticmethod
+    def decode(code, rows=6, columns=7):
+        """Unpacks a game into its shots
+
+        Args:
+            code (int): The code of the game.
+            rows (int): Number of rows of the board.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            list: The (row, col) positions played, in order, as stored in the game history.
+
+        Raises:
+            ValueError: If a move is played in a full column.
+        """
+        heights = [rows - 1] * columns
+        shots = []
+        for col in GameCode.move_columns(code, columns):
+            if heights[col] < 0:
+                raise ValueError(f"Column {col} is already full.")
+            shots.append((heights[col], col))
+            heights[col] -= 1
+        return shots
+
+    @staticmethod
+    def prefix(code, length, columns=7):
+        """Returns the code of the first moves of a game
+
+        Args:
+            code (int): The code of the game.
+            length (int): The number of moves to keep.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            int: The code of the game truncated to its first moves.
+        """
+        length = min(length, GameCode.length(code))
+        moves = (code >> GameCode.LENGTH_BITS) & ((1 << (length * GameCode.bits_per_move(columns))) - 1)
+        return (moves << GameCode.LENGTH_BITS) | length
+
+    @staticmethod
+    def is_prefix(prefix_code, code, columns=7):
+        """Checks whether a game starts with the moves of another one
+
+        Args:
+            prefix_code (int): The code of the first moves.
+            code (int): The code of the game.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            bool: True if the game starts with all the moves of prefix_code.
+        """
+        length = GameCode.length(prefix_code)
+        return length <= GameCode.length(code) and GameCode.prefix(code, length, columns) == prefix_code
+
+    @staticmethod
+    def common_prefix_length(code_a, code_b, columns=7):
+        """Returns the number of first moves two games have in common
+
+        Args:
+            code_a (int): The code of the first game.
+            code_b (int): The code of the second game.
+            columns (int): Number of columns of the board.
+
+        Returns:
+            int: The length of the longest common prefix of the two games.
+        """
+        length = min(GameCode.length(code_a), GameCode.length(code_b))
+        difference = (code_a ^ code_b) >> GameCode.LENGTH_BITS
+        if difference == 0:
+            return length
+        # The lowest differing bit belongs to the first differing move
+        first_bit = (difference & -difference).bit_length() - 1
+        return min(length, first_bit // GameCode.bits_per_move(columns))
+
+    @staticmethod
+    def to_bytes(code):
+        """Serializes a code to its shortest little-endian bytes
+
+        Returns:
+            bytes: The packed game, 17 bytes at most for the classic board.
+        """
+        return code.to_bytes(max(1, (code.bit_length() + 7) // 8), "little")
+
+    @staticmethod
+    def from_bytes(data):
+        """Reads a code serialized by to_bytes
+        """
+        return int.from_bytes(data, "little")
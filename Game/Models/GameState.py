@@ -0,0 +1,329 @@
+import struct
+
+import numpy as np
+
+from .GameCode import GameCode
+from .Variant import Variant
+
+
+class GameState:
+    """Class holding the bare position of a game, small enough to keep many games alive at once
+
+    The board is stored as two bitboards: one bit per cell, column after column, from the
+    bottom of each column, with an extra empty bit on top of every column so that lines
+    never wrap from one column to the next. `position` has the tokens of the human player
+    (1) and `mask` the tokens of both players, so the AI tokens (-1) are `mask ^ position`.
+    The moves are kept as a bytearray of columns and the column heights as a bytearray of
+    token counts. The state has no menus, evaluator or statistics, uses __slots__, and
+    pickles to its bitboards and move buffer, so it is cheap to clone and to send to worker
+    processes. Plateau wraps a state for the interactive game.
+
+    A state also serializes to a compact snapshot (to_bytes): a 5-byte header with the
+    format version, the dimensions of the variant and the starter, followed by the moves
+    packed as a GameCode. The side to move and the move counters follow from the starter
+    and the number of moves, so a classic game in progress takes 22 bytes at most.
+    """
+    __slots__ = ("variant", "position", "mask", "heights", "moves", "starter", "hash", "mirror_hash")
+
+    SNAPSHOT_VERSION = 1
+    # Version, rows, columns, connect and starter
+    SNAPSHOT_HEADER = struct.Struct("<BBBBb")
+
+    def __init__(self, variant=None, starter=1):
+        """Initializes an empty position
+
+        Args:
+            variant (Variant): The variant of the game, the classic one when omitted.
+            starter (int): The player who starts (1 for human, -1 for AI).
+        """
+        self.variant = variant or Variant.get()
+        self.position = 0
+        self.mask = 0
+        self.heights = bytearray(self.variant.columns)
+        self.moves = bytearray()
+        self.starter = starter
+        self.hash = 0
+        self.mirror_hash = 0
+
+    def __getstate__(self):
+        """Returns the state to pickle, the variant being replaced by its dimensions
+        """
+        variant = self.variant
+        return ((variant.rows, variant.columns, variant.connect), self.position, self.mask,
+                bytes(self.heights), bytes(self.moves), self.starter, self.hash, self.mirror_hash)
+
+    def __setstate__(self, state):
+        """Restores a pickled state, sharing the tables of the variant
+        """
+        dimensions, self.position, self.mask, heights, moves, self.starter, self.hash, self.mirror_hash = state
+        self.variant = Variant.get(*dimensions)
+        self.heights = bytearray(heights)
+        self.moves = bytearray(moves)
+
+    def clone(self):
+        """Returns an independent copy of the position
+
+        Returns:
+            GameState: The copy of the position.
+        """
+        copy = GameState.__new__(GameState)
+        copy.variant = self.variant
+        copy.position = self.position
+        copy.mask = self.mask
+        copy.heights = self.heights[:]
+        copy.moves = self.moves[:]
+        copy.starter = self.starter
+        copy.hash = self.hash
+        copy.mirror_hash = self.mirror_hash
+        return copy
+
+    def to_bytes(self):
+        """Serializes the position to a compact snapshot
+
+        Returns:
+            bytes: The snapshot of the position.
+        """
+        variant = self.variant
+        header = GameState.SNAPSHOT_HEADER.pack(GameState.SNAPSHOT_VERSION, variant.rows, variant.columns,
+                                                variant.connect, self.starter)
+        return header + GameCode.to_bytes(GameCode.from_columns(self.moves, variant.columns))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restores a position from a snapshot written by to_bytes
+
+        Args:
+            data (bytes): The snapshot of the position.
+
+        Returns:
+            GameState: The restored position.
+
+        Raises:
+            ValueError: If the snapshot is truncated, has another format version or holds an
+                impossible game.
+        """
+        header_size = GameState.SNAPSHOT_HEADER.size
+        if len(data) <= header_size:
+            raise ValueError("The game snapshot is truncated.")
+        version, rows, columns, connect, starter = GameState.SNAPSHOT_HEADER.unpack_from(data)
+        if version != GameState.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported game snapshot version {version}.")
+        if starter not in (1, -1):
+            raise ValueError("The game snapshot has an invalid starter.")
+
+        state = cls(Variant.get(rows, columns, connect), starter)
+        for col in GameCode.move_columns(GameCode.from_bytes(data[header_size:]), columns):
+            if col >= columns:
+                raise ValueError(f"Column {col} is out of the board.")
+            state.play(col)
+        return state
+
+    def _bit(self, row, col):
+        """Returns the bitboard bit of a cell, rows being counted from the top as on the Plateau board
+        """
+        return 1 << (col * (self.variant.rows + 1) + self.variant.rows - 1 - row)
+
+    def player_to_move(self):
+        """Returns the player whose turn it is
+
+        Returns:
+            int: 1 if the human player is to move, -1 if the AI is to move.
+        """
+        return self.starter if len(self.moves) % 2 == 0 else -self.starter
+
+    def moves_played(self, player):
+        """Returns the number of moves played by a player
+
+        Args:
+            player (int): The player (1 for human, -1 for AI).
+
+        Returns:
+            int: The number of tokens of the player on the board.
+        """
+        count = len(self.moves)
+        return (count + 1) // 2 if player == self.starter else count // 2
+
+    def row_to_play(self, col):
+        """Returns the row where a token played in a column would land
+
+        Args:
+            col (int): The column to play in.
+
+        Returns:
+            int: The lowest free row of the column, or -1 if the column is full.
+        """
+        return self.variant.rows - 1 - self.heights[col]
+
+    def is_column_full(self, col):
+        """Checks whether a column is full
+
+        Args:
+            col (int): The column to check.
+
+        Returns:
+            bool: True if no token can be played in the column.
+        """
+        return self.heights[col] == self.variant.rows
+
+    def cell(self, row, col):
+        """Returns the token in a cell
+
+        Args:
+            row (int): The row of the cell, counted from the top.
+            col (int): The column of the cell.
+
+        Returns:
+            int: 1 for a human token, -1 for an AI token, 0 for an empty cell.
+        """
+        bit = self._bit(row, col)
+        if not self.mask & bit:
+            return 0
+        return 1 if self.position & bit else -1
+
+    def play(self, col):
+        """Plays a token of the player to move in a column
+
+        Args:
+            col (int): The column to play in.
+
+        Returns:
+            int: The row where the token landed.
+
+        Raises:
+            ValueError: If the column is full.
+        """
+        if self.heights[col] == self.variant.rows:
+            raise ValueError("This column is full.")
+
+        row = self.variant.rows - 1 - self.heights[col]
+        player = self.player_to_move()
+        bit = self._bit(row, col)
+        self.mask |= bit
+        if player == 1:
+            self.position |= bit
+        self.heights[col] += 1
+        self.moves.append(col)
+        self.hash ^= self.variant.zobrist[player][row][col]
+        self.mirror_hash ^= self.variant.zobrist[player][row][self.variant.columns - 1 - col]
+        return row
+
+    def undo(self):
+        """Takes back the last move
+
+        Returns:
+            tuple: The (row, col) position of the removed token.
+
+        Raises:
+            IndexError: If no move has been played.
+        """
+        col = self.moves.pop()
+        self.heights[col] -= 1
+        row = self.variant.rows - 1 - self.heights[col]
+        player = self.player_to_move()
+        bit = self._bit(row, col)
+        self.mask &= ~bit
+        self.position &= ~bit
+        self.hash ^= self.variant.zobrist[player][row][col]
+        self.mirror_hash ^= self.variant.zobrist[player][row][self.variant.columns - 1 - col]
+        return row, col
+
+    def canonical_hash(self):
+        """Returns the hash of the position folded with its left-right mirror
+
+        Returns:
+            tuple: The smaller of the hashes of the position and of its mirror, and True if
+            the position is the mirrored one.
+        """
+        if self.mirror_hash < self.hash:
+            return self.mirror_hash, True
+        return self.hash, False
+
+    def _connected(self, tokens):
+        """Checks whether a bitboard of tokens holds a complete line
+        """
+        height = self.variant.rows + 1
+        # Vertical, horizontal and both diagonals: the shift between two neighbours of a line
+        for shift in (1, height, height + 1, height - 1):
+            line = tokens
+            for step in range(1, self.variant.connect):
+                line &= tokens >> (step * shift)
+            if line:
+                return True
+        return False
+
+    def tokens(self, player):
+        """Returns the bitboard of the tokens of a player
+
+        Args:
+            player (int): The player (1 for human, -1 for AI).
+
+        Returns:
+            int: The bitboard of the player's tokens.
+        """
+        return self.position if player == 1 else self.mask ^ self.position
+
+    def has_won(self, player):
+        """Checks whether a player has connected enough tokens
+
+        Args:
+            player (int): The player to check (1 for human, -1 for AI).
+
+        Returns:
+            bool: True if the player has a winning line.
+        """
+        return self._connected(self.tokens(player))
+
+    def winning_moves(self, player):
+        """Returns the columns where a player would connect a line by playing now
+
+        Args:
+            player (int): The player (1 for human, -1 for AI), whoever is to move.
+
+        Returns:
+            list: The winning columns, from left to right.
+        """
+        tokens = self.tokens(player)
+        rows = self.variant.rows
+        return [col for col in range(self.variant.columns)
+                if self.heights[col] < rows and self._connected(tokens | 1 << (col * (rows + 1) + self.heights[col]))]
+
+    def winner(self):
+        """Returns the winner of the position
+
+        Returns:
+            int: 1 if the human player has won, -1 if the AI has won, 0 otherwise.
+        """
+        if not self.moves:
+            return 0
+        # Only the last player to move can have completed a line
+        player = -self.player_to_move()
+        return player if self.has_won(player) else 0
+
+    def is_full(self):
+        """Checks whether every cell of the board is taken
+        """
+        return len(self.moves) == self.variant.size
+
+    def shots(self):
+        """Returns the (row, col) positions played, in order
+
+        Returns:
+            list: The shots, as the shared tuples of the variant.
+        """
+        heights = [self.variant.rows - 1] * self.variant.columns
+        shots = []
+        for col in self.moves:
+            shots.append(self.variant.cells[heights[col]][col])
+            heights[col] -= 1
+        return shots
+
+    def to_array(self):
+        """Returns the board as an array, rows counted from the top
+
+        Returns:
+            np.array: The int8 array of the tokens (1, -1 or 0).
+        """
+        board = np.zeros((self.variant.rows, self.variant.columns), dtype=np.int8)
+        for row, col in self.shots():
+            board[row][col] = 1 if self.position & self._bit(row, col) else -1
+        return board
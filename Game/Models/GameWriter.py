@@ -0,0 +1,198 @@
+import csv
+import io
+import os
+import threading
+import time
+
+from .FileLock import FileLock
+from .Rollup import Rollup
+
+
+class GameWriter:
+    """Class appending finished games to the game data CSV file in batches
+
+    Saved games are queued in memory and a background thread appends them with a single
+    write when batch_size games are waiting or when the oldest one has waited flush_interval
+    seconds. Game ids are given when the batch is written, under the lock of the data file,
+    from the id of the last game in the file, so that they stay consecutive even when several
+    processes save games to the same file.
+
+    The fsync policy decides when the appended rows are forced to disk:
+    "batch" after every batch, "close" only when the writer is closed, "never" leaving it
+    to the operating system.
+    """
+    COLUMNS = ["id", "date", "player_who_starts", "winner", "shots_played_player", "shots_played_ia", "shots"]
+    FSYNC_POLICIES = ("batch", "close", "never")
+
+    def __init__(self, data_file, batch_size=256, flush_interval=1.0, fsync="batch"):
+        """Initializes an empty writer, its thread being started with the first game
+
+        Args:
+            data_file (str): The game data CSV file.
+            batch_size (int): The number of waiting games which triggers a write.
+            flush_interval (float): The longest time a game waits before being written, in seconds.
+            fsync (str): The fsync policy, one of FSYNC_POLICIES.
+
+        Raises:
+            ValueError: If the fsync policy is unknown.
+        """
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self._data_file = data_file
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+
+        self._pending = []
+        self._first_pending_time = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+
+    def get_data_file(self):
+        """Getter for the CSV file the games are appended to
+        """
+        return self._data_file
+
+    def submit(self, row):
+        """Queues a finished game
+
+        Args:
+            row (list): The values of the game for every column of COLUMNS but the id.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The game writer is closed.")
+            if not self._pending:
+                self._first_pending_time = time.monotonic()
+            self._pending.append(row)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self._batch_size:
+                self._condition.notify()
+
+    def _take_pending(self):
+        """Removes and returns the waiting games
+        """
+        rows, self._pending = self._pending, []
+        self._first_pending_time = None
+        return rows
+
+    def _run(self):
+        """Writes the waiting games whenever a batch is full or has waited long enough
+        """
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if len(self._pending) >= self._batch_size:
+                        break
+                    if self._pending:
+                        remaining = self._first_pending_time + self._flush_interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+                # The write lock is taken before releasing the queue so that batches keep their order
+                self._write_lock.acquire()
+                rows = self._take_pending()
+
+            try:
+                self._write(rows)
+            finally:
+                self._write_lock.release()
+
+    @staticmethod
+    def _next_id(data_file):
+        """Reads the id following the one of the last game of the open data file
+
+        Args:
+            data_file (io.BufferedRandom): The data file, opened in binary mode.
+
+        Returns:
+            int: The id of the next game.
+        """
+        size = data_file.seek(0, os.SEEK_END)
+        data_file.seek(max(0, size - 4096))
+        lines = data_file.read().rstrip(b"\n").split(b"\n")
+        if len(lines) == 1 and size <= 4096:
+            # Only the header
+            return 1
+        try:
+            return int(lines[-1].split(b",", 1)[0]) + 1
+        except ValueError:
+            # Unreadable last line, count the games instead
+            data_file.seek(0)
+            return sum(1 for _ in data_file)
+
+    def _write(self, rows):
+        """Appends games to the CSV file in a single write, the write lock being held
+
+        The file lock is held only for the append and the update of the daily and monthly
+        tables, so that other processes saving games wait no longer than one write.
+
+        Args:
+            rows (list): The games to append, without their ids.
+        """
+        if not rows:
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            writer.writerow(row)
+        lines = buffer.getvalue().splitlines(keepends=True)
+
+        with FileLock(self._data_file):
+            with open(self._data_file, 'a+b') as data_file:
+                size = data_file.seek(0, os.SEEK_END)
+                if size == 0:
+                    data_file.write((",".join(self.COLUMNS) + "\n").encode())
+                    next_id = 1
+                else:
+                    # Other processes may have appended or renumbered games since the last write
+                    next_id = GameWriter._next_id(data_file)
+                    data_file.seek(size - 1)
+                    if data_file.read(1) != b"\n":
+                        # Terminate a line cut by an interruption
+                        data_file.write(b"\n")
+
+                data_file.write("".join(f"{next_id + offset},{line}" for offset, line in enumerate(lines)).encode())
+                data_file.flush()
+                if self._fsync == "batch":
+                    os.fsync(data_file.fileno())
+                size_after = data_file.tell()
+
+            Rollup.record(self._data_file, rows, size, size_after)
+
+    def flush(self):
+        """Writes the waiting games now, from the calling thread
+        """
+        with self._condition:
+            self._write_lock.acquire()
+            rows = self._take_pending()
+        try:
+            self._write(rows)
+        finally:
+            self._write_lock.release()
+
+    def close(self):
+        """Stops the thread and writes the waiting games, forcing the file to disk with the "close" policy
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+        if self._fsync == "close" and os.path.isfile(self._data_file):
+            with self._write_lock, open(self._data_file, 'a') as data_file:
+                os.fsync(data_file.fileno())
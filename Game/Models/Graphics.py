@@ -3,18 +3,17 @@ import matplotlib.ticker as ticker
 import ast
 from collections import Counter
 
-import pandas as pd
-
 from .Database import Database
+from .Rollup import Rollup
 
 class Graphics:
     """Class for generating various graphs based on game data
     """
     @staticmethod
-    def plot_overview(ax=None):
+    def plot_overview(ax=None, df=None):
         """Plot an overview of the game results (Player wins, AI wins, Draws)
         """
-        df = Database.load_game_data()
+        df = Database.load_game_data() if df is None else df.copy()
         if df.empty:
             return
 
@@ -28,19 +27,22 @@ class Graphics:
         colors = ['yellow', 'red', 'lightblue']
         explode = (0.1, 0.1, 0)
 
-        if ax is None:
+        # The figure is only shown when it is not drawn on the caller's axes
+        show = ax is None
+        if show:
             ax = plt.gca()
 
         ax.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', shadow=True, startangle=140)
         ax.axis('equal')
         ax.set_title('Overview of Game Results')
-        plt.show()
+        if show:
+            plt.show()
 
     @staticmethod
-    def plot_trend_dispersion(ax=None):
+    def plot_trend_dispersion(ax=None, df=None):
         """Plot trend and dispersion measures (mean, median, standard deviation of moves)
         """
-        df = Database.load_game_data()
+        df = Database.load_game_data() if df is None else df.copy()
         if df.empty:
             return
 
@@ -50,7 +52,8 @@ class Graphics:
         median_moves = df['total_moves'].median()
         std_moves = df['total_moves'].std()
 
-        if ax is None:
+        show = ax is None
+        if show:
             ax = plt.gca()
 
         ax.boxplot(df['total_moves'], vert=False, patch_artist=True, boxprops=dict(facecolor="lightblue"))
@@ -60,13 +63,14 @@ class Graphics:
         ax.set_xlabel('Number of Moves')
         ax.set_title('Trend and Dispersion Measures')
         ax.legend()
-        plt.show()
+        if show:
+            plt.show()
 
     @staticmethod
-    def plot_wins_by_first_player(ax=None):
+    def plot_wins_by_first_player(ax=None, df=None):
         """Plot the number of victories depending on who starts the game (Player or AI)
         """
-        df = Database.load_game_data()
+        df = Database.load_game_data() if df is None else df.copy()
         if df.empty:
             return
 
@@ -81,20 +85,22 @@ class Graphics:
         labels = ['Player starts', 'AI starts']
         wins = [player_starts_player_wins, ai_starts_ai_wins]
 
-        if ax is None:
+        show = ax is None
+        if show:
             ax = plt.gca()
 
         ax.bar(labels, wins, color=['blue', 'red'])
         ax.set_ylabel('Number of victories')
         ax.set_title('Victories depending on who starts')
         ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-        plt.show()
+        if show:
+            plt.show()
 
     @staticmethod
-    def plot_column_play_counts(ax=None):
-        """Plot the frequency of moves per column (1 to 7)
+    def plot_column_play_counts(ax=None, df=None):
+        """Plot the frequency of moves per column (from 1 to the widest board played)
         """
-        df = Database.load_game_data()
+        df = Database.load_game_data() if df is None else df.copy()
         if df.empty:
             return
 
@@ -113,42 +119,38 @@ class Graphics:
         # Count the frequency of each column
         counts = Counter(all_columns)
 
-        # Create the list of columns (1 to 7)
-        columns = list(range(1, 8))
+        # Create the list of columns (1 to 7, or up to the widest board played)
+        columns = list(range(1, max([7] + all_columns) + 1))
         frequencies = [counts.get(c, 0) for c in columns]
 
-        if ax is None:
+        show = ax is None
+        if show:
             ax = plt.gca()
 
         ax.bar(columns, frequencies, color='orange')
-        ax.set_xlabel('Column (1 to 7)')
+        ax.set_xlabel('Column')
         ax.set_ylabel('Number of times played')
         ax.set_title('Frequency of play per column (all moves)')
         ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
         ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-        plt.show()
+        if show:
+            plt.show()
 
     @staticmethod
-    def plot_games_per_month(ax=None):
+    def plot_games_per_month(ax=None, df=None):
         """Plot the number of games played per month
+
+        Without a DataFrame, the monthly table kept up to date when games are saved is read.
         """
-        df = Database.load_game_data()
-        if df.empty:
+        monthly = Database.load_rollup("monthly") if df is None else Rollup.aggregate(df, "monthly")
+        if monthly.empty:
             return
 
-        # Convert the date column to datetime format
-        df['date'] = pd.to_datetime(df['date'])
-
-        # Extract the month period (year-month)
-        df['month'] = df['date'].dt.to_period('M')
-
-        # Count the number of games per month
-        games_per_month = df['month'].value_counts().sort_index()
-
-        months = [str(m) for m in games_per_month.index]
-        counts = games_per_month.values
+        months = list(monthly.index.strftime("%Y-%m"))
+        counts = monthly["games"].values
 
-        if ax is None:
+        show = ax is None
+        if show:
             ax = plt.gca()
 
         ax.bar(months, counts, color='mediumseagreen')
@@ -156,15 +158,16 @@ class Graphics:
         ax.set_ylabel('Number of games')
         ax.set_title('Number of games played per month')
         ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
+        ax.tick_params(axis='x', labelrotation=45)
+        if show:
+            plt.tight_layout()
+            plt.show()
 
     @staticmethod
-    def plot_shots_frequency_per_game(ax=None):
+    def plot_shots_frequency_per_game(ax=None, df=None):
         """Plot the frequency of shots (total moves) per game
         """
-        df = Database.load_game_data()
+        df = Database.load_game_data() if df is None else df.copy()
         if df.empty:
             return
 
@@ -177,7 +180,8 @@ class Graphics:
         # Count the frequency of each total number of shots
         shot_counts = df['total_shots'].value_counts().sort_index()
 
-        if ax is None:
+        show = ax is None
+        if show:
             ax = plt.gca()
 
         ax.bar(shot_counts.index, shot_counts.values, color='cornflowerblue')
@@ -186,5 +190,6 @@ class Graphics:
         ax.set_title("Frequency of shots played per game")
         ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
         ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-        plt.tight_layout()
-        plt.show()
+        if show:
+            plt.tight_layout()
+            plt.show()
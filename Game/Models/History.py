@@ -0,0 +1,200 @@
+import threading
+
+import numpy as np
+
+from .Snapshot import Snapshot
+from .Variant import Variant
+
+
+class History:
+    """Class aggregating the stored games per position
+
+    Every position reached in a stored game is identified by its canonical hash (folded
+    with its left-right mirror) and the side to move, whatever the move order that led to
+    it. For each position, the table counts the wins, losses and draws of the player to
+    move after each next column played. The table is built in one pass over the columnar
+    snapshot, then extended with the games saved since, so looking up a position is a
+    single hash table access.
+    """
+    WIN = 0
+    LOSS = 1
+    DRAW = 2
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, variant):
+        """Initializes an empty table for a variant
+
+        Use History.get instead of calling the constructor directly.
+
+        Args:
+            variant (Variant): The variant of the games to aggregate.
+        """
+        self._variant = variant
+        self._index = {}
+        self._counts = np.zeros((1024, variant.columns, 3), dtype=np.uint32)
+        self._generation = None
+        self._games = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, variant=None):
+        """Returns the shared table of a variant, creating it on first use
+
+        Args:
+            variant (Variant): The variant of the games, the classic one when omitted.
+
+        Returns:
+            History: The table of the variant.
+        """
+        variant = variant or Variant.get()
+        instance = cls._instances.get(variant)
+        if instance is None:
+            # The preloader thread and the game may ask for the table at the same time
+            with cls._instances_lock:
+                instance = cls._instances.get(variant)
+                if instance is None:
+                    instance = cls._instances[variant] = cls(variant)
+        return instance
+
+    @staticmethod
+    def position_key(variant, shots, player_to_move):
+        """Computes the canonical key of the position reached after some shots
+
+        Args:
+            variant (Variant): The variant of the game.
+            shots (list): The (row, col) positions played, in order.
+            player_to_move (int): The player to move after the shots (1 for human, -1 for AI).
+
+        Returns:
+            tuple: The canonical key and True if the position is the mirrored one.
+        """
+        position_hash = mirror_hash = 0
+        player = player_to_move if len(shots) % 2 == 0 else -player_to_move
+        for row, col in shots:
+            position_hash ^= variant.zobrist[player][row][col]
+            mirror_hash ^= variant.zobrist[player][row][variant.columns - 1 - col]
+            player = -player
+        return History._fold(variant, position_hash, mirror_hash, player_to_move)
+
+    @staticmethod
+    def _fold(variant, position_hash, mirror_hash, player_to_move):
+        """Folds a position hash with its mirror and the side to move
+
+        Returns:
+            tuple: The canonical key and True if the position is the mirrored one.
+        """
+        mirrored = mirror_hash < position_hash
+        key = mirror_hash if mirrored else position_hash
+        if player_to_move == -1:
+            key ^= variant.zobrist_side
+        return key, mirrored
+
+    def _row_for(self, key):
+        """Returns the row of the counts array of a position, adding it if needed
+        """
+        row = self._index.get(key)
+        if row is None:
+            row = len(self._index)
+            if row == len(self._counts):
+                self._counts = np.concatenate((self._counts, np.zeros_like(self._counts)))
+            self._index[key] = row
+        return row
+
+    def _add_games(self, arrays, start, end):
+        """Replays stored games and adds their positions to the table
+
+        Args:
+            arrays (dict): The columns of the snapshot.
+            start (int): The index of the first game to add.
+            end (int): The index after the last game to add.
+        """
+        variant = self._variant
+        zobrist = variant.zobrist
+        last_column = variant.columns - 1
+        first_move = int(arrays["move_offsets"][start - 1]) if start else 0
+        offsets = [first_move] + arrays["move_offsets"][start:end].tolist()
+        columns = arrays["move_columns"][first_move:offsets[-1]].tolist()
+        winners = arrays["winner"][start:end].tolist()
+        starters = arrays["player_who_starts"][start:end].tolist()
+
+        for game in range(end - start):
+            game_columns = columns[offsets[game] - first_move:offsets[game + 1] - first_move]
+            if not game_columns or max(game_columns) > last_column or len(game_columns) > variant.size:
+                # Game played on another variant
+                continue
+
+            winner = winners[game]
+            player = starters[game] or 1
+            heights = [variant.rows - 1] * variant.columns
+            position_hash = mirror_hash = 0
+
+            for col in game_columns:
+                row = heights[col]
+                if row < 0:
+                    break
+                key, mirrored = History._fold(variant, position_hash, mirror_hash, player)
+                outcome = self.WIN if winner == player else self.LOSS if winner == -player else self.DRAW
+                # The row is found first: adding a position may replace the counts array
+                position_row = self._row_for(key)
+                self._counts[position_row, last_column - col if mirrored else col, outcome] += 1
+
+                heights[col] = row - 1
+                position_hash ^= zobrist[player][row][col]
+                mirror_hash ^= zobrist[player][row][last_column - col]
+                player = -player
+
+    def _clear(self):
+        """Empties the table, which the next refresh rebuilds from the first game
+        """
+        self._index = {}
+        self._counts[:] = 0
+        self._games = 0
+        self._generation = None
+
+    def refresh(self, data_file):
+        """Brings the table up to date with the stored games
+
+        Only the games saved since the last refresh are replayed, unless the history has
+        been rewritten, in which case the table is rebuilt. If replaying fails, the table is
+        emptied, so that the next refresh rebuilds it instead of counting games twice.
+
+        Args:
+            data_file (str): The game data CSV file.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        with self._lock:
+            meta = Snapshot.refresh(data_file)
+            if meta.get("generation") != self._generation:
+                self._clear()
+                self._generation = meta.get("generation")
+
+            if meta["games"] > self._games:
+                try:
+                    self._add_games(Snapshot.open(), self._games, meta["games"])
+                except BaseException:
+                    self._clear()
+                    raise
+                self._games = meta["games"]
+
+    def lookup(self, shots, player_to_move):
+        """Returns the outcomes recorded after each next column of the position reached after some shots
+
+        Args:
+            shots (list): The (row, col) positions played, in order.
+            player_to_move (int): The player to move after the shots (1 for human, -1 for AI).
+
+        Returns:
+            np.array: For each column of the real board, the wins, losses and draws of the
+            player to move, None if the position has never been reached.
+        """
+        key, mirrored = History.position_key(self._variant, shots, player_to_move)
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                return None
+            counts = self._counts[row].copy()
+        return counts[::-1] if mirrored else counts
@@ -1,52 +1,160 @@
 import random
 import time
-import numpy as np
 
 from .Database import Database
+from .EvaluationCache import EvaluationCache
+from .MCTS import MCTS
+from .ThreatSearch import ThreatSearch
 from .Utils import Utils
 
 class IA:
     """Class representing the artificial intelligence
 
     This class contains static methods to manage the AI's choices, generate possible moves,
-    evaluate moves, and count alignments.
+    and evaluate moves.
     """
+    # Connection to the AI service, opened on the first move asked to it
+    _service_client = None
 
     @staticmethod
     def ia_choice(plateau):
         """Manages the AI's choice by selecting the best possible move
 
-        The AI simulates thinking with a random delay, generates possible moves,
-        evaluates them, and plays the move with the highest score.
+        A threat search runs first: a forced win is played at once, and the moves after
+        which the player has a forced win are left out of the choice, unless all moves lose.
+        Its results are kept in the evaluation cache, saved from one run to the next.
+        If the AI has already evaluated the position while pondering on the player's
+        time, it plays at once. Otherwise it simulates thinking with a random delay,
+        generates possible moves and evaluates them. It plays the move with the highest score.
+        When the engine configuration selects the "mcts" engine, the move is chosen by
+        Monte Carlo Tree Search instead. When it enables "ai_service", the move is asked to
+        the AI service first, and evaluated here only if the service does not answer in time.
 
         Args:
             plateau (Plateau): The instance of the game board.
         """
         print("AI is thinking...")
-        time.sleep(random.uniform(1, 2))
 
-        possible_moves = IA.generate_possible_moves(plateau)
+        col, losing_moves = IA.threat_solution(plateau)
+        if col is not None:
+            plateau.play(col)
+            print(f"AI played at column {col + 1} (forced win)")
+            return
 
-        evaluated_moves = IA.evaluate_moves(plateau, possible_moves)
+        engine_config = Utils.load_engine_config()
+        if engine_config.get("engine") == "mcts":
+            IA.mcts_choice(plateau, engine_config, losing_moves)
+            return
 
-        # Selects the move with the highest score
-        best_move = max(evaluated_moves, key=evaluated_moves.get)
-        row, col = best_move
+        evaluated_moves = plateau.get_ponder().lookup(plateau)
+        if evaluated_moves is None and engine_config.get("ai_service"):
+            col = IA.service_choice(plateau, engine_config.get("ai_service_deadline", 1.0))
+            if col is not None and col not in losing_moves:
+                plateau.play(col)
+                print(f"AI played at column {col + 1}")
+                return
 
-        # Place the AI's token on the board
-        board = plateau.get_plateau()
-        board[row][col] = -1
-        plateau.set_plateau(board)
+        if evaluated_moves is None:
+            time.sleep(random.uniform(1, 2))
+
+            possible_moves = IA.generate_possible_moves(plateau)
 
-        # Add the move to the list of played shots
-        shots = plateau.get_shots()
-        shots.append((row, col))
-        plateau.set_shots(shots)
+            evaluated_moves = IA.evaluate_moves(plateau, possible_moves)
 
-        plateau.set_shots_played_ia(plateau.get_shots_played_ia() + 1)
+        _, col = IA.best_move(evaluated_moves, losing_moves)
+
+        # Place the AI's token on the board
+        plateau.play(col)
 
         print(f"AI played at column {col + 1}")
 
+    @staticmethod
+    def best_move(evaluated_moves, losing_moves=()):
+        """Selects the move with the highest score, among those not losing by force if possible
+
+        Args:
+            evaluated_moves (dict): The scores of the moves, keyed by (row, column).
+            losing_moves (set): The columns after which the opponent has a forced win.
+
+        Returns:
+            tuple: The (row, column) position of the best move.
+        """
+        candidates = [move for move in evaluated_moves if move[1] not in losing_moves] or list(evaluated_moves)
+        return max(candidates, key=evaluated_moves.get)
+
+    @staticmethod
+    def threat_solution(plateau, use_cache=True):
+        """Returns the forced win and the losing moves of the player to move, from the cache when possible
+
+        Args:
+            plateau (Plateau): The instance of the game board.
+            use_cache (bool): Whether to read and record the results in the evaluation cache.
+
+        Returns:
+            tuple: The column of the forced win (None if there is none) and the set of
+            columns after which the opponent has a forced win.
+        """
+        state = plateau.get_state()
+        solution = None
+        if use_cache:
+            cache = EvaluationCache.get(plateau.get_variant())
+            solution = cache.lookup(state)
+        if solution is None:
+            threat_search = ThreatSearch(state)
+            forced_win = threat_search.forced_win()
+            losing_moves = threat_search.losing_moves() if forced_win is None else set()
+            solution = forced_win, losing_moves
+            if use_cache:
+                cache.store(state, *solution)
+        return solution
+
+    @staticmethod
+    def service_choice(plateau, deadline):
+        """Asks the AI service for the move to play
+
+        Args:
+            plateau (Plateau): The instance of the game board.
+            deadline (float): The time the answer may take, in seconds.
+
+        Returns:
+            int: The column chosen by the service, None if it is not running or did not answer in time.
+        """
+        if IA._service_client is None:
+            # Imported here because the service evaluates its moves with this class
+            from .AIService import AIClient
+            IA._service_client = AIClient()
+        return IA._service_client.best_move(plateau, deadline)
+
+    @staticmethod
+    def mcts_choice(plateau, engine_config, losing_moves=()):
+        """Plays the move chosen by Monte Carlo Tree Search with batched random playouts
+
+        The moves after which the player has a forced win are not searched, unless all
+        moves lose. If the time budget runs out before the search has expanded a move, the
+        move with the best heuristic evaluation is played instead.
+
+        Args:
+            plateau (Plateau): The instance of the game board.
+            engine_config (dict): The engine configuration (time budget, batch size, exploration).
+            losing_moves (set): The columns after which the player has a forced win.
+        """
+        search = MCTS(plateau,
+                      time_budget=engine_config.get("mcts_time_budget", 1.0),
+                      batch_size=engine_config.get("mcts_batch_size", 64),
+                      exploration=engine_config.get("mcts_exploration", 1.41))
+        col = search.search(excluded=losing_moves)
+        if col is None:
+            evaluated_moves = IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False)
+            _, col = IA.best_move(evaluated_moves, losing_moves)
+            plateau.play(col)
+            print(f"AI played at column {col + 1} (no time left for the tree search)")
+            return
+
+        plateau.play(col)
+
+        print(f"AI played at column {col + 1} ({search.get_playouts()} playouts, "
+              f"{search.get_playouts_per_second():.0f} playouts/s)")
+
     @staticmethod
     def generate_possible_moves(plateau):
         """Generates a dictionary of possible moves on the board
@@ -60,103 +168,107 @@ class IA:
             dict: A dictionary of possible moves with their initial scores.
         """
         possible_moves = {}
-        for col in range(7):
-            for row in range(5, -1, -1):
-                if plateau.get_plateau()[row][col] == 0:
-                    possible_moves[(row, col)] = 0  # Initialisation à 0
-                    break
+        for col in range(plateau.get_variant().columns):
+            if not plateau.is_column_full(col):
+                possible_moves[(plateau.get_row_to_play(col), col)] = 0  # Initialisation à 0
         return possible_moves
 
     @staticmethod
-    def evaluate_moves(plateau_obj, moves):
+    def evaluate_moves(plateau_obj, moves, verbose=True, points_config=None, ia=-1, use_history=True, use_cache=True):
         """Evaluates each possible move by simulating the move on the board
 
         Assigns scores based on the possibility of winning, blocking the opponent,
-        and the alignment of tokens.
+        not giving the opponent a win on the cell above, and the threats (open twos,
+        open threes and well-placed odd/even threats) created or destroyed by the move.
+        These scores are kept in the evaluation cache, by position, side and weights, and
+        saved from one run to the next; the historical scores are added afterwards.
 
         Args:
             plateau_obj (Plateau): The instance of the game board.
             moves (dict): The dictionary of possible moves.
+            verbose (bool): Whether to print messages, disabled when evaluating in the background.
+            points_config (dict): The weights of the evaluation, read from the configuration file when omitted.
+            ia (int): The side the moves are evaluated for, -1 for the AI, 1 to play as the human player.
+            use_history (bool): Whether to add the scores of the historical games.
+            use_cache (bool): Whether to read and record the scores in the evaluation cache.
 
         Returns:
             dict: The dictionary of possible moves with their updated scores.
         """
-        points_config = Utils.load_points_config()
+        points_config = points_config or Utils.load_points_config()
+
+        scores = None
+        if use_cache:
+            cache = EvaluationCache.get(plateau_obj.get_variant())
+            scores = cache.lookup_scores(plateau_obj.get_state(), points_config, ia)
+        if scores is None:
+            scores = IA.heuristic_scores(plateau_obj, points_config, ia)
+            if use_cache:
+                cache.store_scores(plateau_obj.get_state(), points_config, ia, scores)
+
+        historical_scores = {}
+        if use_history:
+            historical_scores = Database.evaluate_moves_from_history(plateau_obj.get_shots(), ia, verbose,
+                                                                   plateau_obj.get_variant().columns)
+
+        evaluator = plateau_obj.get_evaluator()
+        for (row, col) in moves:
+            moves[(row, col)] += scores[col]
 
-        board = plateau_obj.get_plateau()
-        player = 1
-        ia = -1
+            # Add historical score if available, a winning move needing none
+            if (row, col) in historical_scores and not evaluator.is_winning_cell(row, col, ia):
+                moves[(row, col)] += historical_scores[(row, col)]
 
-        historical_scores = Database.evaluate_moves_from_history(plateau_obj.get_shots(), ia)
+        return moves
 
-        for (row, col) in moves:
-            simulated_board = np.copy(board)
-            simulated_board[row][col] = ia
+    @staticmethod
+    def heuristic_scores(plateau_obj, points_config, ia=-1):
+        """Scores every playable column from the position alone, without the historical games
+
+        Moves are simulated in place with play/undo, without copying the board.
+
+        Args:
+            plateau_obj (Plateau): The instance of the game board.
+            points_config (dict): The weights of the evaluation.
+            ia (int): The side the moves are evaluated for, -1 for the AI, 1 to play as the human player.
+
+        Returns:
+            dict: The score of each playable column.
+        """
+        player = -ia
+        center_distance = plateau_obj.get_variant().center_distance
+        evaluator = plateau_obj.get_evaluator()
+        ia_score = evaluator.score(ia)
+        player_score = evaluator.score(player)
+
+        scores = {}
+        for col in range(plateau_obj.get_variant().columns):
+            if plateau_obj.is_column_full(col):
+                continue
+            row = plateau_obj.get_row_to_play(col)
 
             # Check if the move leads to a win for the AI
-            if Utils.get_player_to_win(simulated_board) == ia:
-                moves[(row, col)] += points_config["immediate_win"]
+            if evaluator.is_winning_cell(row, col, ia):
+                scores[col] = points_config["immediate_win"]
                 continue
 
-            simulated_board[row][col] = player
+            score = 0
             # Check if the move blocks a win for the player
-            if Utils.get_player_to_win(simulated_board) == player:
-                moves[(row, col)] += points_config["block_opponent_win"]
+            if evaluator.is_winning_cell(row, col, player):
+                score += points_config["block_opponent_win"]
 
-            # Add points for potential alignments of the AI and the player
-            moves[(row, col)] += IA.count_alignment(board, row, col, ia) * points_config["ai_alignment_score"]
-            moves[(row, col)] += IA.count_alignment(board, row, col, player) * points_config["player_alignment_score"]
+            plateau_obj.play(col)
 
-            moves[(row, col)] += points_config["central_column_preference"] - abs(3 - col)  # Higher score for columns closer to the center
+            # Avoid moves letting the player win on the cell just above
+            if evaluator.is_winning_cell(row - 1, col, player):
+                score -= points_config["avoid_giving_win"]
 
-            # Add historical score if available
-            if (row, col) in historical_scores:
-                moves[(row, col)] += historical_scores[(row, col)]
+            # Add points for the threats created by the AI and the threats taken from the player
+            score += (evaluator.score(ia) - ia_score) * points_config["ai_alignment_score"]
+            score += (player_score - evaluator.score(player)) * points_config["player_alignment_score"]
 
-        return moves
+            plateau_obj.undo()
 
-    @staticmethod
-    def count_alignment(board, row, col, player):
-        """Counts the number of aligned tokens in all directions
-
-        Counts horizontal, vertical, and diagonal alignments for a given player
-        from a specific position.
-
-        Args:
-            board (np.array): The array representing the game board.
-            row (int): The row of the position to evaluate.
-            col (int): The column of the position to evaluate.
-            player (int): The player for whom to count the alignments (1 for human, -1 for AI).
+            scores[col] = score + points_config["central_column_preference"] - center_distance[col]  # Higher score for columns closer to the center
 
-        Returns:
-            int: The maximum number of aligned tokens found.
-        """
-        count = 0
-
-        def count_dir(dr, dc):
-            """Counts the number of aligned tokens in a given direction.
-
-            Args:
-                dr (int): Row movement for the direction.
-                dc (int): Column movement for the direction.
-
-            Returns:
-                int: The number of aligned tokens in this direction.
-            """
-            total = 1
-            for direction in [1, -1]:
-                r, c = row, col
-                for _ in range(3):
-                    r += dr * direction
-                    c += dc * direction
-                    if 0 <= r < 6 and 0 <= c < 7 and board[r][c] == player:
-                        total += 1
-                    else:
-                        break
-            return total
-
-        # Check the four possible directions: horizontal, vertical, and diagonals
-        for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
-            count = max(count, count_dir(dr, dc))
-
-        return count
+        return scores
@@ -0,0 +1,202 @@
+import math
+import time
+
+import numpy as np
+
+
+class MCTSNode:
+    """Class representing a node of the Monte Carlo search tree
+    """
+    __slots__ = ("children", "untried", "visits", "value")
+
+    def __init__(self, untried):
+        """Initializes a node not visited yet
+
+        Args:
+            untried (list): The playable columns not expanded yet.
+        """
+        self.children = {}
+        self.untried = untried
+        self.visits = 0
+        # Sum of the rewards of the player who played the move leading to this node
+        self.value = 0.0
+
+
+class MCTS:
+    """Class searching the best move with Monte Carlo Tree Search
+
+    The tree is walked with UCT selection on the board itself (play/undo). From each new
+    leaf, a batch of random playouts is run at once: the playouts are advanced together as
+    (N, rows, columns) NumPy arrays, with vectorized legality and win checks, instead of
+    playing one Python game at a time.
+    """
+    def __init__(self, plateau, time_budget=1.0, batch_size=64, exploration=1.41, seed=None):
+        """Initializes the search
+
+        Args:
+            plateau (Plateau): The board to search, restored to its position after the search.
+            time_budget (float): The thinking time, in seconds.
+            batch_size (int): The number of playouts run together from each leaf.
+            exploration (float): The UCT exploration constant.
+            seed (int): The seed of the random playouts, None for a random one.
+        """
+        self._plateau = plateau
+        self._time_budget = time_budget
+        self._batch_size = batch_size
+        self._exploration = exploration
+        self._rng = np.random.default_rng(seed)
+        self._playouts = 0
+        self._playouts_per_second = 0.0
+
+        variant = plateau.get_variant()
+        self._size = variant.size
+        # Windows through each cell, padded with a window made of a sentinel cell which is always empty
+        sentinel = variant.size
+        windows = np.array(variant.windows + [(sentinel,) * variant.connect], dtype=np.int64)
+        width = max(len(indices) for indices in variant.cell_windows)
+        cell_windows = np.full((variant.size, width), len(variant.windows), dtype=np.int64)
+        for cell, indices in enumerate(variant.cell_windows):
+            cell_windows[cell, :len(indices)] = indices
+        self._cell_window_cells = windows[cell_windows]
+
+    def get_playouts(self):
+        """Getter for the number of playouts run by the last search
+        """
+        return self._playouts
+
+    def get_playouts_per_second(self):
+        """Getter for the playout rate of the last search
+        """
+        return self._playouts_per_second
+
+    def _playable_columns(self):
+        """Returns the playable columns of the current position, or none if the game is over
+        """
+        plateau = self._plateau
+        if plateau.get_evaluator().winner() != 0:
+            return []
+        return [col for col in plateau.get_variant().center_order if not plateau.is_column_full(col)]
+
+    def rollouts(self, count):
+        """Plays random games from the current position, all advanced together
+
+        Args:
+            count (int): The number of playouts.
+
+        Returns:
+            np.array: The winner of each playout (1 for human, -1 for AI, 0 for a draw).
+        """
+        plateau = self._plateau
+        variant = plateau.get_variant()
+        rows, columns = variant.rows, variant.columns
+
+        # Flat boards with one extra sentinel cell, always empty
+        boards = np.zeros((count, self._size + 1), dtype=np.int8)
+        boards[:, :self._size] = plateau.get_plateau().reshape(-1)
+        heights = np.tile(np.array([plateau.get_row_to_play(col) for col in range(columns)]), (count, 1))
+        winners = np.zeros(count, dtype=np.int8)
+        active = np.ones(count, dtype=bool)
+        player = plateau.get_player_to_move()
+        games = np.arange(count)
+
+        for _ in range(self._size - len(plateau.get_shots())):
+            legal = (heights >= 0) & active[:, None]
+            active &= legal.any(axis=1)
+            if not active.any():
+                break
+
+            # Random legal column for each active playout
+            choice = np.where(legal, self._rng.random((count, columns)), -1.0).argmax(axis=1)
+            playing = games[active]
+            col = choice[playing]
+            row = heights[playing, col]
+            cell = row * columns + col
+            boards[playing, cell] = player
+            heights[playing, col] = row - 1
+
+            # Only the windows through the played cell can have been completed
+            window_cells = self._cell_window_cells[cell]
+            won = (boards[playing[:, None, None], window_cells] == player).all(axis=2).any(axis=1)
+            winners[playing[won]] = player
+            active[playing[won]] = False
+            player = -player
+
+        return winners
+
+    def _select_child(self, node):
+        """Returns the column of the child with the best UCT score
+        """
+        log_visits = math.log(node.visits)
+        exploration = self._exploration
+        return max(node.children.items(),
+                   key=lambda item: item[1].value / item[1].visits
+                   + exploration * math.sqrt(log_visits / item[1].visits))[0]
+
+    def search(self, excluded=()):
+        """Runs the search until the time budget is spent
+
+        Args:
+            excluded (set): The columns not to play at the root, all being searched if every
+                playable column is excluded.
+
+        Returns:
+            int: The column with the most visits, None if the game is already over or if the
+            time budget ran out before the first move was expanded.
+        """
+        plateau = self._plateau
+        columns = self._playable_columns()
+        root = MCTSNode([col for col in columns if col not in excluded] or columns)
+        if not root.untried:
+            return None
+
+        self._playouts = 0
+        start = time.perf_counter()
+        deadline = start + self._time_budget
+
+        while time.perf_counter() < deadline:
+            node = root
+            path = [root]
+
+            # Selection
+            while not node.untried and node.children:
+                col = self._select_child(node)
+                plateau.play(col)
+                node = node.children[col]
+                path.append(node)
+
+            # Expansion
+            if node.untried:
+                col = node.untried.pop()
+                plateau.play(col)
+                child = MCTSNode(self._playable_columns())
+                node.children[col] = child
+                node = child
+                path.append(node)
+
+            # Simulation: a batch of playouts, or the result of a finished game
+            mover = -plateau.get_player_to_move()
+            winner = plateau.get_evaluator().winner()
+            if winner != 0 or len(plateau.get_shots()) == self._size:
+                count = self._batch_size
+                reward = count * (1.0 if winner == mover else 0.5 if winner == 0 else 0.0)
+            else:
+                winners = self.rollouts(self._batch_size)
+                count = len(winners)
+                reward = float(np.count_nonzero(winners == mover)) + 0.5 * float(np.count_nonzero(winners == 0))
+                self._playouts += count
+
+            # Backpropagation, alternating the point of view at each level
+            for node in reversed(path):
+                node.visits += count
+                node.value += reward
+                reward = count - reward
+
+            for _ in range(len(path) - 1):
+                plateau.undo()
+
+        elapsed = time.perf_counter() - start
+        self._playouts_per_second = self._playouts / elapsed if elapsed > 0 else 0.0
+
+        if not root.children:
+            return None
+        return max(root.children.items(), key=lambda item: item[1].visits)[0]
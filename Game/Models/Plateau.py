@@ -1,92 +1,234 @@
 import ast
 import os
+import shutil
 from pathlib import Path
 
 import seaborn as sns
 import random
 
-import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt, gridspec
 from matplotlib.backends.backend_pdf import PdfPages
 
 from .Database import Database
+from .Evaluator import Evaluator
+from .GameState import GameState
 from .Graphics import Graphics
 from .IA import IA
 from .Player import Player
+from .Preloader import Preloader
+from .RenderCache import RenderCache
+from .Rollup import Rollup
+from .Ponder import Ponder
+from .Spectator import SpectatorServer, SpectatorClient
 from .Utils import Utils
+from .Variant import Variant
 
 
 class Plateau:
     """Class representing the game board
 
     This class manages the game state, including the board, current player,
-    and game logic such as checking for wins and switching players.
+    and game logic such as checking for wins and switching players. The position itself
+    (board, moves, hashes) lives in a GameState, which simulations can use on its own.
     """
-    def __init__(self):
+    # Charts of the statistics report and of the graphics menu
+    REPORT_PANELS = [
+        ("overview", Graphics.plot_overview),
+        ("trend_dispersion", Graphics.plot_trend_dispersion),
+        ("wins_by_first_player", Graphics.plot_wins_by_first_player),
+        ("column_play_counts", Graphics.plot_column_play_counts),
+        ("games_per_month", Graphics.plot_games_per_month),
+        ("shots_frequency_per_game", Graphics.plot_shots_frequency_per_game),
+    ]
+
+    # Snapshot of the game suspended by the player, resumed from the main menu
+    SUSPENDED_GAME_FILE = '../data/suspended_game.bin'
+
+    def __init__(self, rows=6, columns=7, connect=4):
         """Initializes the game board and game state
+
+        Args:
+            rows (int): Number of rows of the board.
+            columns (int): Number of columns of the board.
+            connect (int): Number of aligned tokens needed to win.
         """
+        self._variant = Variant.get(rows, columns, connect)
+        self._ponder = Ponder()
+        self._spectator = SpectatorServer()
+        self._preloader = Preloader()
+        self._state = None
+        self._evaluator = None
         self._shots = None
         self._winner = None
-        self._shots_played_ia = None
-        self._shots_played_player = None
         self._player_who_starts = None
         self._current_player = None
         self._game_over = None
-        self._plateau = None
+        self._suspended = None
         self._reset_game()
 
     def _reset_game(self):
         """Resets the game state to initial values
         """
-        self._plateau = np.zeros((6, 7), dtype=int)
+        self._state = GameState(self._variant)
         self._game_over = False
+        self._suspended = False
         self._current_player = 0
         self._player_who_starts = 0
-        self._shots_played_player = 0
-        self._shots_played_ia = 0
         self._winner = 0
         self._shots = []
+        self._evaluator = Evaluator(Utils.load_points_config(), variant=self._variant)
 
-    def get_plateau(self):
-        """Getter for the game board
+    def get_variant(self):
+        """Getter for the variant of the game
+        """
+        return self._variant
+
+    def set_variant(self, variant):
+        """Setter for the variant of the game, resetting the board to its dimensions
+        """
+        self._variant = variant
+        self._reset_game()
+
+    def get_ponder(self):
+        """Getter for the ponderer thinking on the human player's time
+        """
+        return self._ponder
+
+    def get_preloader(self):
+        """Getter for the background loader of the history index and the configuration
+        """
+        return self._preloader
+
+    def get_spectator(self):
+        """Getter for the server streaming the game to spectators
+        """
+        return self._spectator
+
+    def clone(self):
+        """Returns an independent copy of the game position
+
+        The copy has the same variant, starter and shots, and can be played on without
+        affecting this board.
+
+        Returns:
+            Plateau: The copy of the board.
+        """
+        copy = Plateau(self._variant.rows, self._variant.columns, self._variant.connect)
+        copy.set_player_who_starts(self._player_who_starts)
+        for _, col in self._shots:
+            copy.play(col)
+        return copy
+
+    def set_position(self, state):
+        """Sets the board to a position, taking back and replaying only the moves that differ
+
+        A board reused for many positions (by the ponderer or the AI service) keeps its
+        evaluator and configuration, and only the moves after the part shared with the
+        position it holds are played again.
+
+        Args:
+            state (GameState): The position to reach, of any variant and starter.
+        """
+        if state.variant is not self._variant:
+            self.set_variant(state.variant)
+        if self._player_who_starts != state.starter:
+            while self._shots:
+                self.undo()
+            self.set_player_who_starts(state.starter)
+
+        played = self._state.moves
+        common = 0
+        while common < min(len(played), len(state.moves)) and played[common] == state.moves[common]:
+            common += 1
+        while len(played) > common:
+            self.undo()
+        for col in state.moves[common:]:
+            self.play(col)
+
+    def snapshot(self):
+        """Returns a compact snapshot of the game in progress
+
+        Returns:
+            bytes: The snapshot of the position (see GameState.to_bytes).
+        """
+        return self._state.to_bytes()
+
+    def restore(self, data):
+        """Replaces the game with the one of a snapshot
+
+        Args:
+            data (bytes): A snapshot returned by snapshot.
+
+        Raises:
+            ValueError: If the snapshot cannot be read.
+        """
+        state = GameState.from_bytes(data)
+        self.set_variant(state.variant)
+        self.set_player_who_starts(state.starter)
+        for col in state.moves:
+            self.play(col)
+        self.set_current_player(self.get_player_to_move())
+
+    def suspend_game(self):
+        """Saves the game in progress so that it can be resumed later, and ends the game loop
+        """
+        directory = os.path.dirname(Plateau.SUSPENDED_GAME_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = Plateau.SUSPENDED_GAME_FILE + ".tmp"
+        with open(temporary_path, 'wb') as snapshot_file:
+            snapshot_file.write(self.snapshot())
+        os.replace(temporary_path, Plateau.SUSPENDED_GAME_FILE)
+        self._suspended = True
+
+    def is_suspended(self):
+        """Checks whether the player has suspended the game
+        """
+        return self._suspended
+
+    def resume_suspended_game(self):
+        """Restores the game suspended by the player, removing its snapshot
+
+        Returns:
+            bool: True if a suspended game has been restored.
+        """
+        try:
+            with open(Plateau.SUSPENDED_GAME_FILE, 'rb') as snapshot_file:
+                self.restore(snapshot_file.read())
+        except FileNotFoundError:
+            print("There is no suspended game.")
+            return False
+        except ValueError as e:
+            print(f"The suspended game cannot be resumed: {e}")
+            return False
+        os.remove(Plateau.SUSPENDED_GAME_FILE)
+        return True
+
+    def get_state(self):
+        """Getter for the position of the game
         """
-        return self._plateau
+        return self._state
 
-    def set_plateau(self, plateau):
-        """Setter for the game board
+    def get_plateau(self):
+        """Getter for the game board, as an array built from the position
         """
-        self._plateau = plateau
+        return self._state.to_array()
 
     def get_shots(self):
         """Getter for the list of shots played
         """
         return self._shots
 
-    def set_shots(self, shots):
-        """Setter for the list of shots played
-        """
-        self._shots = shots
-
     def get_shots_played_ia(self):
         """Getter for the number of shots played by the AI
         """
-        return self._shots_played_ia
-
-    def set_shots_played_ia(self, shots_played_ia):
-        """Setter for the number of shots played by the AI
-        """
-        self._shots_played_ia = shots_played_ia
+        return self._state.moves_played(-1)
 
     def get_shots_played_player(self):
         """Getter for the number of shots played by the player
         """
-        return self._shots_played_player
-
-    def set_shots_played_player(self, shots_played_player):
-        """Setter for the number of shots played by the player
-        """
-        self._shots_played_player = shots_played_player
+        return self._state.moves_played(1)
 
     def get_player_who_starts(self):
         """Getter for the player who starts the game
@@ -97,6 +239,8 @@ class Plateau:
         """Setter for the player who starts the game
         """
         self._player_who_starts = player_who_starts
+        self._state.starter = player_who_starts or 1
+        self._evaluator.set_starter(player_who_starts)
 
     def get_current_player(self):
         """Getter for the current player
@@ -128,6 +272,94 @@ class Plateau:
         """
         self._winner = winner
 
+    def get_hash(self):
+        """Getter for the Zobrist hash of the current position
+        """
+        return self._state.hash
+
+    def get_canonical_hash(self):
+        """Returns the hash of the position folded with its left-right mirror
+
+        A position and its mirror have the same value, so caches keyed by the canonical
+        hash share their entries. Moves stored under this key must be mirrored back with
+        Variant.mirror_column when the current position is the mirrored one.
+
+        Returns:
+            tuple: The canonical hash (the smaller of the hashes of the position and of
+            its mirror) and True if the position is the mirrored one.
+        """
+        return self._state.canonical_hash()
+
+    def get_evaluator(self):
+        """Getter for the evaluator kept in sync with the board
+        """
+        return self._evaluator
+
+    def get_player_to_move(self):
+        """Returns the player whose turn it is, deduced from the starter and the number of shots played
+
+        Returns:
+            int: 1 if the human player is to move, -1 if the AI is to move.
+        """
+        return self._state.player_to_move()
+
+    def get_row_to_play(self, col):
+        """Returns the row where a token played in a column would land
+
+        Args:
+            col (int): The column to play in.
+
+        Returns:
+            int: The lowest free row of the column, or -1 if the column is full.
+        """
+        return self._state.row_to_play(col)
+
+    def is_column_full(self, col):
+        """Checks whether a column is full
+
+        Args:
+            col (int): The column to check.
+
+        Returns:
+            bool: True if no token can be played in the column.
+        """
+        return self._state.is_column_full(col)
+
+    def play(self, col):
+        """Plays a token of the player to move in a column
+
+        Updates the position, the list of shots and the evaluator in place, without
+        copying the board.
+
+        Args:
+            col (int): The column to play in.
+
+        Returns:
+            int: The row where the token landed.
+
+        Raises:
+            ValueError: If the column is full.
+        """
+        player = self._state.player_to_move()
+        row = self._state.play(col)
+        self._shots.append(self._variant.cells[row][col])
+        self._evaluator.add(row, col, player)
+        return row
+
+    def undo(self):
+        """Takes back the last shot played, restoring the state as it was before the matching play
+
+        Returns:
+            tuple: The (row, col) position of the removed shot.
+
+        Raises:
+            IndexError: If no shot has been played.
+        """
+        row, col = self._state.undo()
+        self._shots.pop()
+        self._evaluator.remove(row, col, self._state.player_to_move())
+        return row, col
+
     def display_plateau(self):
         """Displays the board in the console as a grid with colored tokens
         """
@@ -135,21 +367,16 @@ class Plateau:
         IA_COLOR = "\033[91m●\033[0m"
         EMPTY_COLOR = "\033[97m○\033[0m"
 
-        print("\n  1 2 3 4 5 6 7")
-        print(" ---------------")
+        columns = self._variant.columns
+        border = " " + "-" * (2 * columns + 1)
+        tokens = {1: PLAYER_COLOR, -1: IA_COLOR}
 
+        # The whole frame is built first and written at once
+        lines = ["", "  " + " ".join(str((col + 1) % 10) for col in range(columns)), border]
         for row in self.get_plateau():
-            print("|", end=" ")
-            for cell in row:
-                if cell == 1:
-                    print(PLAYER_COLOR, end=" ")
-                elif cell == -1:
-                    print(IA_COLOR, end=" ")
-                else:
-                    print(EMPTY_COLOR, end=" ")
-            print("|")
-
-        print(" ---------------\n")
+            lines.append("| " + " ".join(tokens.get(cell, EMPTY_COLOR) for cell in row) + " |")
+        lines.append(border + "\n")
+        print("\n".join(lines))
 
     def player_action(self):
         """Displays the player or AI index depending on who is playing, and calls their game function
@@ -171,19 +398,21 @@ class Plateau:
     def check_win(self):
         """Checks if there is a winner or the game is a draw and updates the game state accordingly.
         """
-        if Utils.get_player_to_win(self.get_plateau()) == 1:
+        winner = self._evaluator.winner()
+
+        if winner == 1:
             self.set_game_over(True)
             self.display_plateau()
             self.set_winner(1)
             print("Player wins!")
 
-        elif Utils.get_player_to_win(self.get_plateau()) == -1:
+        elif winner == -1:
             self.set_game_over(True)
             self.display_plateau()
             self.set_winner(-1)
             print("IA wins!")
 
-        elif not np.any(self.get_plateau() == 0):
+        elif len(self.get_shots()) == self._variant.size:
             self.set_game_over(True)
             self.display_plateau()
             print("The game is a draw because the board is full!")
@@ -191,7 +420,27 @@ class Plateau:
     def save_game(self):
         """Calls the save_new_game method of the Database class to save the current game state to a CSV file
         """
-        Database.save_new_game(self.get_player_who_starts(), self.get_winner(), self.get_shots_played_player(), self.get_shots_played_ia(), self.get_shots())
+        Database.save_new_game(self.get_player_who_starts(), self.get_winner(), self.get_shots_played_player(), self.get_shots_played_ia(), self.get_shots(),
+                               self._variant)
+
+    def player_choice_variant(self):
+        """Prompts the user to choose the variant of the game (board size and number of tokens to connect)
+        """
+        print("Choose the game variant!")
+        for index, (_, _, _, label) in enumerate(Variant.PRESETS, 1):
+            print(f"{index}. {label}")
+
+        while True:
+            try:
+                choice = int(input("Please enter your choice: "))
+                if 1 <= choice <= len(Variant.PRESETS):
+                    rows, columns, connect, _ = Variant.PRESETS[choice - 1]
+                    self.set_variant(Variant.get(rows, columns, connect))
+                    break
+                else:
+                    print(f"Error: Please enter a number between 1 and {len(Variant.PRESETS)}.")
+            except ValueError:
+                print("Please enter a number.")
 
     def player_choice_who_starts(self):
         """Prompts the user to choose who starts the game between human, AI, or random
@@ -224,13 +473,18 @@ class Plateau:
     @staticmethod
     def show_graphics():
         """Displays all the graphics
+
+        The game data is loaded once for all the charts. The interactive windows are drawn
+        each time, only the PDF report is kept in the render cache.
         """
-        Graphics.plot_overview()
-        Graphics.plot_trend_dispersion()
-        Graphics.plot_wins_by_first_player()
-        Graphics.plot_column_play_counts()
-        Graphics.plot_games_per_month()
-        Graphics.plot_shots_frequency_per_game()
+        df = Plateau.load_data()
+        if df is None:
+            print("No game data found.")
+            return
+
+        for name, plot in Plateau.REPORT_PANELS:
+            # The games per month are read from the monthly table
+            plot(df=None if name == "games_per_month" else df)
 
     @staticmethod
     def welcome_menu_options():
@@ -238,14 +492,16 @@ class Plateau:
         """
         print("1. Start a new game")
         print("2. Statistics panel")
-        print("3. Quit the game")
+        print("3. Watch a live game")
+        print("4. Resume the suspended game")
+        print("5. Quit the game")
 
     @staticmethod
     def handle_export():
         """Exports all game data to a CSV file
         """
         try:
-            df = pd.read_csv("../data/game_data.csv")
+            df = Database.read_history()
         except FileNotFoundError:
             print("No game data found.")
             return
@@ -279,7 +535,7 @@ class Plateau:
         """Displays all game data in the terminal
         """
         try:
-            df = pd.read_csv("../data/game_data.csv")
+            df = Database.read_history()
             if df.empty:
                 print("\n⚠️ No game data available.")
             else:
@@ -363,7 +619,7 @@ class Plateau:
             mode (str): The mode in which to display the analysis results. Can be "graphic" or "terminal".
         """
         try:
-            df = pd.read_csv("../data/game_data.csv")
+            df = Database.read_history()
         except FileNotFoundError:
             print("No game data found.")
             return
@@ -376,7 +632,7 @@ class Plateau:
                                                  all_coords)
         elif mode == "graphic":
             Plateau.display_graphical_dashboard(df, win_counts, win_percentages, starter_win_rate, avg_shots,
-                                                     all_coords)
+                                                     all_coords, daily=Database.load_rollup("daily"))
         else:
             print("Invalid mode. Use 'graphic' or 'terminal'.")
 
@@ -414,7 +670,24 @@ class Plateau:
             print("\nNo move data available.")
 
     @staticmethod
-    def display_graphical_dashboard(df, win_counts, win_percentages, starter_win_rate, avg_shots, all_coords):
+    def daily_win_rate(df=None, daily=None):
+        """Computes the player win rate of each day, days without games being left empty
+
+        Args:
+            df (pd.DataFrame): The game data, used when no daily aggregates are given.
+            daily (pd.DataFrame): The daily aggregates of the games.
+
+        Returns:
+            pd.Series: The player win rate indexed by day.
+        """
+        daily = Rollup.aggregate(df, "daily") if daily is None else daily
+        if daily.empty:
+            return pd.Series(dtype=float)
+        return (daily["player_wins"] / daily["games"]).asfreq("D")
+
+    @staticmethod
+    def display_graphical_dashboard(df, win_counts, win_percentages, starter_win_rate, avg_shots, all_coords,
+                                    daily=None):
         """Displays the statistical report as a graphical dashboard
 
         This method creates a graphical dashboard with various plots to visualize the game statistics, including
@@ -428,6 +701,7 @@ class Plateau:
             starter_win_rate (float): The win rate of the starting player.
             avg_shots (float): The average number of shots per game.
             all_coords (list): A list of all coordinates played in the games.
+            daily (pd.DataFrame): The daily aggregates of the games, computed from df when omitted.
         """
         fig = plt.figure(constrained_layout=True, figsize=(16, 10))
         spec = gridspec.GridSpec(ncols=3, nrows=2, figure=fig)
@@ -439,7 +713,7 @@ class Plateau:
         ax1.set_xlabel("Winner")
 
         ax2 = fig.add_subplot(spec[0, 1])
-        df.set_index("date").resample("D")["is_win"].mean().plot(ax=ax2, color="#2196f3")
+        Plateau.daily_win_rate(df, daily).plot(ax=ax2, color="#2196f3")
         ax2.set_title("Player Win Rate Over Time")
         ax2.set_ylabel("Win Rate")
 
@@ -461,7 +735,7 @@ class Plateau:
             col_freq = coords_df["column"].value_counts().sort_index()
             col_freq.plot(kind="bar", color="#ff9800", ax=ax5)
             ax5.set_title("Most Played Columns")
-            ax5.set_xlabel("Column (0 to 6)")
+            ax5.set_xlabel("Column (from 0)")
             ax5.set_ylabel("Total Moves")
         else:
             ax5.text(0.5, 0.5, "No move data available", ha='center', va='center')
@@ -483,16 +757,49 @@ class Plateau:
         plt.show()
 
     @staticmethod
-    def generate_pdf_report():
+    def generate_pdf_report(filepath=None, df=None):
         """Generates a PDF report of the game statistics
+
+        The charts are drawn as vector graphics. The report is kept in the render cache,
+        keyed by the version of the game data, so a report of unchanged data is copied from
+        the cache without loading the games.
+
+        Args:
+            filepath (str): The path of the PDF file, asked to the user when omitted.
+            df (pd.DataFrame): The game data, loaded from the CSV file when omitted.
+
+        Returns:
+            str: The path of the PDF report, None if there is no game data.
         """
-        df = Plateau.load_data()
+        full_history = df is None
+        try:
+            if full_history:
+                Database.flush_games()
+                data_version = RenderCache.data_version(Database.DATA_FILE)
+            else:
+                data_version = RenderCache.data_version(df=df)
+        except FileNotFoundError:
+            print("No game data found.")
+            return None
+
+        report_key = RenderCache.key("report", data_version)
+        cached_report = RenderCache.get(report_key, "pdf")
+        if cached_report is not None:
+            if filepath is None:
+                filepath = Plateau.get_report_filepath()
+            shutil.copyfile(cached_report, filepath)
+            print(f"\nPDF report saved to: {filepath}")
+            return filepath
+
+        if full_history:
+            df = Plateau.load_data()
         if df is None:
             print("No game data found.")
-            return
+            return None
 
-        stats = Plateau.compute_all_stats(df)
-        filepath = Plateau.get_report_filepath()
+        stats = Plateau.compute_all_stats(df.copy())
+        if filepath is None:
+            filepath = Plateau.get_report_filepath()
 
         with PdfPages(filepath) as pdf:
             fig = plt.figure(constrained_layout=True, figsize=(16, 24))
@@ -500,29 +807,13 @@ class Plateau:
 
             fig.suptitle("Connect Four - Game Statistics Report", fontsize=16, fontweight='bold',y=0.97)
 
-            # Plot Overview
-            ax1 = fig.add_subplot(spec[1, 0])
-            Graphics.plot_overview(ax=ax1)
-
-            # Plot Trend and Dispersion
-            ax2 = fig.add_subplot(spec[1, 1])
-            Graphics.plot_trend_dispersion(ax=ax2)
-
-            # Plot Wins by First Player
-            ax3 = fig.add_subplot(spec[2, 0])
-            Graphics.plot_wins_by_first_player(ax=ax3)
-
-            # Plot Column Play Counts
-            ax4 = fig.add_subplot(spec[2, 1])
-            Graphics.plot_column_play_counts(ax=ax4)
-
-            # Plot Games per Month
-            ax5 = fig.add_subplot(spec[3, 0])
-            Graphics.plot_games_per_month(ax=ax5)
-
-            # Plot Shots Frequency per Game
-            ax6 = fig.add_subplot(spec[3, 1])
-            Graphics.plot_shots_frequency_per_game(ax=ax6)
+            # Overview, trend and dispersion, wins by first player, column play counts,
+            # games per month and shots frequency per game
+            cells = [spec[1, 0], spec[1, 1], spec[2, 0], spec[2, 1], spec[3, 0], spec[3, 1]]
+            for cell, (name, plot) in zip(cells, Plateau.REPORT_PANELS):
+                # The games per month are read from the monthly table when the report covers every game
+                monthly_table = name == "games_per_month" and full_history
+                plot(ax=fig.add_subplot(cell), df=None if monthly_table else df)
 
             ax7 = fig.add_subplot(spec[4, :])
             Plateau.add_summary_text(ax7, df, stats)
@@ -530,7 +821,11 @@ class Plateau:
             pdf.savefig(fig)
             plt.close(fig)
 
+        with open(filepath, 'rb') as report_file:
+            RenderCache.put(report_key, report_file.read(), "pdf")
+
         print(f"\nPDF report saved to: {filepath}")
+        return filepath
 
     @staticmethod
     def load_data():
@@ -540,7 +835,7 @@ class Plateau:
             pd.DataFrame: A DataFrame containing the game data.
         """
         try:
-            return pd.read_csv("../data/game_data.csv")
+            return Database.read_history()
         except FileNotFoundError:
             return None
 
@@ -569,6 +864,31 @@ class Plateau:
             "all_coords": all_coords
         }
 
+    @staticmethod
+    def statistics_summary(df):
+        """Computes the statistics of the terminal report as plain values
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the game data.
+
+        Returns:
+            dict: The total number of games, the wins and win percentages per winner,
+            the starter win rate, the average number of moves and the moves per column.
+        """
+        stats = Plateau.compute_all_stats(df.copy())
+        column_counts = {}
+        for _, col in stats["all_coords"]:
+            column_counts[int(col)] = column_counts.get(int(col), 0) + 1
+
+        return {
+            "total_games": len(df),
+            "win_counts": {winner: int(count) for winner, count in stats["win_counts"].items()},
+            "win_percentages": {winner: float(value) for winner, value in stats["win_percentages"].items()},
+            "starter_win_rate": float(stats["starter_win_rate"]) if len(df) else 0.0,
+            "avg_shots": float(stats["avg_shots"]) if len(df) else 0.0,
+            "column_counts": dict(sorted(column_counts.items())),
+        }
+
     @staticmethod
     def get_report_filepath():
         """Gets the file path for the PDF report
@@ -618,7 +938,7 @@ class Plateau:
         axes[0].set_ylabel("Games")
         axes[0].set_xlabel("Winner")
 
-        df.set_index("date").resample("D")["is_win"].mean().plot(ax=axes[1], color="#2196f3")
+        Plateau.daily_win_rate(df).plot(ax=axes[1], color="#2196f3")
         axes[1].set_title("Player Win Rate Over Time")
         axes[1].set_ylabel("Win Rate")
 
@@ -638,7 +958,7 @@ class Plateau:
             col_freq = coords_df["column"].value_counts().sort_index()
             col_freq.plot(kind="bar", color="#ff9800", ax=axes[4])
             axes[4].set_title("Most Played Columns")
-            axes[4].set_xlabel("Column (0 to 6)")
+            axes[4].set_xlabel("Column (from 0)")
             axes[4].set_ylabel("Total Moves")
             axes[4].set_xticks(range(len(col_freq)))
             axes[4].set_xticklabels([str(i) for i in col_freq.index], rotation=90)
@@ -681,7 +1001,8 @@ class Plateau:
             print("6. Data analysis")
             print("7. Generate PDF report")
             print("8. Delete filtered data")
-            print("9. Back to main menu")
+            print("9. Analyze games with the engine")
+            print("10. Back to main menu")
 
             choice = input("Your choice: ").strip()
 
@@ -717,13 +1038,21 @@ class Plateau:
             elif choice == '8':
                 Database.delete_filtered_data()
             elif choice == '9':
+                # Imported here because the analyzer builds Plateau instances itself
+                from .Analyzer import Analyzer
+                Analyzer.analysis_menu()
+            elif choice == '10':
                 break
             else:
                 print("Invalid choice. Please try again.")
 
     def welcome_menu(self):
         """Main welcome menu
+
+        The history index and the configuration start loading in the background while the
+        user picks an option, so that the first AI move does not have to load them.
         """
+        self.get_preloader().start()
         while True:
             self.welcome_menu_options()
             choice = input("Your choice:")
@@ -733,21 +1062,55 @@ class Plateau:
             elif choice == '2':
                 self.statistics_menu()
             elif choice == '3':
+                self.watch_game()
+            elif choice == '4':
+                if self.resume_suspended_game():
+                    self.start_game(resume=True)
+            elif choice == '5':
                 print("Goodbye and see you soon!")
                 exit()
             else:
                 print("Invalid choice. Please try again.")
 
-    def start_game(self):
+    def start_game(self, resume=False):
         """Starts the game by initializing the starting player and managing the game loop until the game ends
+
+        Args:
+            resume (bool): Whether the game has been restored from a snapshot and is continued
+                as it is, instead of asking for the variant and the starter of a new game.
         """
-        self._reset_game()
-        self.player_choice_who_starts()
+        if not resume:
+            self.player_choice_variant()
+            self.player_choice_who_starts()
+
+        spectator = self.get_spectator()
+        if spectator.start():
+            print("Spectators can follow the game from another terminal (menu option 3).")
+        spectator.new_game(self._variant)
+        for index, (row, col) in enumerate(self.get_shots()):
+            spectator.move(row, col, self.get_player_who_starts() * (-1) ** index)
 
         while not self.get_game_over():
             self.display_plateau()
             self.player_action()
+            if self.is_suspended():
+                self.get_ponder().stop()
+                spectator.stop()
+                print("Game suspended. Resume it from the main menu (option 4).")
+                return
+            row, col = self.get_shots()[-1]
+            spectator.move(row, col, self.get_current_player())
             self.switch_player()
             self.check_win()
 
+        spectator.end(self.get_winner())
+        self.get_ponder().stop()
+        spectator.stop()
         self.save_game()
+
+    @staticmethod
+    def watch_game():
+        """Follows the game being played in another terminal until it is over
+        """
+        if not SpectatorClient().watch():
+            print("No game is being played right now.")
@@ -8,28 +8,35 @@ class Player:
     def player_choice(plateau):
         """Asks the player to choose a column to place their token in, then adds the token to the game board
 
-        Prompts the player to enter a column number between 1 and 7. If the column is valid and not full,
-        the player's token is placed in the lowest available row of the chosen column.
+        Prompts the player to enter a column number between 1 and the number of columns of the board. If the column is valid and not full,
+        the player's token is placed in the lowest available row of the chosen column. Entering "s" suspends the game instead.
+        The AI ponders its answers in the background until the player's choice is made.
 
         Args:
             plateau (Plateau): The game board instance containing the positions of the moves played.
         """
+        columns = plateau.get_variant().columns
+
+        # Let the AI think about its answers while the player chooses
+        plateau.get_ponder().start(plateau)
+
         while True:
             try:
-                column = int(input("Choose a column (1-7): ")) - 1
+                answer = input(f"Choose a column (1-{columns}, s to suspend the game): ")
+                if answer.strip().lower() == "s":
+                    plateau.get_ponder().stop()
+                    plateau.suspend_game()
+                    return
+
+                column = int(answer) - 1
 
-                if column < 0 or column > 6:
-                    print("Error: Please enter a number between 1 and 7.")
-                elif plateau.get_plateau()[0][column] != 0:
+                if column < 0 or column >= columns:
+                    print(f"Error: Please enter a number between 1 and {columns}.")
+                elif plateau.is_column_full(column):
                     print("Error: This column is full. Choose another column.")
                 else:
-                    for row in range(5, -1, -1):
-                        if plateau.get_plateau()[row][column] == 0:
-                            plateau.get_plateau()[row][column] = 1
-                            shots = plateau.get_shots()
-                            shots.append((row, column))
-                            plateau.set_shots(shots)
-                            plateau.set_shots_played_player(plateau.get_shots_played_player() + 1)
-                            return
+                    plateau.get_ponder().stop()
+                    plateau.play(column)
+                    return
             except ValueError:
                 print("Error: Please enter a valid number.")
@@ -0,0 +1,101 @@
+import threading
+
+from .IA import IA
+
+
+class Ponder:
+    """Class letting the AI think on the human player's time
+
+    While the human player chooses a column, a background thread plays each possible
+    reply on a private board, from the center outwards, and evaluates the AI's moves in
+    the resulting position. The private board is created once and set to the position of
+    each turn from a copy of its GameState, so a turn only replays the new moves. The
+    evaluations are kept in a cache keyed by the position hash, so that when the human
+    player has moved, the AI finds its answer already computed. The thread is stopped, and
+    waited for, as soon as the human player's input arrives.
+    """
+    ENABLED = True
+    # Longest wait for the thread to finish the evaluation it was computing, in seconds
+    STOP_TIMEOUT = 1.0
+
+    def __init__(self):
+        """Initializes an idle ponderer with an empty cache
+        """
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._board = None
+
+    def start(self, plateau):
+        """Starts pondering on the replies of the human player in the current position
+
+        Args:
+            plateau (Plateau): The instance of the game board, only read, never modified.
+        """
+        if not Ponder.ENABLED:
+            return
+
+        self.stop()
+        with self._lock:
+            self._cache = {}
+        if self._board is None:
+            # Imported here, the board module importing this one
+            from .Plateau import Plateau
+            variant = plateau.get_variant()
+            self._board = Plateau(variant.rows, variant.columns, variant.connect)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._board, plateau.get_state().clone(), self._stop_event),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Stops the background thread and waits for it
+
+        The evaluation being computed when the thread is stopped is discarded. A thread
+        still busy after the timeout keeps its board, and the next turn ponders on a new one.
+
+        Args:
+            timeout (float): The longest wait for the thread, in seconds.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self._board = None
+            self._thread = None
+
+    def _run(self, board, state, stop_event):
+        """Evaluates the AI's moves after each reply of the human player
+
+        Args:
+            board (Plateau): The private game board of the ponderer.
+            state (GameState): The copy of the position of the game.
+            stop_event (threading.Event): The event set when pondering must stop.
+        """
+        board.set_position(state)
+        for col in board.get_variant().center_order:
+            if stop_event.is_set():
+                return
+            if board.is_column_full(col):
+                continue
+
+            board.play(col)
+            if board.get_evaluator().winner() == 0 and len(board.get_shots()) < board.get_variant().size:
+                evaluated_moves = IA.evaluate_moves(board, IA.generate_possible_moves(board), verbose=False)
+                with self._lock:
+                    if not stop_event.is_set():
+                        self._cache[board.get_hash()] = evaluated_moves
+            board.undo()
+
+    def lookup(self, plateau):
+        """Returns the AI's move evaluations computed for the current position, if any
+
+        Args:
+            plateau (Plateau): The instance of the game board.
+
+        Returns:
+            dict: The evaluated moves, None if the position has not been pondered.
+        """
+        with self._lock:
+            return self._cache.get(plateau.get_hash())
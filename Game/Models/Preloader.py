@@ -0,0 +1,65 @@
+import threading
+
+import pandas as pd
+
+from .Database import Database
+from .EvaluationCache import EvaluationCache
+from .History import History
+from .Utils import Utils
+from .Variant import Variant
+
+
+class Preloader:
+    """Class loading what the AI needs in a background thread while the menus wait for input
+
+    The configuration files (kept in memory by Utils), the tables of the variants, the
+    evaluation cache and the history index are loaded as soon as the welcome menu appears.
+    The shared instances are created under a lock, so the game gets the ones created here
+    even when it asks for them at the same time. The history index holds its lock while it
+    is being built, so an AI move asked before the end of the loading only waits for what
+    is left of it, then finds the index up to date.
+    """
+    def __init__(self):
+        """Initializes an idle preloader
+        """
+        self._thread = None
+
+    def start(self):
+        """Starts loading in the background, once per program
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def is_done(self):
+        """Checks whether the loading has finished
+        """
+        return self._thread is not None and not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Waits until the loading has finished
+
+        Args:
+            timeout (float): The longest wait in seconds, no limit when omitted.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @staticmethod
+    def _run():
+        """Loads the configuration, the variants, the evaluation cache and the history index
+        """
+        # Parsed once here, the AI moves then read the configurations from memory
+        Utils.load_points_config()
+        Utils.load_engine_config()
+        Utils.load_storage_config()
+        for rows, columns, connect, _ in Variant.PRESETS:
+            Variant.get(rows, columns, connect)
+        EvaluationCache.get(Variant.get())
+
+        try:
+            History.get().refresh(Database.DATA_FILE)
+        except (FileNotFoundError, pd.errors.EmptyDataError, ValueError, KeyError):
+            # The first AI move reports the problem when it reads the history itself
+            pass
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+
+class RenderCache:
+    """Class caching rendered reports on disk
+
+    Each entry is a rendered file (the vector PDF report), named after a hash of the data
+    version and of the rendering parameters. Since a new game changes the data version, a
+    report is only rendered again when its data or its parameters changed. Whole reports are
+    cached rather than their panels: every panel is drawn from all the games, so a new game
+    changes them all at once, and vector panels cannot be placed into the report page
+    without a PDF library. Reading an entry refreshes its modification time, and the least
+    recently used entries are removed once the cache holds more than MAX_ENTRIES files.
+    """
+    CACHE_DIR = '../data/render_cache'
+    MAX_ENTRIES = 128
+
+    @staticmethod
+    def data_version(data_file=None, df=None):
+        """Identifies the version of the data a chart is drawn from
+
+        Args:
+            data_file (str): The game data CSV file, identified by its path, size and modification time.
+            df (pd.DataFrame): The game data, identified by a hash of its content, when no file is given.
+
+        Returns:
+            str: The data version.
+
+        Raises:
+            FileNotFoundError: If the data file does not exist.
+        """
+        if data_file is not None:
+            stat = os.stat(data_file)
+            return f"{os.path.abspath(data_file)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+        hashed = pd.util.hash_pandas_object(df.astype(str), index=False).values
+        return f"{list(df.columns)}:{hashlib.sha256(hashed.tobytes()).hexdigest()}"
+
+    @staticmethod
+    def key(chart, data_version, **params):
+        """Computes the key of a rendered file
+
+        Args:
+            chart (str): The name of the chart or report.
+            data_version (str): The version of the data, see data_version.
+            **params: The parameters the rendering depends on (size, resolution, ...).
+
+        Returns:
+            str: The key of the entry.
+        """
+        description = json.dumps([chart, data_version, params], sort_keys=True, default=str)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    @staticmethod
+    def _path(key, file_format):
+        """Returns the path of an entry
+        """
+        return os.path.join(RenderCache.CACHE_DIR, f"{key}.{file_format}")
+
+    @staticmethod
+    def get(key, file_format="pdf"):
+        """Returns the path of a cached entry and marks it as recently used
+
+        Args:
+            key (str): The key of the entry.
+            file_format (str): The format of the rendered file.
+
+        Returns:
+            str: The path of the entry, None if it is not in the cache.
+        """
+        path = RenderCache._path(key, file_format)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    @staticmethod
+    def put(key, content, file_format="pdf"):
+        """Stores a rendered file and evicts the least recently used entries
+
+        Args:
+            key (str): The key of the entry.
+            content (bytes): The rendered file.
+            file_format (str): The format of the rendered file.
+
+        Returns:
+            str: The path of the entry.
+        """
+        os.makedirs(RenderCache.CACHE_DIR, exist_ok=True)
+        path = RenderCache._path(key, file_format)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as entry_file:
+            entry_file.write(content)
+        os.replace(temporary_path, path)
+        RenderCache._evict()
+        return path
+
+    @staticmethod
+    def _evict():
+        """Removes the least recently used entries beyond MAX_ENTRIES
+        """
+        entries = []
+        with os.scandir(RenderCache.CACHE_DIR) as scan:
+            for entry in scan:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except FileNotFoundError:
+                        continue
+
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - RenderCache.MAX_ENTRIES)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,161 @@
+import json
+import os
+
+import pandas as pd
+
+from .FileLock import FileLock
+from .Snapshot import Snapshot
+
+
+class Rollup:
+    """Class maintaining daily and monthly aggregates of the game history
+
+    For each day and each month, the tables count the games, the wins of each side, the
+    draws, the games won by the starter and the moves played. They are updated with every
+    batch of saved games, so trend charts read one row per day or month instead of going
+    through every game. The tables remember the size of the data file they describe; when
+    the file has been changed otherwise (e.g. records deleted), they are rebuilt from it.
+    """
+    ROLLUP_FILE = '../data/rollups.json'
+    FIELDS = ["games", "player_wins", "ia_wins", "draws", "starter_wins", "total_moves"]
+    # Length of the date prefix identifying a bucket ("YYYY-MM-DD" and "YYYY-MM")
+    PERIODS = {"daily": 10, "monthly": 7}
+
+    @staticmethod
+    def _read():
+        """Reads the stored tables
+
+        Returns:
+            dict: The tables and the size of the data file they describe, None if there are none.
+        """
+        try:
+            with open(Rollup.ROLLUP_FILE, 'r') as rollup_file:
+                return json.load(rollup_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write(rollups):
+        """Writes the tables atomically
+        """
+        temporary_path = Rollup.ROLLUP_FILE + ".tmp"
+        with open(temporary_path, 'w') as rollup_file:
+            json.dump(rollups, rollup_file)
+        os.replace(temporary_path, Rollup.ROLLUP_FILE)
+
+    @staticmethod
+    def _add_game(rollups, date, player_who_starts, winner, moves):
+        """Adds one game to the buckets of its day and month
+
+        Args:
+            rollups (dict): The tables to update.
+            date (str): The date of the game, as stored in the data file.
+            player_who_starts (int): -1 when the AI started and 1 when the player started.
+            winner (int): -1 when the AI won, 1 when the player won, 0 for a draw.
+            moves (int): The number of moves of the game.
+        """
+        values = [1, int(winner == 1), int(winner == -1), int(winner == 0), int(winner == player_who_starts), moves]
+        for period, length in Rollup.PERIODS.items():
+            bucket = rollups[period].setdefault(str(date)[:length], [0] * len(Rollup.FIELDS))
+            for index, value in enumerate(values):
+                bucket[index] += value
+
+    @staticmethod
+    def aggregate(df, period="daily"):
+        """Aggregates games into one row per day or month
+
+        Args:
+            df (pd.DataFrame): The game data.
+            period (str): "daily" or "monthly".
+
+        Returns:
+            pd.DataFrame: The FIELDS columns indexed by the first day of each bucket.
+        """
+        if df.empty:
+            return pd.DataFrame(columns=Rollup.FIELDS, index=pd.DatetimeIndex([]), dtype=int)
+
+        dates = pd.to_datetime(df["date"])
+        buckets = dates.dt.floor("D") if period == "daily" else dates.dt.to_period("M").dt.to_timestamp()
+        games = pd.DataFrame({
+            "games": 1,
+            "player_wins": (df["winner"] == 1).astype(int),
+            "ia_wins": (df["winner"] == -1).astype(int),
+            "draws": (df["winner"] == 0).astype(int),
+            "starter_wins": (df["winner"] == df["player_who_starts"]).astype(int),
+            "total_moves": df["shots_played_player"].astype(int) + df["shots_played_ia"].astype(int),
+        }, index=df.index)
+        table = games.groupby(buckets.values).sum()
+        table.index = pd.DatetimeIndex(table.index)
+        return table
+
+    @staticmethod
+    def rebuild(data_file):
+        """Rebuilds the tables from the whole data file
+
+        Args:
+            data_file (str): The game data CSV file.
+
+        Returns:
+            dict: The rebuilt tables.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        with FileLock(data_file):
+            size = os.path.getsize(data_file)
+            df = Snapshot.load_dataframe(data_file, with_shots=False)
+            rollups = {"source": os.path.abspath(data_file), "size": size}
+            for period, length in Rollup.PERIODS.items():
+                table = Rollup.aggregate(df, period)
+                keys = table.index.strftime("%Y-%m-%d")
+                rollups[period] = {key[:length]: [int(value) for value in values]
+                                   for key, values in zip(keys, table[Rollup.FIELDS].values.tolist())}
+            Rollup._write(rollups)
+        return rollups
+
+    @staticmethod
+    def record(data_file, rows, size_before, size_after):
+        """Adds games just appended to the data file, its lock being held
+
+        If the tables did not describe the file as it was before the append, they are left
+        as they are, to be rebuilt by the next reader.
+
+        Args:
+            data_file (str): The game data CSV file.
+            rows (list): The appended games, as [date, player_who_starts, winner,
+                shots_played_player, shots_played_ia, shots].
+            size_before (int): The size of the data file before the append.
+            size_after (int): The size of the data file after the append.
+        """
+        rollups = Rollup._read()
+        if rollups is None or rollups.get("size") != size_before or rollups.get("source") != os.path.abspath(data_file):
+            return
+
+        for date, player_who_starts, winner, shots_played_player, shots_played_ia, _ in rows:
+            Rollup._add_game(rollups, date, player_who_starts, winner, shots_played_player + shots_played_ia)
+        rollups["size"] = size_after
+        Rollup._write(rollups)
+
+    @staticmethod
+    def table(data_file, period="daily"):
+        """Returns an up to date table
+
+        Args:
+            data_file (str): The game data CSV file.
+            period (str): "daily" or "monthly".
+
+        Returns:
+            pd.DataFrame: The FIELDS columns indexed by the first day of each bucket.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        rollups = Rollup._read()
+        if (rollups is None or rollups.get("source") != os.path.abspath(data_file)
+                or rollups.get("size") != os.path.getsize(data_file)):
+            rollups = Rollup.rebuild(data_file)
+
+        buckets = rollups[period]
+        table = pd.DataFrame(list(buckets.values()), columns=Rollup.FIELDS,
+                             index=pd.DatetimeIndex(pd.to_datetime(list(buckets.keys()))), dtype=int)
+        return table.sort_index()
@@ -0,0 +1,187 @@
+class Search:
+    """Class searching the game tree with alpha-beta
+
+    The search explores the positions of a Plateau in place with play/undo, evaluates
+    the leaves with the window evaluator of the board and stores its results in a
+    transposition table keyed by the canonical position hash (a position and its mirror
+    share an entry) and the side to move. It deepens
+    iteratively and stops when its node budget is spent, keeping the deepest
+    completed iteration.
+    """
+    WIN_SCORE = 100000
+
+    # Transposition table entry flags
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    def __init__(self, plateau, max_depth=8, node_budget=20000, transposition_table=None):
+        """Initializes the search
+
+        Args:
+            plateau (Plateau): The board to search, restored to its position after each search.
+            max_depth (int): The maximum depth of the iterative deepening, in plies.
+            node_budget (int): The number of nodes after which the search stops, None for no limit.
+            transposition_table (dict): A table to share between searches, a new one when omitted.
+        """
+        self._plateau = plateau
+        self._max_depth = max_depth
+        self._node_budget = node_budget
+        self._transposition_table = {} if transposition_table is None else transposition_table
+        self._nodes = 0
+        self._stopped = False
+
+    def get_transposition_table(self):
+        """Getter for the transposition table
+        """
+        return self._transposition_table
+
+    def get_nodes(self):
+        """Getter for the number of nodes visited by the last search
+        """
+        return self._nodes
+
+    def _key(self):
+        """Returns the transposition table key of the current position
+
+        Returns:
+            tuple: The canonical position hash combined with the side to move, and True
+            if the columns stored under this key must be mirrored for the current position.
+        """
+        key, mirrored = self._plateau.get_canonical_hash()
+        if self._plateau.get_player_to_move() == -1:
+            key ^= self._plateau.get_variant().zobrist_side
+        return key, mirrored
+
+    def _static_score(self):
+        """Evaluates the current position for the player to move
+
+        Returns:
+            int: The threat score of the player to move minus the one of the opponent.
+        """
+        evaluator = self._plateau.get_evaluator()
+        player = self._plateau.get_player_to_move()
+        return evaluator.score(player) - evaluator.score(-player)
+
+    def _ordered_columns(self, first=None):
+        """Returns the playable columns, the given one first, then from the center outwards
+
+        Args:
+            first (int): A column to try first, typically the best move of a previous search.
+
+        Returns:
+            list: The playable columns in search order.
+        """
+        plateau = self._plateau
+        columns = [col for col in plateau.get_variant().center_order if not plateau.is_column_full(col)]
+        if first is not None and first in columns:
+            columns.remove(first)
+            columns.insert(0, first)
+        return columns
+
+    def _negamax(self, depth, alpha, beta, ply):
+        """Searches the current position with alpha-beta in negamax form
+
+        Args:
+            depth (int): The remaining depth, in plies.
+            alpha (int): The lower bound of the search window.
+            beta (int): The upper bound of the search window.
+            ply (int): The distance to the root, used to prefer quicker wins.
+
+        Returns:
+            int: The score of the position for the player to move.
+        """
+        plateau = self._plateau
+        evaluator = plateau.get_evaluator()
+        self._nodes += 1
+
+        # The previous move connected: the player to move has lost
+        if evaluator.winner() != 0:
+            return -self.WIN_SCORE + ply
+        if len(plateau.get_shots()) == plateau.get_variant().size:
+            return 0
+        if depth == 0:
+            return self._static_score()
+        if self._node_budget is not None and self._nodes >= self._node_budget:
+            self._stopped = True
+            return self._static_score()
+
+        key, mirrored = self._key()
+        variant = plateau.get_variant()
+        entry = self._transposition_table.get(key)
+        best_column = None
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, best_column = entry
+            if mirrored and best_column is not None:
+                best_column = variant.mirror_column(best_column)
+            if entry_depth >= depth:
+                if entry_flag == self.EXACT:
+                    return entry_score
+                if entry_flag == self.LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_flag == self.UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        original_alpha = alpha
+        best_score = -self.WIN_SCORE - 1
+        for col in self._ordered_columns(best_column):
+            plateau.play(col)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            plateau.undo()
+
+            if score > best_score:
+                best_score = score
+                best_column = col
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if not self._stopped:
+            if best_score <= original_alpha:
+                flag = self.UPPER_BOUND
+            elif best_score >= beta:
+                flag = self.LOWER_BOUND
+            else:
+                flag = self.EXACT
+            if mirrored:
+                best_column = variant.mirror_column(best_column)
+            self._transposition_table[key] = (depth, best_score, flag, best_column)
+
+        return best_score
+
+    def search(self):
+        """Searches the current position with iterative deepening
+
+        Returns:
+            tuple: The best column, its score for the player to move, and a dictionary
+            giving the score of every playable column at the deepest completed depth.
+            The best column is None when the game is already over.
+        """
+        self._nodes = 0
+        self._stopped = False
+        best_column, best_score, column_scores = None, 0, {}
+
+        if self._plateau.get_evaluator().winner() != 0 or not self._ordered_columns():
+            return best_column, best_score, column_scores
+
+        for depth in range(1, self._max_depth + 1):
+            scores = {}
+            for col in self._ordered_columns(best_column):
+                self._plateau.play(col)
+                scores[col] = -self._negamax(depth - 1, -self.WIN_SCORE - 1, self.WIN_SCORE + 1, 1)
+                self._plateau.undo()
+                if self._stopped:
+                    break
+
+            if self._stopped and column_scores:
+                break
+
+            column_scores = scores
+            best_column = max(scores, key=scores.get)
+            best_score = scores[best_column]
+
+            # A forced result has been found, searching deeper will not change it
+            if abs(best_score) >= self.WIN_SCORE - self._plateau.get_variant().size or self._stopped:
+                break
+
+        return best_column, best_score, column_scores
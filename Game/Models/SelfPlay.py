@@ -0,0 +1,162 @@
+import random
+
+from .GameState import GameState
+from .IA import IA
+from .MCTS import MCTS
+from .Plateau import Plateau
+from .ThreatSearch import ThreatSearch
+from .Utils import Utils
+from .Variant import Variant
+
+
+class SelfPlay:
+    """Class playing games between two AI engine configurations, without any output
+
+    An engine configuration is a dictionary like Config/engine_config.json: "engine" selects
+    "heuristic" or "mcts", the mcts_* keys set the Monte Carlo search and "points" holds the
+    weights of the heuristic evaluation (Config/points_config.json when omitted). The
+    heuristic engine is deterministic, so games start from an opening of the opening book:
+    every position reached after OPENING_PLIES moves, once per position whatever the move
+    order or the side of the board, in which neither player has already won by force.
+    Matches draw their openings from the book without replacement, so no two pairs of
+    games start from the same position. Moves are chosen as in a real game (IA.ia_choice):
+    the threat search plays forced wins and leaves out the moves losing by force, then the
+    engine chooses among the others, without the evaluation cache nor the game history.
+    """
+    OPENING_PLIES = 6
+
+    # Opening books already built, by variant and number of plies
+    _books = {}
+
+    @staticmethod
+    def opening_book(plies=OPENING_PLIES, variant=None):
+        """Returns every balanced opening of a number of plies, building the book on first use
+
+        Openings reaching the same position, by transposition or as its mirror, are kept
+        once. An opening is balanced when no player can win at once and the threat search
+        finds no forced win for the player to move.
+
+        Args:
+            plies (int): The number of moves of the openings.
+            variant (Variant): The variant of the games, the classic one when omitted.
+
+        Returns:
+            list: The openings, as lists of columns, always in the same order.
+        """
+        variant = variant or Variant.get()
+        key = (variant.rows, variant.columns, variant.connect, plies)
+        if key not in SelfPlay._books:
+            positions = [GameState(variant)]
+            for _ in range(plies):
+                reached = {}
+                for state in positions:
+                    for col in range(variant.columns):
+                        if state.is_column_full(col):
+                            continue
+                        child = state.clone()
+                        child.play(col)
+                        if child.winner() == 0:
+                            reached.setdefault(child.canonical_hash()[0], child)
+                positions = list(reached.values())
+
+            SelfPlay._books[key] = [list(state.moves) for state in positions
+                                    if not state.winning_moves(1) and not state.winning_moves(-1)
+                                    and ThreatSearch(state).forced_win() is None]
+        return SelfPlay._books[key]
+
+    @staticmethod
+    def draw_openings(count, seed, plies=OPENING_PLIES):
+        """Draws distinct openings from the opening book
+
+        Args:
+            count (int): The number of openings wanted.
+            seed (int): The seed of the draw.
+            plies (int): The number of moves of the openings.
+
+        Returns:
+            list: The openings, fewer than count when the book is smaller.
+        """
+        book = SelfPlay.opening_book(plies)
+        return random.Random(seed).sample(book, min(count, len(book)))
+
+    @staticmethod
+    def choose_column(plateau, engine_config, rng):
+        """Chooses the move of the player to move
+
+        A forced win found by the threat search is played at once, and the moves after which
+        the opponent has one are left out, unless all moves lose.
+
+        Args:
+            plateau (Plateau): The instance of the game board.
+            engine_config (dict): The engine configuration of the player to move.
+            rng (random.Random): The random generator used to break ties.
+
+        Returns:
+            int: The column to play.
+        """
+        col, losing_moves = IA.threat_solution(plateau, use_cache=False)
+        if col is not None:
+            return col
+
+        if engine_config.get("engine") == "mcts":
+            col = MCTS(plateau,
+                       time_budget=engine_config.get("mcts_time_budget", 1.0),
+                       batch_size=engine_config.get("mcts_batch_size", 64),
+                       exploration=engine_config.get("mcts_exploration", 1.41),
+                       seed=rng.randrange(2 ** 32)).search(excluded=losing_moves)
+            if col is not None:
+                return col
+            # No time left for the tree search, the heuristic move is played
+
+        evaluated_moves = IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False,
+                                            points_config=engine_config.get("points") or Utils.load_points_config(),
+                                            ia=plateau.get_player_to_move(), use_history=False,
+                                            use_cache=False)
+        candidates = {move: score for move, score in evaluated_moves.items()
+                      if move[1] not in losing_moves} or evaluated_moves
+        best_score = max(candidates.values())
+        return rng.choice([col for (_, col), score in candidates.items() if score == best_score])
+
+    @staticmethod
+    def play_game(first_config, second_config, seed, opening=()):
+        """Plays a game between two engine configurations
+
+        Args:
+            first_config (dict): The engine configuration of the player who starts.
+            second_config (dict): The engine configuration of the other player.
+            seed (int): The seed of the tie breaks.
+            opening (list): The columns played before the engines take over.
+
+        Returns:
+            int: 1 if the first configuration won, -1 if the second one won, 0 for a draw.
+        """
+        rng = random.Random(seed)
+        plateau = Plateau()
+        plateau.set_player_who_starts(1)
+        evaluator = plateau.get_evaluator()
+        size = plateau.get_variant().size
+        configs = {1: first_config, -1: second_config}
+
+        for col in opening:
+            plateau.play(col)
+        while evaluator.winner() == 0 and len(plateau.get_shots()) < size:
+            plateau.play(SelfPlay.choose_column(plateau, configs[plateau.get_player_to_move()], rng))
+
+        return evaluator.winner()
+
+    @staticmethod
+    def play_pair(config_a, config_b, seed, opening=()):
+        """Plays the same opening twice, each configuration starting once
+
+        Args:
+            config_a (dict): The first engine configuration.
+            config_b (dict): The second engine configuration.
+            seed (int): The seed of the two games.
+            opening (list): The columns played before the engines take over.
+
+        Returns:
+            tuple: The wins, draws and losses of config_a over the two games.
+        """
+        results = [SelfPlay.play_game(config_a, config_b, seed, opening),
+                   -SelfPlay.play_game(config_b, config_a, seed, opening)]
+        return results.count(1), results.count(0), results.count(-1)
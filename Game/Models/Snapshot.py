@@ -0,0 +1,325 @@
+import io
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .FileLock import FileLock
+from .GameCode import GameCode
+
+
+class Snapshot:
+    """Class managing a columnar, memory-mapped snapshot of the game history
+
+    The CSV file stays the primary store. The snapshot keeps each column in its own raw
+    binary file with a compact dtype (int8 sides, datetime64 dates, uint8 moves), plus a
+    metadata file giving the number of games and how far the CSV has been read. Since games
+    are only appended to the CSV, refreshing the snapshot parses the new lines only; a CSV
+    rewritten in place (e.g. after a deletion) triggers a full rebuild. The column files are
+    opened with np.memmap, so processes reading the snapshot share the same pages.
+    """
+    SNAPSHOT_DIR = '../data/snapshot'
+    META_FILE = 'meta.json'
+
+    # Columns of one row per game and their dtypes
+    GAME_COLUMNS = {
+        "id": np.int32,
+        "date": "datetime64[s]",
+        "player_who_starts": np.int8,
+        "winner": np.int8,
+        "shots_played_player": np.uint8,
+        "shots_played_ia": np.uint8,
+        "move_offsets": np.int64,
+    }
+    # Columns of one row per move: row and column of each shot
+    MOVE_COLUMNS = {
+        "move_rows": np.uint8,
+        "move_columns": np.uint8,
+    }
+
+    _SHOT_PATTERN = re.compile(r"\((\d+),\s*(\d+)\)")
+
+    @staticmethod
+    def _path(name):
+        """Returns the path of a file of the snapshot
+        """
+        return os.path.join(Snapshot.SNAPSHOT_DIR, name)
+
+    @staticmethod
+    def _read_meta():
+        """Reads the metadata of the snapshot
+
+        Returns:
+            dict: The metadata, None if there is no valid snapshot.
+        """
+        try:
+            with open(Snapshot._path(Snapshot.META_FILE), 'r') as meta_file:
+                return json.load(meta_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write_meta(meta):
+        """Writes the metadata of the snapshot atomically, once the column files are complete
+        """
+        temporary_path = Snapshot._path(Snapshot.META_FILE + ".tmp")
+        with open(temporary_path, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(temporary_path, Snapshot._path(Snapshot.META_FILE))
+
+    @staticmethod
+    def _parse_rows(df):
+        """Converts CSV rows to snapshot columns
+
+        Args:
+            df (pd.DataFrame): Rows of the game data CSV file.
+
+        Returns:
+            dict: The arrays of every column, move_offsets holding the length of each game.
+        """
+        move_rows, move_columns, lengths = [], [], []
+        for shots in df["shots"].astype(str):
+            pairs = Snapshot._SHOT_PATTERN.findall(shots)
+            lengths.append(len(pairs))
+            for row, col in pairs:
+                move_rows.append(int(row))
+                move_columns.append(int(col))
+
+        return {
+            "id": df["id"].to_numpy(dtype=np.int32),
+            "date": pd.to_datetime(df["date"]).to_numpy().astype("datetime64[s]"),
+            "player_who_starts": df["player_who_starts"].to_numpy(dtype=np.int8),
+            "winner": df["winner"].to_numpy(dtype=np.int8),
+            "shots_played_player": df["shots_played_player"].to_numpy(dtype=np.uint8),
+            "shots_played_ia": df["shots_played_ia"].to_numpy(dtype=np.uint8),
+            "move_offsets": np.array(lengths, dtype=np.int64),
+            "move_rows": np.array(move_rows, dtype=np.uint8),
+            "move_columns": np.array(move_columns, dtype=np.uint8),
+        }
+
+    @staticmethod
+    def _append_columns(columns, meta, rebuild):
+        """Appends parsed columns to the column files
+
+        Args:
+            columns (dict): The arrays returned by _parse_rows.
+            meta (dict): The current metadata, updated with the new lengths.
+            rebuild (bool): Whether the column files are written from scratch, to new files
+                replacing the old ones.
+        """
+        # Game lengths become offsets into the move columns
+        columns["move_offsets"] = meta["moves"] + np.cumsum(columns["move_offsets"], dtype=np.int64)
+
+        # Games are appended in chronological order, which lets date ranges be found by binary search
+        dates = columns["date"]
+        dates_sorted = bool(np.all(dates[1:] >= dates[:-1]))
+        if not rebuild and meta["games"]:
+            stored_dates = np.memmap(Snapshot._path("date.bin"), dtype="datetime64[s]", mode='r',
+                                     shape=(meta["games"],))
+            if "dates_sorted" not in meta:
+                meta["dates_sorted"] = bool(np.all(stored_dates[1:] >= stored_dates[:-1]))
+            dates_sorted = dates_sorted and meta["dates_sorted"] and bool(len(dates) == 0 or dates[0] >= stored_dates[-1])
+            del stored_dates
+        meta["dates_sorted"] = dates_sorted
+
+        for name, dtype in {**Snapshot.GAME_COLUMNS, **Snapshot.MOVE_COLUMNS}.items():
+            path = Snapshot._path(name + ".bin")
+            data = np.ascontiguousarray(columns[name], dtype=dtype).tobytes()
+            if rebuild:
+                # Rebuilt columns replace the files by a rename: processes mapping the old files
+                # keep reading them until they see the new generation in the metadata
+                temporary_path = path + ".tmp"
+                with open(temporary_path, 'wb') as column_file:
+                    column_file.write(data)
+                os.replace(temporary_path, path)
+                continue
+
+            # Drop what an interrupted refresh may have written after the recorded length
+            length = meta["games"] if name in Snapshot.GAME_COLUMNS else meta["moves"]
+            os.truncate(path, length * np.dtype(dtype).itemsize)
+            with open(path, 'ab') as column_file:
+                column_file.write(data)
+
+        meta["games"] += len(columns["id"])
+        meta["moves"] += len(columns["move_rows"])
+
+    @staticmethod
+    def refresh(data_file):
+        """Brings the snapshot up to date with the CSV file
+
+        Only the lines appended since the last refresh are parsed, unless the CSV file has been
+        rewritten, in which case the snapshot is rebuilt.
+
+        Args:
+            data_file (str): The game data CSV file.
+
+        Returns:
+            dict: The metadata of the up to date snapshot.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        os.makedirs(Snapshot.SNAPSHOT_DIR, exist_ok=True)
+        # Processes sharing the snapshot refresh it one at a time
+        with FileLock(Snapshot._path(Snapshot.META_FILE)):
+            return Snapshot._refresh(data_file)
+
+    @staticmethod
+    def _refresh(data_file):
+        """Brings the snapshot up to date with the CSV file, the snapshot lock being held
+
+        Returns:
+            dict: The metadata of the up to date snapshot.
+        """
+        meta = Snapshot._read_meta()
+
+        with open(data_file, 'rb') as csv_file:
+            header = csv_file.readline()
+            size = os.fstat(csv_file.fileno()).st_size
+
+            rebuild = (meta is None or meta["header"] != header.decode()
+                       or meta["source"] != os.path.abspath(data_file) or size < meta["offset"])
+            if not rebuild:
+                # The last line read must still be in place, otherwise the file has been rewritten
+                last_line = meta["last_line"].encode()
+                csv_file.seek(meta["offset"] - len(last_line))
+                rebuild = csv_file.read(len(last_line)) != last_line
+            if rebuild:
+                # The generation tells readers keeping derived data that earlier games may have changed;
+                # it is written with the metadata, once the new column files are in place
+                generation = meta.get("generation", 0) + 1 if meta else 1
+                meta = {"source": os.path.abspath(data_file), "header": header.decode(), "generation": generation,
+                        "offset": len(header), "last_line": header.decode(), "games": 0, "moves": 0}
+            elif size == meta["offset"]:
+                return meta
+
+            csv_file.seek(meta["offset"])
+            tail = csv_file.read()
+
+        # Only complete lines are read, a line being written is picked up by the next refresh
+        complete = tail[:tail.rfind(b"\n") + 1]
+        if complete.strip() or rebuild:
+            df = pd.read_csv(io.BytesIO(header + complete))
+            Snapshot._append_columns(Snapshot._parse_rows(df), meta, rebuild)
+
+        if complete:
+            meta["offset"] += len(complete)
+            meta["last_line"] = complete[complete.rstrip(b"\n").rfind(b"\n") + 1:].decode()
+        Snapshot._write_meta(meta)
+        return meta
+
+    @staticmethod
+    def open():
+        """Opens the columns of the snapshot by memory mapping
+
+        Returns:
+            dict: A read-only array per column, None if there is no snapshot.
+        """
+        meta = Snapshot._read_meta()
+        if meta is None:
+            return None
+
+        lengths = {name: meta["games"] for name in Snapshot.GAME_COLUMNS}
+        lengths.update({name: meta["moves"] for name in Snapshot.MOVE_COLUMNS})
+
+        arrays = {}
+        for name, dtype in {**Snapshot.GAME_COLUMNS, **Snapshot.MOVE_COLUMNS}.items():
+            if lengths[name] == 0:
+                arrays[name] = np.empty(0, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(Snapshot._path(name + ".bin"), dtype=dtype, mode='r', shape=(lengths[name],))
+        return arrays
+
+    @staticmethod
+    def game_codes(arrays, columns=7):
+        """Packs every game of the snapshot straight from its move columns
+
+        Args:
+            arrays (dict): The columns returned by open.
+            columns (int): Number of columns of the board the games were played on.
+
+        Returns:
+            list: The GameCode of each game, in order.
+        """
+        offsets = [0] + arrays["move_offsets"].tolist()
+        move_columns = arrays["move_columns"].tolist()
+        return [GameCode.from_columns(move_columns[start:end], columns)
+                for start, end in zip(offsets[:-1], offsets[1:])]
+
+    @staticmethod
+    def date_selection(arrays, meta, date_start=None, date_end=None):
+        """Finds the games played in a date range
+
+        When the games are in chronological order, the bounds are found by binary search
+        in the date column, so only the games of the range are read afterwards.
+
+        Args:
+            arrays (dict): The columns returned by open.
+            meta (dict): The metadata of the snapshot.
+            date_start (pd.Timestamp): The first date kept, None for no bound.
+            date_end (pd.Timestamp): The last date kept, None for no bound.
+
+        Returns:
+            slice | np.array: The positions of the games in the range.
+        """
+        dates = arrays["date"]
+        start = np.datetime64(date_start, "s") if date_start is not None else None
+        end = np.datetime64(date_end, "s") if date_end is not None else None
+
+        if meta.get("dates_sorted", False):
+            first = int(np.searchsorted(dates, start, side="left")) if start is not None else 0
+            last = int(np.searchsorted(dates, end, side="right")) if end is not None else len(dates)
+            return slice(first, max(first, last))
+
+        mask = np.ones(len(dates), dtype=bool)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates <= end
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def load_dataframe(data_file, with_shots=True, with_codes=False, date_start=None, date_end=None):
+        """Refreshes the snapshot and returns the game history as a DataFrame
+
+        Args:
+            data_file (str): The game data CSV file.
+            with_shots (bool): Whether to rebuild the shots column in its CSV text form.
+            with_codes (bool): Whether to add a code column holding the GameCode of each game.
+            date_start (pd.Timestamp): Keep games played from this date, None for no bound.
+            date_end (pd.Timestamp): Keep games played until this date included, None for no bound.
+
+        Returns:
+            pd.DataFrame: The games with compact dtypes, the same columns as the CSV file.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        meta = Snapshot.refresh(data_file)
+        arrays = Snapshot.open()
+        selection = Snapshot.date_selection(arrays, meta, date_start, date_end)
+
+        df = pd.DataFrame({name: np.asarray(arrays[name][selection])
+                           for name in Snapshot.GAME_COLUMNS if name != "move_offsets"})
+        if with_shots or with_codes:
+            ends = np.asarray(arrays["move_offsets"][selection])
+            if isinstance(selection, slice):
+                previous = int(arrays["move_offsets"][selection.start - 1]) if selection.start else 0
+                starts = np.concatenate(([previous], ends[:-1])).astype(np.int64)
+            else:
+                starts = np.concatenate(([0], arrays["move_offsets"]))[:-1][selection]
+            # Only the moves of the selected games are read
+            first = int(starts.min()) if len(starts) else 0
+            last = int(ends.max()) if len(ends) else 0
+            rows = arrays["move_rows"][first:last].tolist()
+            columns = arrays["move_columns"][first:last].tolist()
+            bounds = list(zip((starts - first).tolist(), (ends - first).tolist()))
+
+            if with_shots:
+                df["shots"] = [str(list(zip(rows[start:end], columns[start:end]))) for start, end in bounds]
+            if with_codes:
+                df["code"] = pd.Series([GameCode.from_columns(columns[start:end]) for start, end in bounds],
+                                       dtype=object)
+        return df
@@ -0,0 +1,293 @@
+import queue
+import socket
+import sys
+import threading
+import time
+
+
+class SpectatorServer:
+    """Class streaming a live game to spectators over a local socket
+
+    Instead of full boards, the server sends one short text line per event:
+    "N rows columns" when a game starts, "M row col player" for each move and
+    "E winner" when the game ends. A spectator joining during a game first receives
+    the events of the game so far, then follows the live events.
+
+    The game thread never writes to a socket: every spectator has a queue of events and
+    a sender thread of its own, so a slow spectator only delays itself. A spectator whose
+    queue is full, or who does not read an event within SEND_TIMEOUT seconds, is dropped.
+    The server runs for one game and is stopped at its end, once the last events are sent.
+    """
+    HOST = "127.0.0.1"
+    PORT = 5050
+    # Events waiting for a spectator before it is dropped
+    MAX_PENDING = 64
+    SEND_TIMEOUT = 1.0
+
+    def __init__(self, host=HOST, port=PORT):
+        """Initializes a stopped server
+
+        Args:
+            host (str): The local address to listen on.
+            port (int): The port to listen on.
+        """
+        self._host = host
+        self._port = port
+        self._socket = None
+        # Event queue and sender thread of every spectator
+        self._clients = {}
+        self._events = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts listening for spectators in a background thread
+
+        Returns:
+            bool: True if the server is listening, False if the port is not available.
+        """
+        if self._socket is not None:
+            return True
+
+        try:
+            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server_socket.bind((self._host, self._port))
+            server_socket.listen()
+        except OSError:
+            return False
+
+        self._socket = server_socket
+        threading.Thread(target=self._accept, args=(server_socket,), daemon=True).start()
+        return True
+
+    def stop(self, timeout=SEND_TIMEOUT):
+        """Stops the server, sends the events still queued and disconnects the spectators
+
+        Args:
+            timeout (float): The longest wait for the spectators to receive their events, in seconds.
+        """
+        with self._lock:
+            server_socket, self._socket = self._socket, None
+            clients, self._clients = self._clients, {}
+            for client, (events, _) in clients.items():
+                try:
+                    events.put_nowait(None)
+                except queue.Full:
+                    SpectatorServer._disconnect(client)
+        if server_socket is not None:
+            SpectatorServer._disconnect(server_socket)
+
+        deadline = time.monotonic() + timeout
+        for client, (_, sender) in clients.items():
+            sender.join(max(0.0, deadline - time.monotonic()))
+            SpectatorServer._disconnect(client)
+
+    @staticmethod
+    def _disconnect(connection):
+        """Shuts a socket down, which wakes up a thread blocked on it, and closes it
+        """
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        connection.close()
+
+    def _accept(self, server_socket):
+        """Accepts spectators and sends them the events of the current game
+
+        Args:
+            server_socket (socket.socket): The listening socket, shut down by stop.
+        """
+        while True:
+            try:
+                client, _ = server_socket.accept()
+            except OSError:
+                return
+
+            client.settimeout(self.SEND_TIMEOUT)
+            events = queue.Queue(self.MAX_PENDING)
+            sender = threading.Thread(target=self._send, args=(client, events), daemon=True)
+            with self._lock:
+                if self._socket is not server_socket:
+                    client.close()
+                    return
+                events.put_nowait(b"".join(self._events))
+                self._clients[client] = (events, sender)
+            sender.start()
+
+    def _send(self, client, events):
+        """Sends the queued events to a spectator until the server stops or drops it
+
+        Args:
+            client (socket.socket): The connection of the spectator.
+            events (queue.Queue): The events of the spectator, None when the server stops.
+        """
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            try:
+                client.sendall(event)
+            except OSError:
+                self._drop(client)
+                return
+
+    def _drop(self, client):
+        """Disconnects a spectator who cannot keep up
+        """
+        with self._lock:
+            self._clients.pop(client, None)
+        SpectatorServer._disconnect(client)
+
+    def _broadcast(self, line):
+        """Queues an event for every spectator, dropping those whose queue is full
+
+        Args:
+            line (str): The event, without its line ending.
+        """
+        event = (line + "\n").encode()
+        with self._lock:
+            self._events.append(event)
+            for client, (events, _) in list(self._clients.items()):
+                try:
+                    events.put_nowait(event)
+                except queue.Full:
+                    del self._clients[client]
+                    SpectatorServer._disconnect(client)
+
+    def new_game(self, variant):
+        """Announces a new game
+
+        Args:
+            variant (Variant): The variant of the game.
+        """
+        with self._lock:
+            self._events = []
+        self._broadcast(f"N {variant.rows} {variant.columns}")
+
+    def move(self, row, col, player):
+        """Announces a move
+
+        Args:
+            row (int): The row of the token.
+            col (int): The column of the token.
+            player (int): The owner of the token (1 for human, -1 for AI).
+        """
+        self._broadcast(f"M {row} {col} {player}")
+
+    def end(self, winner):
+        """Announces the end of the game
+
+        Args:
+            winner (int): 1 if the human player won, -1 if the AI won, 0 for a draw.
+        """
+        self._broadcast(f"E {winner}")
+
+
+class SpectatorClient:
+    """Class following a live game and rendering it in the terminal
+
+    The board is drawn once when the game starts. Each move then redraws only the cell
+    that changed, by moving the cursor to it, in a single buffered write.
+    """
+    PLAYER_TOKEN = "\033[93m●\033[0m"
+    IA_TOKEN = "\033[91m●\033[0m"
+    EMPTY_TOKEN = "\033[97m○\033[0m"
+
+    def __init__(self, output=None):
+        """Initializes the renderer
+
+        Args:
+            output (io.TextIOBase): The terminal to draw on, sys.stdout when omitted.
+        """
+        self._output = output or sys.stdout
+        self._rows = 0
+        self._columns = 0
+
+    def _write(self, text):
+        """Writes a frame in a single call and flushes it
+        """
+        self._output.write(text)
+        self._output.flush()
+
+    def _below_board(self):
+        """Returns the escape sequence moving the cursor under the board
+        """
+        return f"\033[{self._rows + 4};1H"
+
+    def draw_board(self, rows, columns):
+        """Clears the terminal and draws an empty board
+
+        Args:
+            rows (int): Number of rows of the board.
+            columns (int): Number of columns of the board.
+        """
+        self._rows, self._columns = rows, columns
+        border = " " + "-" * (2 * columns + 1)
+        lines = ["  " + " ".join(str((col + 1) % 10) for col in range(columns)), border]
+        lines += ["| " + " ".join([self.EMPTY_TOKEN] * columns) + " |" for _ in range(rows)]
+        lines.append(border)
+        self._write("\033[2J\033[H" + "\n".join(lines) + "\n")
+
+    def draw_move(self, row, col, player):
+        """Redraws the cell of a move
+
+        Args:
+            row (int): The row of the token.
+            col (int): The column of the token.
+            player (int): The owner of the token (1 for human, -1 for AI).
+        """
+        token = self.PLAYER_TOKEN if player == 1 else self.IA_TOKEN
+        # The first cell is on the third line and the third character of the screen
+        self._write(f"\033[{row + 3};{2 * col + 3}H{token}{self._below_board()}")
+
+    def draw_end(self, winner):
+        """Writes the result of the game under the board
+
+        Args:
+            winner (int): 1 if the human player won, -1 if the AI won, 0 for a draw.
+        """
+        result = {1: "Player wins!", -1: "IA wins!"}.get(winner, "The game is a draw!")
+        self._write(f"{self._below_board()}{result}\n")
+
+    def handle_event(self, line):
+        """Renders one event received from the server
+
+        Args:
+            line (str): The event line.
+
+        Returns:
+            bool: True if the event ends the game.
+        """
+        parts = line.split()
+        if not parts:
+            return False
+        if parts[0] == "N":
+            self.draw_board(int(parts[1]), int(parts[2]))
+        elif parts[0] == "M":
+            self.draw_move(int(parts[1]), int(parts[2]), int(parts[3]))
+        elif parts[0] == "E":
+            self.draw_end(int(parts[1]))
+            return True
+        return False
+
+    def watch(self, host=SpectatorServer.HOST, port=SpectatorServer.PORT):
+        """Follows the live game until it ends or the server stops
+
+        Args:
+            host (str): The address of the server.
+            port (int): The port of the server.
+
+        Returns:
+            bool: False if no game is being streamed.
+        """
+        try:
+            connection = socket.create_connection((host, port))
+        except OSError:
+            return False
+
+        with connection, connection.makefile("r") as events:
+            for line in events:
+                if self.handle_event(line):
+                    break
+        return True
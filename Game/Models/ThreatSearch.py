@@ -0,0 +1,101 @@
+class ThreatSearch:
+    """Class looking for forced wins through sequences of threats
+
+    Only forcing moves are searched: the attacker plays moves creating a threat (a cell
+    where it would win on its next move), and the defender's reply is forced, since it has
+    to play on that cell. A move creating two threats at once wins, as does a forced reply
+    giving the attacker the cell just above it. The defender may break the sequence with a
+    win of its own, and when it threatens to win, the attacker must block first. With at
+    most one reply per attacking move, sequences many plies deep cost a few hundred nodes,
+    instead of the millions of a full-width search. The search runs on a copy of the
+    position (GameState), with bitboard checks.
+    """
+    def __init__(self, state, max_depth=24, node_budget=5000):
+        """Initializes the search
+
+        Args:
+            state (GameState): The position to search, copied.
+            max_depth (int): The largest number of plies of a forced sequence.
+            node_budget (int): The number of positions after which a search gives up.
+        """
+        self._state = state.clone()
+        self._max_depth = max_depth
+        self._node_budget = node_budget
+        self._nodes = 0
+
+    def get_nodes(self):
+        """Getter for the number of positions visited by the last search
+        """
+        return self._nodes
+
+    def _attacks(self, attacker, depth):
+        """Returns the first move of a forced win of the attacker, who is to move
+
+        Args:
+            attacker (int): The player to move (1 for human, -1 for AI).
+            depth (int): The number of plies left.
+
+        Returns:
+            int: The column of the first move of a forced win, None if none was found.
+        """
+        state = self._state
+        wins = state.winning_moves(attacker)
+        if wins:
+            return wins[0]
+        if depth <= 0 or self._nodes >= self._node_budget:
+            return None
+
+        defender = -attacker
+        blocks = state.winning_moves(defender)
+        if len(blocks) > 1:
+            return None
+        # A threat of the defender must be blocked, whatever the attacker planned
+        columns = blocks or [col for col in state.variant.center_order if not state.is_column_full(col)]
+
+        for col in columns:
+            self._nodes += 1
+            state.play(col)
+            threats = state.winning_moves(attacker)
+            # Not forcing, or the defender wins at once (on the cell above, for instance)
+            if not threats or state.winning_moves(defender):
+                state.undo()
+                continue
+            if len(threats) > 1:
+                state.undo()
+                return col
+
+            state.play(threats[0])
+            found = self._attacks(attacker, depth - 2) is not None
+            state.undo()
+            state.undo()
+            if found:
+                return col
+        return None
+
+    def forced_win(self):
+        """Looks for a forced win of the player to move
+
+        Returns:
+            int: The column of the first move of a forced win, None if none was found.
+        """
+        self._nodes = 0
+        return self._attacks(self._state.player_to_move(), self._max_depth)
+
+    def losing_moves(self):
+        """Returns the moves of the player to move after which the opponent has a forced win
+
+        Returns:
+            set: The columns to avoid.
+        """
+        state = self._state
+        self._nodes = 0
+        losing = set()
+        for col in range(state.variant.columns):
+            if state.is_column_full(col):
+                continue
+            state.play(col)
+            opponent = state.player_to_move()
+            if not state.has_won(-opponent) and self._attacks(opponent, self._max_depth - 1) is not None:
+                losing.add(col)
+            state.undo()
+        return losing
@@ -0,0 +1,211 @@
+import json
+import math
+import random
+from multiprocessing import Pool
+
+from .SelfPlay import SelfPlay
+
+
+class Tournament:
+    """Class playing two AI engine configurations against each other until the result is significant
+
+    Games are played in pairs with the same opening, each configuration starting once,
+    spread across processes. Every pair starts from a different opening of the opening book
+    (SelfPlay), drawn without replacement, so the match stops when the book runs out. The
+    two games of a pair are correlated by their opening, so the statistics use the score of
+    each pair (0, 0.5, 1, 1.5 or 2 points, the pentanomial model) rather than of each game. After every pair, the Elo difference is estimated with a
+    95% confidence interval, and a sequential probability ratio test (SPRT) checks whether the
+    pairs so far are enough to accept either H0 (the difference is elo0) or H1 (it is elo1).
+    The match stops as soon as one hypothesis is accepted, or after max_pairs pairs.
+    """
+    H0 = "H0"
+    H1 = "H1"
+
+    def __init__(self, config_a, config_b, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05,
+                 opening_plies=SelfPlay.OPENING_PLIES, seed=0):
+        """Initializes a match
+
+        Args:
+            config_a (dict): The engine configuration tested (see SelfPlay).
+            config_b (dict): The reference engine configuration.
+            elo0 (float): The Elo difference of the null hypothesis (no improvement).
+            elo1 (float): The Elo difference of the alternative hypothesis (improvement).
+            alpha (float): The probability of accepting H1 when H0 is true.
+            beta (float): The probability of accepting H0 when H1 is true.
+            opening_plies (int): The number of moves of the openings.
+            seed (int): The seed of the openings.
+        """
+        self._config_a = config_a
+        self._config_b = config_b
+        self._elo0 = elo0
+        self._elo1 = elo1
+        self._lower_bound = math.log(beta / (1 - alpha))
+        self._upper_bound = math.log((1 - beta) / alpha)
+        self._opening_plies = opening_plies
+        self._seed = seed
+        self._wins = 0
+        self._draws = 0
+        self._losses = 0
+        # Number of pairs for each score of the tested configuration, in half points (0 to 4)
+        self._pair_scores = [0] * 5
+
+    @staticmethod
+    def load_config(path):
+        """Loads an engine configuration from a JSON file
+
+        A "points_file" key is replaced by the content of that points configuration file,
+        under the "points" key.
+
+        Args:
+            path (str): The path of the engine configuration.
+
+        Returns:
+            dict: The engine configuration.
+        """
+        with open(path, 'r') as json_file:
+            config = json.load(json_file)
+        if "points_file" in config:
+            with open(config.pop("points_file"), 'r') as json_file:
+                config["points"] = json.load(json_file)
+        return config
+
+    @staticmethod
+    def _score_to_elo(score):
+        """Converts an expected score to an Elo difference
+        """
+        score = min(max(score, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / score - 1)
+
+    @staticmethod
+    def _elo_to_score(elo):
+        """Converts an Elo difference to an expected score
+        """
+        return 1 / (1 + 10 ** (-elo / 400))
+
+    def get_results(self):
+        """Getter for the wins, draws and losses of the tested configuration
+        """
+        return self._wins, self._draws, self._losses
+
+    def add_pair(self, wins, draws, losses):
+        """Records the result of a game pair
+
+        Args:
+            wins (int): The games of the pair won by the tested configuration.
+            draws (int): The drawn games of the pair.
+            losses (int): The games of the pair lost by the tested configuration.
+        """
+        self._wins += wins
+        self._draws += draws
+        self._losses += losses
+        self._pair_scores[2 * wins + draws] += 1
+
+    def _mean_and_variance(self):
+        """Returns the mean score of the tested configuration (0 to 1) and the variance of one pair score
+        """
+        pairs = sum(self._pair_scores)
+        mean = sum(count * half_points / 4 for half_points, count in enumerate(self._pair_scores)) / pairs
+        variance = sum(count * (half_points / 4 - mean) ** 2
+                       for half_points, count in enumerate(self._pair_scores)) / pairs
+        return mean, variance
+
+    def elo(self):
+        """Estimates the Elo difference of the tested configuration with a 95% confidence interval
+
+        Returns:
+            tuple: The estimated Elo difference and the half width of its confidence interval.
+        """
+        pairs = sum(self._pair_scores)
+        if pairs == 0:
+            return 0.0, float("inf")
+        mean, variance = self._mean_and_variance()
+        margin = 1.96 * math.sqrt(variance / pairs)
+        low = Tournament._score_to_elo(mean - margin)
+        high = Tournament._score_to_elo(mean + margin)
+        return Tournament._score_to_elo(mean), (high - low) / 2
+
+    def llr(self):
+        """Computes the log-likelihood ratio of H1 against H0
+
+        Uses the normal approximation of the generalized SPRT, with the variance of the
+        pair scores observed so far.
+
+        Returns:
+            float: The log-likelihood ratio, 0 while it cannot be estimated.
+        """
+        pairs = sum(self._pair_scores)
+        if pairs == 0:
+            return 0.0
+        mean, variance = self._mean_and_variance()
+        if variance == 0:
+            return 0.0
+        score0 = Tournament._elo_to_score(self._elo0)
+        score1 = Tournament._elo_to_score(self._elo1)
+        return pairs * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+    def decision(self):
+        """Returns the hypothesis accepted by the SPRT
+
+        Returns:
+            str: H0, H1, or None while the test is not conclusive.
+        """
+        llr = self.llr()
+        if llr >= self._upper_bound:
+            return Tournament.H1
+        if llr <= self._lower_bound:
+            return Tournament.H0
+        return None
+
+    @staticmethod
+    def _play_pair(task):
+        """Plays a game pair for the process pool
+        """
+        return SelfPlay.play_pair(*task)
+
+    def tasks(self, max_pairs):
+        """Returns the game pairs of the match, one per opening drawn from the book
+
+        Args:
+            max_pairs (int): The largest number of game pairs.
+
+        Returns:
+            list: The arguments of SelfPlay.play_pair for each pair, fewer than max_pairs
+            when the book is smaller.
+        """
+        rng = random.Random(self._seed)
+        openings = SelfPlay.draw_openings(max_pairs, rng.randrange(2 ** 32), self._opening_plies)
+        return [(self._config_a, self._config_b, rng.randrange(2 ** 32), opening) for opening in openings]
+
+    def run(self, max_pairs=5000, processes=None, verbose=True):
+        """Plays game pairs until the SPRT accepts a hypothesis or max_pairs are played
+
+        Args:
+            max_pairs (int): The largest number of game pairs, at most the size of the opening book.
+            processes (int): The number of worker processes, one per CPU when omitted.
+            verbose (bool): Whether to print the standings after every pair.
+
+        Returns:
+            str: The accepted hypothesis, None if the test was not conclusive.
+        """
+        tasks = self.tasks(max_pairs)
+        if len(tasks) < max_pairs:
+            print(f"Warning: the opening book has only {len(tasks)} openings of {self._opening_plies} moves, "
+                  f"the match stops after {len(tasks)} pairs instead of {max_pairs}.")
+
+        decision = None
+        with Pool(processes) as pool:
+            # Leaving the pool terminates the pairs still being played once the test is conclusive
+            for wins, draws, losses in pool.imap_unordered(Tournament._play_pair, tasks):
+                self.add_pair(wins, draws, losses)
+                decision = self.decision()
+                if verbose:
+                    elo, margin = self.elo()
+                    print(f"\rGames: {self._wins + self._draws + self._losses} "
+                          f"(+{self._wins} ={self._draws} -{self._losses}), "
+                          f"Elo: {elo:+.1f} +/- {margin:.1f}, LLR: {self.llr():.2f} "
+                          f"[{self._lower_bound:.2f}, {self._upper_bound:.2f}]", end="")
+                if decision is not None:
+                    break
+        if verbose:
+            print()
+        return decision
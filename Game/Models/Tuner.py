@@ -0,0 +1,182 @@
+import json
+import os
+import random
+from multiprocessing import Pool
+
+from .SelfPlay import SelfPlay
+from .Utils import Utils
+
+
+class Tuner:
+    """Class tuning the weights of the heuristic AI by self-play
+
+    The tuner uses SPSA (simultaneous perturbation stochastic approximation): at each
+    iteration, every weight is shifted up or down at random by the same relative step, giving
+    two opposite weight sets which play a batch of game pairs against each other, in
+    parallel processes, each pair from a different opening of the opening book (SelfPlay).
+    The weights then move towards the set which scored better, by a step which shrinks over
+    the iterations. The state is saved after every iteration, so an
+    interrupted run resumes where it stopped, and the tuned weights are written as a complete
+    points configuration.
+    """
+    CHECKPOINT_FILE = '../data/tuning_checkpoint.json'
+    OUTPUT_FILE = '../config/points_config_tuned.json'
+
+    # Weights of IA.evaluate_moves played by self-play; the historical weights depend on the
+    # stored games and the threat weights are set on the board's evaluator, so they are not tuned
+    PARAMETERS = ["immediate_win", "block_opponent_win", "avoid_giving_win",
+                  "ai_alignment_score", "player_alignment_score", "central_column_preference"]
+
+    # SPSA gains: relative perturbation c / (k + 1) ** GAMMA, relative step a / (k + 1 + A) ** ALPHA
+    ALPHA = 0.602
+    GAMMA = 0.101
+
+    def __init__(self, points_config=None, pairs_per_iteration=32, perturbation=0.2, learning_rate=0.5,
+                 stability=10, opening_plies=SelfPlay.OPENING_PLIES, seed=0):
+        """Initializes a tuner starting from a points configuration
+
+        Args:
+            points_config (dict): The starting weights, the configuration file when omitted.
+            pairs_per_iteration (int): The number of game pairs played at each iteration.
+            perturbation (float): The initial relative perturbation of the weights (c).
+            learning_rate (float): The initial relative step of the weights (a).
+            stability (int): The SPSA stability constant (A), damping the first iterations.
+            opening_plies (int): The number of moves of the openings.
+            seed (int): The seed of the perturbations and of the games.
+        """
+        self._points_config = dict(points_config or Utils.load_points_config())
+        self._weights = {name: float(self._points_config[name]) for name in Tuner.PARAMETERS}
+        self._pairs_per_iteration = pairs_per_iteration
+        self._perturbation = perturbation
+        self._learning_rate = learning_rate
+        self._stability = stability
+        self._opening_plies = opening_plies
+        self._seed = seed
+        self._iteration = 0
+        self._history = []
+
+    def get_weights(self):
+        """Getter for the current weights
+        """
+        return dict(self._weights)
+
+    def get_iteration(self):
+        """Getter for the number of iterations done
+        """
+        return self._iteration
+
+    def _config(self, weights):
+        """Returns the engine configuration playing with some weights
+        """
+        points = dict(self._points_config)
+        points.update(weights)
+        return {"engine": "heuristic", "points": points}
+
+    @staticmethod
+    def _play_pair(task):
+        """Plays a game pair for the process pool
+        """
+        return SelfPlay.play_pair(*task)
+
+    def step(self, pool):
+        """Runs one SPSA iteration
+
+        Args:
+            pool (multiprocessing.Pool): The worker processes playing the games.
+
+        Returns:
+            float: The score of the shifted-up weights against the shifted-down ones (0 to 1).
+        """
+        # Each iteration has its own seed, so a resumed run plays the same games
+        rng = random.Random(f"{self._seed}-{self._iteration}")
+        k = self._iteration
+        c_k = self._perturbation / (k + 1) ** Tuner.GAMMA
+        a_k = self._learning_rate / (k + 1 + self._stability) ** Tuner.ALPHA
+
+        signs = {name: rng.choice((-1, 1)) for name in Tuner.PARAMETERS}
+        plus = {name: value * (1 + c_k * signs[name]) for name, value in self._weights.items()}
+        minus = {name: value * (1 - c_k * signs[name]) for name, value in self._weights.items()}
+
+        openings = SelfPlay.draw_openings(self._pairs_per_iteration, rng.randrange(2 ** 32), self._opening_plies)
+        tasks = [(self._config(plus), self._config(minus), rng.randrange(2 ** 32), opening) for opening in openings]
+        wins = draws = games = 0
+        for pair_wins, pair_draws, pair_losses in pool.imap_unordered(Tuner._play_pair, tasks):
+            wins += pair_wins
+            draws += pair_draws
+            games += pair_wins + pair_draws + pair_losses
+        score = (wins + 0.5 * draws) / games
+
+        # Gradient of the score in relative units: (score(+) - score(-)) / (2 c_k sign), with score(-) = 1 - score(+)
+        for name in Tuner.PARAMETERS:
+            gradient = (2 * score - 1) / (2 * c_k * signs[name])
+            self._weights[name] = max(0.0, self._weights[name] * (1 + a_k * gradient))
+
+        self._iteration += 1
+        self._history.append({"iteration": self._iteration, "score": score, "weights": self.get_weights()})
+        return score
+
+    def save_checkpoint(self):
+        """Saves the state of the tuning and writes the tuned configuration
+        """
+        state = {"seed": self._seed, "iteration": self._iteration, "weights": self._weights,
+                 "points_config": self._points_config, "history": self._history}
+        for path, content in ((Tuner.CHECKPOINT_FILE, state), (Tuner.OUTPUT_FILE, self.tuned_config())):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary_path = path + ".tmp"
+            with open(temporary_path, 'w') as json_file:
+                json.dump(content, json_file, indent=4)
+            os.replace(temporary_path, path)
+
+    def load_checkpoint(self):
+        """Resumes from the saved state, if any
+
+        Returns:
+            bool: True if a checkpoint has been loaded.
+        """
+        try:
+            with open(Tuner.CHECKPOINT_FILE, 'r') as json_file:
+                state = json.load(json_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        self._seed = state["seed"]
+        self._iteration = state["iteration"]
+        self._weights = {name: float(value) for name, value in state["weights"].items()}
+        self._points_config = state["points_config"]
+        self._history = state["history"]
+        return True
+
+    def tuned_config(self):
+        """Returns the complete points configuration with the tuned weights, rounded
+
+        Returns:
+            dict: The points configuration.
+        """
+        config = dict(self._points_config)
+        config.update({name: round(value, 2) for name, value in self._weights.items()})
+        return config
+
+    def run(self, iterations, processes=None):
+        """Tunes the weights, saving the state after every iteration
+
+        Args:
+            iterations (int): The number of iterations to reach, counting those of a resumed run.
+            processes (int): The number of worker processes, one per CPU when omitted.
+
+        Returns:
+            dict: The tuned points configuration.
+        """
+        openings = len(SelfPlay.opening_book(self._opening_plies))
+        if openings < self._pairs_per_iteration:
+            print(f"Warning: the opening book has only {openings} openings of {self._opening_plies} moves, "
+                  f"each iteration plays {openings} pairs instead of {self._pairs_per_iteration}.")
+
+        with Pool(processes) as pool:
+            while self._iteration < iterations:
+                score = self.step(pool)
+                self.save_checkpoint()
+                print(f"Iteration {self._iteration}/{iterations}: score {score:.3f}, "
+                      + ", ".join(f"{name}={value:.1f}" for name, value in self._weights.items()))
+        return self.tuned_config()
@@ -1,50 +1,83 @@
 import json
+import os
 import numpy as np
 
 class Utils:
     """Utility class
 
-    This class contains static methods to check the game board for winning conditions.
+    This class contains static methods to check the game board for winning conditions
+    and to load the configuration files. A configuration file is parsed once and kept in
+    memory, and parsed again only when its modification time or size changes.
     """
+    # Configuration files already parsed, by absolute path: ((modification time, size), content)
+    _configs = {}
+
     @staticmethod
-    def get_player_to_win(plateau: np.array) -> int:
+    def get_player_to_win(plateau: np.array, connect: int = 4) -> int:
         """Checks the game board for a winning condition
 
         Iterates through the game board to check for any winning conditions.
-        A player wins if they have four consecutive tokens in a row horizontally,
+        A player wins if they have `connect` consecutive tokens in a row horizontally,
         vertically, or diagonally.
 
         Args:
-            plateau (np.array): The 6x7 array representing the game board.
+            plateau (np.array): The array representing the game board, of any size.
+            connect (int): Number of aligned tokens needed to win. Defaults to 4.
 
         Returns:
             int: 1 if the human player wins, -1 if the AI wins, 0 if no winner yet.
         """
-        for line in range(6):
-            for column in range(7):
+        rows, columns = plateau.shape
+        reach = connect - 1
+        for line in range(rows):
+            for column in range(columns):
                 current_token = plateau[line][column]
                 if current_token != 0:
                     # Check horizontal win
-                    if column + 3 < 7 and all(
-                            plateau[line][column + i] == current_token for i in range(4)):
+                    if column + reach < columns and all(
+                            plateau[line][column + i] == current_token for i in range(connect)):
                         return current_token
 
                     # Check vertical win
-                    if line + 3 < 6 and all(
-                            plateau[line + i][column] == current_token for i in range(4)):
+                    if line + reach < rows and all(
+                            plateau[line + i][column] == current_token for i in range(connect)):
                         return current_token
 
                     # Check diagonal (descending) win
-                    if line + 3 < 6 and column + 3 < 7 and all(
-                            plateau[line + i][column + i] == current_token for i in range(4)):
+                    if line + reach < rows and column + reach < columns and all(
+                            plateau[line + i][column + i] == current_token for i in range(connect)):
                         return current_token
 
                     # Check diagonal (ascending) win
-                    if line - 3 >= 0 and column + 3 < 7 and all(
-                            plateau[line - i][column + i] == current_token for i in range(4)):
+                    if line - reach >= 0 and column + reach < columns and all(
+                            plateau[line - i][column + i] == current_token for i in range(connect)):
                         return current_token
         return 0
 
+    @staticmethod
+    def _load_json(path: str) -> dict:
+        """Loads a JSON configuration file, from memory when it has not changed
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            dict: A copy of the content of the file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = Utils._configs.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, 'r') as json_file:
+                cached = (version, json.load(json_file))
+            Utils._configs[path] = cached
+        return dict(cached[1])
+
     @staticmethod
     def load_points_config() -> dict:
         """Load the points configuration from a JSON file
@@ -53,11 +86,41 @@ class Utils:
             dict: The points configuration loaded from the JSON file.
         """
         try:
-            with open('../config/points_config.json', 'r') as json_file:
-                return json.load(json_file)
+            return Utils._load_json('../config/points_config.json')
         except FileNotFoundError:
             print("Error: points_config.json file not found.")
             return {}
         except json.JSONDecodeError:
             print("Error: Failed to decode JSON from points_config.json.")
             return {}
+
+    @staticmethod
+    def load_engine_config() -> dict:
+        """Load the AI engine configuration from a JSON file
+
+        The "engine" key selects the AI engine: "heuristic" (move evaluation with the
+        points configuration) or "mcts" (Monte Carlo Tree Search). "ai_service" asks the
+        heuristic moves to the AI service (ai_service.py) within "ai_service_deadline" seconds.
+
+        Returns:
+            dict: The engine configuration, the heuristic engine if the file cannot be read.
+        """
+        try:
+            return Utils._load_json('../config/engine_config.json')
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"engine": "heuristic"}
+
+    @staticmethod
+    def load_storage_config() -> dict:
+        """Load the game saving configuration from a JSON file
+
+        The "batch_size" and "flush_interval" keys set when queued games are written to the
+        game data file, and "fsync" when they are forced to disk ("batch", "close" or "never").
+
+        Returns:
+            dict: The storage configuration, empty if the file cannot be read.
+        """
+        try:
+            return Utils._load_json('../config/storage_config.json')
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
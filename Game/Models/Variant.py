@@ -0,0 +1,128 @@
+import random
+import threading
+
+
+class Variant:
+    """Class describing a variant of the game: board dimensions and number of tokens to connect
+
+    A variant precomputes every table that only depends on its dimensions (winning windows,
+    windows through each cell, Zobrist keys, shot tuples, distances to the center). Variants
+    are created through Variant.get, which returns the same instance for the same dimensions
+    so that all the games of a variant share these tables.
+    """
+    # Variants offered in the game menu: (rows, columns, connect, label)
+    PRESETS = [
+        (6, 7, 4, "Classic (6x7, connect 4)"),
+        (9, 10, 5, "Large (9x10, connect 5)"),
+    ]
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, rows, columns, connect):
+        """Initializes the variant and precomputes its tables
+
+        Use Variant.get instead of calling the constructor directly.
+
+        Args:
+            rows (int): Number of rows of the board.
+            columns (int): Number of columns of the board.
+            connect (int): Number of aligned tokens needed to win.
+        """
+        if connect < 2 or connect > max(rows, columns):
+            raise ValueError("The connect length does not fit on the board.")
+
+        self.rows = rows
+        self.columns = columns
+        self.connect = connect
+        self.size = rows * columns
+        self.windows, self.cell_windows = Variant._build_windows(rows, columns, connect)
+
+        # (row, col) tuples shared by all games so that playing a move does not allocate
+        self.cells = [[(row, col) for col in range(columns)] for row in range(rows)]
+
+        # Zobrist keys: one random 64-bit number per cell and per player, xored into the position hash
+        self.zobrist = {
+            player: [[random.Random(f"{player}-{row}-{col}").getrandbits(64) for col in range(columns)]
+                     for row in range(rows)]
+            for player in (1, -1)
+        }
+        self.zobrist_side = random.Random("side-to-move").getrandbits(64)
+
+        # Distance of each column to the center of the board, and columns ordered from the center
+        self.center_distance = [abs(2 * col - (columns - 1)) // 2 for col in range(columns)]
+        self.center_order = sorted(range(columns), key=lambda col: (self.center_distance[col], col))
+
+    @classmethod
+    def get(cls, rows=6, columns=7, connect=4):
+        """Returns the shared instance of a variant, creating it on first use
+
+        Args:
+            rows (int): Number of rows of the board.
+            columns (int): Number of columns of the board.
+            connect (int): Number of aligned tokens needed to win.
+
+        Returns:
+            Variant: The variant for these dimensions.
+        """
+        key = (rows, columns, connect)
+        instance = cls._instances.get(key)
+        if instance is None:
+            # The preloader thread and the game may ask for a variant at the same time
+            with cls._instances_lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = cls._instances[key] = cls(rows, columns, connect)
+        return instance
+
+    @staticmethod
+    def _build_windows(rows, columns, connect):
+        """Builds the table of winning windows and the windows going through each cell
+
+        Args:
+            rows (int): Number of rows of the board.
+            columns (int): Number of columns of the board.
+            connect (int): Number of aligned tokens needed to win.
+
+        Returns:
+            tuple: The list of windows (tuples of flat cell indices) and, for each
+            flat cell index, the tuple of window indices containing that cell.
+        """
+        windows = []
+        for row in range(rows):
+            for col in range(columns):
+                # Horizontal, vertical, descending diagonal and ascending diagonal
+                for dr, dc in [(0, 1), (1, 0), (1, 1), (-1, 1)]:
+                    end_row = row + dr * (connect - 1)
+                    end_col = col + dc * (connect - 1)
+                    if 0 <= end_row < rows and 0 <= end_col < columns:
+                        windows.append(tuple((row + dr * i) * columns + col + dc * i for i in range(connect)))
+
+        cell_windows = [[] for _ in range(rows * columns)]
+        for index, window in enumerate(windows):
+            for cell in window:
+                cell_windows[cell].append(index)
+
+        return windows, [tuple(indices) for indices in cell_windows]
+
+    def mirror_column(self, col):
+        """Returns the column matching a column in the left-right mirror of the board
+
+        Args:
+            col (int): The column to mirror.
+
+        Returns:
+            int: The mirrored column.
+        """
+        return self.columns - 1 - col
+
+    def is_classic(self):
+        """Checks whether the variant is the classic 6x7 connect four
+
+        Returns:
+            bool: True for the classic variant.
+        """
+        return (self.rows, self.columns, self.connect) == (6, 7, 4)
+
+    def __repr__(self):
+        return f"Variant({self.rows}x{self.columns}, connect {self.connect})"
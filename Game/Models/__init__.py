@@ -4,3 +4,25 @@ from .IA import IA
 from .Utils import Utils
 from .Database import Database
 from .Graphics import Graphics
+from .Evaluator import Evaluator
+from .Variant import Variant
+from .Analyzer import Analyzer
+from .Search import Search
+from .Snapshot import Snapshot
+from .Ponder import Ponder
+from .History import History
+from .MCTS import MCTS
+from .Spectator import SpectatorServer, SpectatorClient
+from .GameCode import GameCode
+from .GameWriter import GameWriter
+from .FileLock import FileLock
+from .Rollup import Rollup
+from .RenderCache import RenderCache
+from .SelfPlay import SelfPlay
+from .Tuner import Tuner
+from .Tournament import Tournament
+from .GameState import GameState
+from .AIService import AIServer, AIClient
+from .ThreatSearch import ThreatSearch
+from .EvaluationCache import EvaluationCache
+from .Preloader import Preloader
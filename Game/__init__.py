@@ -4,3 +4,25 @@ from .Models.IA import IA
 from .Models.Utils import Utils
 from .Models.Database import Database
 from .Models.Graphics import Graphics
+from .Models.Evaluator import Evaluator
+from .Models.Variant import Variant
+from .Models.Analyzer import Analyzer
+from .Models.Search import Search
+from .Models.Snapshot import Snapshot
+from .Models.Ponder import Ponder
+from .Models.History import History
+from .Models.MCTS import MCTS
+from .Models.Spectator import SpectatorServer, SpectatorClient
+from .Models.GameCode import GameCode
+from .Models.GameWriter import GameWriter
+from .Models.FileLock import FileLock
+from .Models.Rollup import Rollup
+from .Models.RenderCache import RenderCache
+from .Models.SelfPlay import SelfPlay
+from .Models.Tuner import Tuner
+from .Models.Tournament import Tournament
+from .Models.GameState import GameState
+from .Models.AIService import AIServer, AIClient
+from .Models.ThreatSearch import ThreatSearch
+from .Models.EvaluationCache import EvaluationCache
+from .Models.Preloader import Preloader
@@ -0,0 +1,31 @@
+import argparse
+
+from Game import AIServer
+
+
+def main(argv=None):
+    """Runs the AI service answering the moves of the game processes until Ctrl-C
+
+    Args:
+        argv (list): The command line arguments, sys.argv when omitted.
+    """
+    parser = argparse.ArgumentParser(description="Serve the AI moves of local game processes.")
+    parser.add_argument("--batch-window", type=float, default=5.0,
+                        help="Time to wait for more requests after the first one of a batch, in milliseconds.")
+    parser.add_argument("--max-batch", type=int, default=64, help="Largest number of requests answered together.")
+    parser.add_argument("--cache-size", type=int, default=100000, help="Largest number of answers kept in the cache.")
+    args = parser.parse_args(argv)
+
+    server = AIServer(batch_window=args.batch_window / 1000, max_batch=args.max_batch, cache_size=args.cache_size)
+    print(f"AI service listening on {AIServer.ADDRESS}, press Ctrl-C to stop.")
+    if not server.serve_forever():
+        print("The AI service is already running or its address is not available.")
+        return
+
+    stats = server.get_stats()
+    print(f"{stats['requests']} requests in {stats['batches']} batches, {stats['shared']} shared, "
+          f"{stats['cache_hits']} cache hits, {stats['expired']} expired.")
+
+
+if __name__ == "__main__":
+    main()
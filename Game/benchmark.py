@@ -0,0 +1,77 @@
+import random
+import time
+
+from Game import Plateau, IA, Variant
+
+
+def benchmark_variant(rows, columns, connect, games=200):
+    """Measures the cost of the engine primitives for one variant
+
+    Plays random games with play/undo, then times the AI move evaluation
+    on positions taken from these games.
+
+    Args:
+        rows (int): Number of rows of the board.
+        columns (int): Number of columns of the board.
+        connect (int): Number of aligned tokens needed to win.
+        games (int): Number of random games to play.
+
+    Returns:
+        dict: The measured costs in microseconds.
+    """
+    start = time.perf_counter()
+    Variant.get(rows, columns, connect)
+    tables_time = time.perf_counter() - start
+
+    plateau = Plateau(rows, columns, connect)
+    plateau.set_player_who_starts(1)
+    evaluator = plateau.get_evaluator()
+    rng = random.Random(0)
+
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        while evaluator.winner() == 0 and len(plateau.get_shots()) < plateau.get_variant().size:
+            columns_left = [col for col in range(columns) if not plateau.is_column_full(col)]
+            plateau.play(rng.choice(columns_left))
+            moves += 1
+        while plateau.get_shots():
+            plateau.undo()
+    play_undo_time = time.perf_counter() - start
+
+    evaluations = 0
+    start = time.perf_counter()
+    for _ in range(20):
+        for _ in range(rng.randrange(0, plateau.get_variant().size // 3) // 2 * 2 + 1):
+            columns_left = [col for col in range(columns) if not plateau.is_column_full(col)]
+            plateau.play(rng.choice(columns_left))
+        if plateau.get_player_to_move() == -1:
+            # The history only covers the classic board: every variant times the heuristic alone
+            IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False, use_history=False,
+                              use_cache=False)
+            evaluations += 1
+        while plateau.get_shots():
+            plateau.undo()
+    evaluation_time = time.perf_counter() - start
+
+    return {
+        "tables_us": tables_time * 1e6,
+        "play_undo_us": play_undo_time / moves * 1e6,
+        "evaluation_us": evaluation_time / max(evaluations, 1) * 1e6,
+    }
+
+
+def main():
+    """Prints how the engine cost grows with the board size
+    """
+    variants = [(6, 7, 4), (7, 8, 4), (9, 10, 5), (12, 14, 6), (16, 18, 7)]
+
+    print(f"{'Variant':<16}{'Tables (us)':>14}{'Play+undo (us)':>18}{'AI evaluation (us)':>22}")
+    for rows, columns, connect in variants:
+        result = benchmark_variant(rows, columns, connect)
+        print(f"{f'{rows}x{columns} c{connect}':<16}{result['tables_us']:>14.0f}"
+              f"{result['play_undo_us']:>18.2f}{result['evaluation_us']:>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import warnings
+
+import matplotlib
+
+# Render charts without a display so that the commands can run from cron or a pipeline
+matplotlib.use("Agg")
+warnings.filterwarnings("ignore", message=".*non-interactive.*")
+
+import pandas as pd
+
+from Game import Database, Plateau
+
+SIDES = {"player": 1, "ia": -1}
+
+
+def parse_sort_keys(values):
+    """Parses sort keys given as column[:asc|desc]
+
+    Args:
+        values (list): The sort arguments, each one possibly holding comma-separated keys.
+
+    Returns:
+        list: (column, ascending) pairs.
+    """
+    sort_keys = []
+    for value in values or []:
+        for key in value.split(","):
+            column, _, order = key.strip().partition(":")
+            if order not in ("", "asc", "desc"):
+                raise ValueError(f"Invalid sort order: {order}")
+            sort_keys.append((column, order != "desc"))
+    return sort_keys
+
+
+def load_filtered_data(args):
+    """Loads the game data once and applies the filters given on the command line
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        pd.DataFrame: The filtered game data.
+    """
+    if args.data:
+        Database.DATA_FILE = args.data
+
+    if args.last_days is not None:
+        if args.last_days < 1:
+            raise ValueError("--last-days must be at least 1.")
+        df = Database.read_last_days(args.last_days)
+        df = Database.apply_game_filters(df, args.start, args.end)
+    else:
+        # Only the games of the date range are read
+        df = Database.read_history(args.start, args.end)
+    Database._validate_columns(df)
+    return Database.apply_game_filters(df, starter=SIDES.get(args.starter), winner=SIDES.get(args.winner))
+
+
+def write_export(df, args, path):
+    """Writes the filtered game data with the selected columns and sort order
+
+    Args:
+        df (pd.DataFrame): The filtered game data.
+        args (argparse.Namespace): The parsed arguments.
+        path (str): The output file path, "-" for the standard output.
+    """
+    df = Database.sort_by(df, parse_sort_keys(args.sort))
+    df = Database.keep_columns(df, [column for column in (args.columns or "").split(",") if column])
+
+    if path == "-":
+        print(df.to_string(index=False))
+    else:
+        Database.write_dataframe(df, path, args.format)
+        print(f"Data exported to: {path}", file=sys.stderr)
+
+
+def write_stats(df, path):
+    """Writes the statistics report, as JSON for .json paths and as text otherwise
+
+    Args:
+        df (pd.DataFrame): The filtered game data.
+        path (str): The output file path, "-" for the standard output.
+    """
+    if path.endswith(".json"):
+        content = json.dumps(Plateau.statistics_summary(df), indent=2)
+    else:
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            prepared = Plateau.prepare_data(df.copy())
+            Plateau.display_terminal_report(prepared, *Plateau.compute_statistics(prepared))
+        content = buffer.getvalue()
+
+    if path == "-":
+        print(content)
+    else:
+        with open(path, "w") as stats_file:
+            stats_file.write(content)
+        print(f"Statistics written to: {path}", file=sys.stderr)
+
+
+def write_report(df, path):
+    """Writes the PDF report
+
+    Args:
+        df (pd.DataFrame): The filtered game data.
+        path (str): The path of the PDF file.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        Plateau.generate_pdf_report(filepath=path, df=df)
+
+
+def build_parser():
+    """Builds the command line parser
+
+    Returns:
+        argparse.ArgumentParser: The parser with the export, stats, report and batch subcommands.
+    """
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--data", help="Path of the game data CSV file.")
+    filters.add_argument("--start", help="Keep games played from this date (YYYY-MM-DD).")
+    filters.add_argument("--end", help="Keep games played until this date included (YYYY-MM-DD).")
+    filters.add_argument("--last-days", type=int, help="Keep games played during the last N days, today included.")
+    filters.add_argument("--starter", choices=SIDES, help="Keep games started by this side.")
+    filters.add_argument("--winner", choices=SIDES, help="Keep games won by this side.")
+
+    selection = argparse.ArgumentParser(add_help=False)
+    selection.add_argument("--columns", help="Comma-separated columns to export, all when omitted.")
+    selection.add_argument("--sort", action="append", help="Sort key as column[:asc|desc], repeatable.")
+    selection.add_argument("--format", choices=["csv", "json", "html"],
+                           help="Export format, deduced from the extension when omitted.")
+
+    parser = argparse.ArgumentParser(description="Connect Four statistics, export and report generation.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", parents=[filters, selection], help="Export game data.")
+    export.add_argument("-o", "--output", action="append", required=True,
+                        help="Output path ('-' for the terminal), repeatable.")
+
+    stats = subparsers.add_parser("stats", parents=[filters], help="Compute the statistics report.")
+    stats.add_argument("-o", "--output", action="append", help="Output path, .json for JSON, repeatable.")
+
+    report = subparsers.add_parser("report", parents=[filters], help="Generate the PDF report.")
+    report.add_argument("-o", "--output", action="append", required=True, help="PDF path, repeatable.")
+
+    batch = subparsers.add_parser("batch", parents=[filters, selection],
+                                  help="Produce several outputs from a single load of the data.")
+    batch.add_argument("--export", action="append", default=[], help="Export path, repeatable.")
+    batch.add_argument("--stats", action="append", default=[], help="Statistics path, repeatable.")
+    batch.add_argument("--report", action="append", default=[], help="PDF report path, repeatable.")
+
+    return parser
+
+
+def main(argv=None):
+    """Runs the command line interface
+
+    Args:
+        argv (list): The command line arguments, sys.argv when omitted.
+
+    Returns:
+        int: The exit code (0 on success, 1 when there is no data, 2 on invalid arguments).
+    """
+    args = build_parser().parse_args(argv)
+
+    try:
+        df = load_filtered_data(args)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        print("No game data found.", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.command == "export":
+        jobs = [(write_export, path) for path in args.output]
+    elif args.command == "stats":
+        jobs = [(write_stats, path) for path in (args.output or ["-"])]
+    elif args.command == "report":
+        jobs = [(write_report, path) for path in args.output]
+    else:
+        jobs = ([(write_export, path) for path in args.export]
+                + [(write_stats, path) for path in args.stats]
+                + [(write_report, path) for path in args.report])
+
+    if df.empty and any(job is write_report for job, _ in jobs):
+        print("No game data matches the filters, the PDF report is skipped.", file=sys.stderr)
+        jobs = [(job, path) for job, path in jobs if job is not write_report]
+
+    try:
+        for job, path in jobs:
+            if job is write_export:
+                write_export(df, args, path)
+            else:
+                job(df, path)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
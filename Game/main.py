@@ -1,10 +1,11 @@
-from Game import Plateau
+from Game import Database, Plateau
 
 def main():
     """Main function to start.
 
     Initializes the game board and starts the game loop. Handles manual interruptions
-    gracefully by catching KeyboardInterrupt exceptions.
+    gracefully by catching KeyboardInterrupt exceptions. The games still queued for saving
+    are written before leaving, however the program ends.
     """
     try:
         plateau = Plateau()
@@ -14,6 +15,8 @@ def main():
         print("\n-----------------------------")
         print("Manual interruption detected!")
         print("-----------------------------")
+    finally:
+        Database.close_writer()
 
 if __name__ == "__main__":
     """Entry point of the script.
@@ -0,0 +1,44 @@
+import argparse
+
+from Game import Tournament
+
+
+def main(argv=None):
+    """Plays two AI engine configurations against each other and reports the SPRT result
+
+    Args:
+        argv (list): The command line arguments, sys.argv when omitted.
+
+    Returns:
+        int: 0 if the tested configuration is accepted as an improvement (H1), 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Match two AI engine configurations with SPRT early stopping.")
+    parser.add_argument("tested", help="Engine configuration tested (JSON, like Config/engine_config.json).")
+    parser.add_argument("reference", help="Reference engine configuration.")
+    parser.add_argument("--elo0", type=float, default=0.0, help="Elo difference of H0.")
+    parser.add_argument("--elo1", type=float, default=10.0, help="Elo difference of H1.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="False positive rate.")
+    parser.add_argument("--beta", type=float, default=0.05, help="False negative rate.")
+    parser.add_argument("--max-pairs", type=int, default=5000, help="Largest number of game pairs.")
+    parser.add_argument("--processes", type=int, help="Worker processes, one per CPU when omitted.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the openings.")
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(Tournament.load_config(args.tested), Tournament.load_config(args.reference),
+                            elo0=args.elo0, elo1=args.elo1, alpha=args.alpha, beta=args.beta, seed=args.seed)
+    decision = tournament.run(args.max_pairs, args.processes)
+
+    elo, margin = tournament.elo()
+    wins, draws, losses = tournament.get_results()
+    print(f"Result: +{wins} ={draws} -{losses}, Elo {elo:+.1f} +/- {margin:.1f} (95%)")
+    if decision == Tournament.H1:
+        print(f"H1 accepted: the tested configuration is at least {args.elo1:+g} Elo.")
+    elif decision == Tournament.H0:
+        print(f"H0 accepted: the tested configuration is not better than {args.elo0:+g} Elo.")
+    else:
+        print("Inconclusive: the maximum number of games was reached.")
+    return 0 if decision == Tournament.H1 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
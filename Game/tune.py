@@ -0,0 +1,29 @@
+import argparse
+
+from Game import Tuner
+
+
+def main(argv=None):
+    """Tunes the weights of the heuristic AI by self-play and writes the tuned configuration
+
+    Args:
+        argv (list): The command line arguments, sys.argv when omitted.
+    """
+    parser = argparse.ArgumentParser(description="Tune Config/points_config.json by parallel self-play (SPSA).")
+    parser.add_argument("--iterations", type=int, default=400, help="Number of SPSA iterations to reach.")
+    parser.add_argument("--pairs", type=int, default=64, help="Game pairs played at each iteration.")
+    parser.add_argument("--processes", type=int, help="Worker processes, one per CPU when omitted.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the perturbations and of the games.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint.")
+    args = parser.parse_args(argv)
+
+    tuner = Tuner(pairs_per_iteration=args.pairs, seed=args.seed)
+    if not args.restart and tuner.load_checkpoint():
+        print(f"Resuming from iteration {tuner.get_iteration()}.")
+
+    tuner.run(args.iterations, args.processes)
+    print(f"Tuned configuration written to {Tuner.OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import random
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Charts are drawn without a display
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from Game import Database, EvaluationCache, GameState, GameWriter, History, Plateau, Variant  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def game_directory(tmp_path, monkeypatch):
+    """Runs every test from a Game directory of its own, like the scripts
+
+    ../config holds a copy of the repository configuration and ../data starts empty, so the
+    relative paths of the game never reach the repository data.
+    """
+    shutil.copytree(os.path.join(ROOT, "Config"), tmp_path / "config")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "Game").mkdir()
+    monkeypatch.chdir(tmp_path / "Game")
+    History._instances.clear()
+    EvaluationCache._instances.clear()
+    yield tmp_path
+    Database.close_writer()
+    History._instances.clear()
+    EvaluationCache._instances.clear()
+
+
+def position(moves=(), starter=1, variant=None):
+    """Returns the state reached by playing columns, alternating the players from the starter"""
+    state = GameState(variant, starter=starter)
+    for col in moves:
+        state.play(col)
+    return state
+
+
+def new_board(moves=(), starter=1, variant=None):
+    """Returns a board on which columns are played, alternating the players from the starter"""
+    variant = variant or Variant.get()
+    plateau = Plateau(variant.rows, variant.columns, variant.connect)
+    plateau.set_player_who_starts(starter)
+    for col in moves:
+        plateau.play(col)
+    return plateau
+
+
+def random_games(count, seed=0, variant=None):
+    """Plays random games to the end, as the rows saved by the game writer (without the id)"""
+    rng = random.Random(seed)
+    variant = variant or Variant.get()
+    rows = []
+    for game in range(count):
+        state = GameState(variant, starter=rng.choice((1, -1)))
+        while state.winner() == 0 and not state.is_full():
+            state.play(rng.choice([col for col in range(variant.columns) if not state.is_column_full(col)]))
+        rows.append([f"2025-{1 + game % 12:02d}-01 10:00:00", state.starter, state.winner(),
+                     state.moves_played(1), state.moves_played(-1), state.shots()])
+    return rows
+
+
+@pytest.fixture
+def stored_games():
+    """Returns a function saving random games to the game data file and returning their rows"""
+    def store(count, seed=0):
+        rows = random_games(count, seed)
+        writer = GameWriter(Database.DATA_FILE)
+        for row in rows:
+            writer.submit(row)
+        writer.close()
+        return rows
+
+    return store
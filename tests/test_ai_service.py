@@ -0,0 +1,73 @@
+import os
+import stat
+import time
+
+from Game import AIClient, AIServer
+
+from conftest import new_board, position
+
+
+class RecordingConnection:
+    """Stands for the connection of a client, recording the answers"""
+    def __init__(self):
+        self.answers = []
+
+    def send(self, answer):
+        self.answers.append(answer)
+
+
+def run_batch(server, requests):
+    """Answers one batch of requests, as (deadline, snapshot) pairs, and returns the answers"""
+    connections = []
+    server._running = True
+    for request_id, (deadline, snapshot) in enumerate(requests):
+        connections.append(RecordingConnection())
+        server._requests.put((deadline, request_id, snapshot, connections[-1]))
+    server._requests.put(None)
+    server._run()
+    return [connection.answers for connection in connections]
+
+
+def test_authkey_is_private_and_stable():
+    key = AIServer.load_authkey()
+    assert len(key) == 32
+    assert stat.S_IMODE(os.stat(AIServer.KEY_FILE).st_mode) == 0o600
+    assert AIServer.load_authkey() == key
+
+
+def test_clients_without_the_key_are_refused():
+    server = AIServer(batch_window=0)
+    assert server.start()
+    try:
+        plateau = new_board([3])
+
+        intruder = AIClient(authkey=b"not the key")
+        assert intruder.best_move(plateau) is None
+        client = AIClient()
+        assert client.best_move(plateau, deadline=5.0) in range(7)
+        client.close()
+    finally:
+        server.stop()
+
+
+def test_cache_is_shared_by_mirrored_positions():
+    server = AIServer()
+    state = position([0, 3, 1])
+    column = server.evaluate(state)
+    assert server.evaluate(position([6, 3, 5])) == state.variant.mirror_column(column)
+    assert server.get_stats()["cache_hits"] == 1
+
+
+def test_batch_evaluates_each_position_once():
+    server = AIServer(batch_window=0)
+    deadline = time.monotonic() + 60
+    state = position([0, 3, 1])
+    mirror = position([6, 3, 5])
+    answers = run_batch(server, [(deadline, state.to_bytes()), (deadline, mirror.to_bytes()),
+                                 (deadline, state.to_bytes()), (0, state.to_bytes()), (deadline, b"\xff")])
+
+    column = answers[0][0][1]
+    assert [answer[0][1] for answer in answers] == [column, state.variant.mirror_column(column), column, None, None]
+    stats = server.get_stats()
+    assert (stats["requests"], stats["batches"], stats["shared"], stats["expired"]) == (5, 1, 2, 1)
+    assert stats["cache_hits"] == 0
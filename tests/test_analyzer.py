@@ -0,0 +1,31 @@
+import math
+
+from Game import Analyzer, Search
+
+
+def test_unscored_move_is_not_recorded_as_perfect(monkeypatch):
+    # The search only scored the center column, the move played is elsewhere
+    monkeypatch.setattr(Search, "search", lambda self: (3, 40, {3: 40}))
+    rows = Analyzer.analyze_game(1, "2025-01-01 10:00:00", 1, [(5, 0)], max_depth=2, node_budget=10)
+
+    assert rows == [[1, "2025-01-01 10:00:00", 0, 1, 0, None, 3, 40, None]]
+
+
+def test_unscored_moves_are_left_out_of_the_statistics():
+    with open(Analyzer.ANALYSIS_FILE, 'w') as analysis_file:
+        analysis_file.write(",".join(Analyzer.COLUMNS) + "\n")
+        analysis_file.write("1,2025-01-01,0,1,3,40,3,40,0\n")
+        analysis_file.write("1,2025-01-01,1,-1,0,,3,10,\n")
+        analysis_file.write("1,2025-01-01,2,1,2,-60,3,40,100\n")
+        # Cut by an interruption: the evaluation is there, not the error
+        analysis_file.write("2,2025-01-02,0,1,3,40,3,40,")
+
+    analysis = Analyzer.load_analysis()
+    assert len(analysis) == 3
+    assert math.isnan(analysis[analysis["ply"] == 1]["error"].iloc[0])
+
+    stats = Analyzer.blunder_statistics(blunder_threshold=50)
+    assert stats.loc["Player", "moves"] == 2
+    assert stats.loc["Player", "average_error"] == 50
+    assert stats.loc["Player", "blunders"] == 1
+    assert stats.loc["IA", "moves"] == 0
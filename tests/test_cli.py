@@ -0,0 +1,40 @@
+import json
+
+import pandas as pd
+
+from Game import cli
+
+
+def test_export_filters_sorts_and_selects_columns(stored_games, capsys):
+    rows = stored_games(24)
+    assert cli.main(["export", "--start", "2025-03-01", "--end", "2025-06-01", "--winner", "ia",
+                     "--columns", "id,date,winner", "--sort", "date:desc", "-o", "games.csv"]) == 0
+
+    df = pd.read_csv("games.csv")
+    assert list(df.columns) == ["id", "date", "winner"]
+    expected = [row for row in rows if "2025-03" <= row[0][:7] <= "2025-06" and row[2] == -1]
+    assert len(df) == len(expected)
+    assert (df["winner"] == -1).all()
+    assert list(df["date"]) == sorted(df["date"], reverse=True)
+    assert "Data exported to: games.csv" in capsys.readouterr().err
+
+
+def test_batch_writes_every_output_from_one_load(stored_games):
+    stored_games(12)
+    assert cli.main(["batch", "--export", "games.json", "--stats", "stats.json", "--stats", "stats.txt"]) == 0
+
+    with open("stats.json") as stats_file:
+        stats = json.load(stats_file)
+    assert stats
+    with open("games.json") as games_file:
+        assert len(json.load(games_file)) == 12
+    with open("stats.txt") as stats_file:
+        assert stats_file.read().strip()
+
+
+def test_exit_codes(stored_games, capsys):
+    assert cli.main(["stats"]) == 1
+    stored_games(3)
+    assert cli.main(["stats", "--last-days", "0"]) == 2
+    assert cli.main(["export", "--sort", "date:sideways", "-o", "-"]) == 2
+    assert "Error" in capsys.readouterr().err
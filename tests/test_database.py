@@ -0,0 +1,32 @@
+import pandas as pd
+
+from Game import Database, Variant
+
+from conftest import new_board
+
+
+def test_classic_games_are_saved_to_the_classic_file():
+    plateau = new_board([3, 3, 4, 4, 5, 5, 6])
+    plateau.set_winner(1)
+    plateau.save_game()
+    Database.flush_games()
+
+    df = pd.read_csv(Database.DATA_FILE)
+    assert len(df) == 1
+    assert Database.data_file(plateau.get_variant()) == Database.DATA_FILE
+
+
+def test_variant_games_are_kept_out_of_the_classic_file():
+    classic = new_board([0, 1])
+    classic.save_game()
+    large = new_board([9, 8, 9], variant=Variant.get(9, 10, 5))
+    large.save_game()
+    Database.flush_games()
+
+    classic_df = pd.read_csv(Database.DATA_FILE)
+    assert len(classic_df) == 1
+    variant_file = Database.data_file(Variant.get(9, 10, 5))
+    assert variant_file == '../data/game_data_9x10x5.csv'
+    variant_df = pd.read_csv(variant_file)
+    assert len(variant_df) == 1
+    assert "(8, 9)" in variant_df["shots"][0]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from Game import Database, GameWriter, Snapshot
+
+from conftest import random_games
+
+
+def store_sorted(count):
+    """Saves random games in chronological order, one per day"""
+    rows = random_games(count)
+    for day, row in enumerate(rows):
+        row[0] = (pd.Timestamp("2025-01-01 10:00:00") + pd.Timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S")
+    writer = GameWriter(Database.DATA_FILE)
+    for row in rows:
+        writer.submit(row)
+    writer.close()
+    return rows
+
+
+def test_sorted_dates_are_found_by_binary_search():
+    store_sorted(60)
+    meta = Snapshot.refresh(Database.DATA_FILE)
+    assert meta["dates_sorted"]
+
+    selection = Snapshot.date_selection(Snapshot.open(), meta, pd.Timestamp("2025-01-10"), pd.Timestamp("2025-01-20"))
+    assert selection == slice(9, 19)
+
+    df = Database.read_history("2025-01-10", "2025-01-20")
+    assert list(df["id"]) == list(range(10, 21))
+    assert df["shots"].iloc[0] == str(Database.read_history()["shots"].iloc[9])
+
+
+def test_unsorted_dates_are_filtered_by_mask(stored_games):
+    stored_games(24)
+    meta = Snapshot.refresh(Database.DATA_FILE)
+    assert not meta["dates_sorted"]
+
+    selection = Snapshot.date_selection(Snapshot.open(), meta, pd.Timestamp("2025-03-01"), pd.Timestamp("2025-04-01"))
+    assert isinstance(selection, np.ndarray)
+
+    df = Database.read_history("2025-03-01", "2025-04-01")
+    full = Database.read_history()
+    expected = full[(full["date"] >= "2025-03-01") & (full["date"] < "2025-04-02")]
+    assert list(df["id"]) == list(expected["id"])
+    assert list(df["shots"]) == list(expected["shots"])
+
+
+def test_an_older_game_appended_turns_binary_search_off():
+    store_sorted(5)
+    assert Snapshot.refresh(Database.DATA_FILE)["dates_sorted"]
+    writer = GameWriter(Database.DATA_FILE)
+    writer.submit(["2024-06-01 10:00:00", *random_games(1)[0][1:]])
+    writer.close()
+    assert not Snapshot.refresh(Database.DATA_FILE)["dates_sorted"]
+    assert len(Database.read_history("2024-01-01", "2024-12-31")) == 1
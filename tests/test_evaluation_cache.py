@@ -0,0 +1,69 @@
+import numpy as np
+
+from Game import EvaluationCache, IA, SelfPlay, Utils, Variant
+
+from conftest import new_board, position
+
+
+def test_threats_are_saved_for_the_next_run():
+    cache = EvaluationCache(Variant.get())
+    cache.store(position([0, 3, 1]), 2, {5, 6})
+    cache.save()
+
+    reopened = EvaluationCache(Variant.get())
+    assert reopened.lookup(position([0, 3, 1])) == (2, {5, 6})
+    assert reopened.lookup(position([6, 3, 5])) == (4, {0, 1})
+    assert reopened.lookup(position([0, 3])) is None
+
+
+def test_move_scores_are_cached_by_position_side_and_weights():
+    points = Utils.load_points_config()
+    plateau = new_board([0, 3, 1])
+    expected = IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False, use_cache=False)
+    assert IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False) == expected
+
+    cache = EvaluationCache.get(Variant.get())
+    scores = cache.lookup_scores(plateau.get_state(), points, -1)
+    assert scores == IA.heuristic_scores(plateau, points, -1)
+    mirrored = cache.lookup_scores(position([6, 3, 5]), points, -1)
+    assert mirrored == {6 - col: score for col, score in scores.items()}
+    assert cache.lookup_scores(plateau.get_state(), points, 1) is None
+    assert cache.lookup_scores(plateau.get_state(), dict(points, immediate_win=1), -1) is None
+
+    cache.save()
+    reopened = EvaluationCache(Variant.get())
+    assert reopened.lookup_scores(plateau.get_state(), points, -1) == scores
+
+
+def test_files_of_an_older_format_are_ignored():
+    cache = EvaluationCache(Variant.get())
+    np.save(cache._path, np.zeros(3, dtype=[("key", "<u8"), ("move", "i1"), ("losing", "<u4"), ("stamp", "<u4")]))
+    assert len(EvaluationCache(Variant.get())) == 0
+
+
+def test_self_play_leaves_the_cache_alone():
+    config = {"engine": "heuristic"}
+    SelfPlay.play_game(config, config, seed=1, opening=[3, 3, 2, 4])
+    assert len(EvaluationCache.get(Variant.get())) == 0
+
+
+def test_entries_added_during_a_save_are_kept(monkeypatch):
+    cache = EvaluationCache(Variant.get())
+    cache.store(position([0, 3, 1]), 2, {5, 6})
+    write = np.save
+
+    def store_while_writing(file, entries):
+        # The ponderer adds an entry and replaces a pending one while the file is merged
+        cache.store(position([3]), None, {0})
+        cache.store(position([0, 3, 1]), None, set())
+        write(file, entries)
+    monkeypatch.setattr(np, "save", store_while_writing)
+    cache.save()
+    monkeypatch.setattr(np, "save", write)
+
+    assert cache.lookup(position([3])) == (None, {0})
+    assert cache.lookup(position([0, 3, 1])) == (None, set())
+    cache.save()
+    reopened = EvaluationCache(Variant.get())
+    assert reopened.lookup(position([3])) == (None, {0})
+    assert reopened.lookup(position([0, 3, 1])) == (None, set())
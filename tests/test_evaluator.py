@@ -0,0 +1,55 @@
+from Game import Evaluator, GameState, Utils, Variant
+
+from conftest import position, random_games
+
+
+def test_incremental_scores_match_a_rebuilt_evaluator():
+    points = Utils.load_points_config()
+    for variant in (Variant.get(), Variant.get(9, 10, 5)):
+        for _, starter, _, _, _, shots in random_games(20, seed=1, variant=variant):
+            state = position(starter=starter, variant=variant)
+            evaluator = Evaluator(points, starter, variant)
+            for _, col in shots:
+                player = state.player_to_move()
+                evaluator.add(state.play(col), col, player)
+
+                rebuilt = Evaluator.from_board(state.to_array(), points, starter, variant)
+                assert (evaluator.score(1), evaluator.score(-1)) == (rebuilt.score(1), rebuilt.score(-1))
+                assert evaluator.winner() == rebuilt.winner() == state.winner()
+
+
+def test_removing_tokens_restores_the_scores():
+    points = Utils.load_points_config()
+    evaluator = Evaluator(points)
+    state = GameState()
+    history = []
+    for col in [3, 3, 2, 4, 4, 2, 5]:
+        history.append((evaluator.score(1), evaluator.score(-1)))
+        player = state.player_to_move()
+        evaluator.add(state.play(col), col, player)
+    while state.moves:
+        row, col = state.undo()
+        evaluator.remove(row, col, state.player_to_move())
+        assert (evaluator.score(1), evaluator.score(-1)) == history.pop()
+    assert evaluator.winner() == 0
+
+
+def test_winning_cells_match_a_board_scan():
+    points = Utils.load_points_config()
+    for _, starter, _, _, _, shots in random_games(30, seed=2):
+        state = position(starter=starter)
+        for _, col in shots:
+            state.play(col)
+            board = state.to_array()
+            evaluator = Evaluator.from_board(board, points, starter)
+            assert evaluator.winner() == Utils.get_player_to_win(board)
+            if evaluator.winner():
+                continue
+            for player in (1, -1):
+                for next_col in range(7):
+                    if state.is_column_full(next_col):
+                        continue
+                    row = state.row_to_play(next_col)
+                    board[row][next_col] = player
+                    assert evaluator.is_winning_cell(row, next_col, player) == (Utils.get_player_to_win(board) == player)
+                    board[row][next_col] = 0
@@ -0,0 +1,84 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from Game import Database, FileLock
+
+
+def locked_later(path, shared, events):
+    """Takes a lock from another thread, recording when it got it"""
+    def take():
+        with FileLock(path, shared=shared):
+            events.append("taken")
+    thread = threading.Thread(target=take)
+    thread.start()
+    return thread
+
+
+def test_exclusive_lock_waits_for_the_release():
+    path = "../data/protected.csv"
+    events = []
+    with FileLock(path):
+        thread = locked_later(path, False, events)
+        thread.join(0.2)
+        assert events == []
+        events.append("released")
+    thread.join(5)
+    assert events == ["released", "taken"]
+    assert os.path.exists(path + ".lock")
+
+
+def test_shared_locks_coexist():
+    path = "../data/protected.csv"
+    events = []
+    with FileLock(path, shared=True):
+        thread = locked_later(path, True, events)
+        thread.join(5)
+        assert events == ["taken"]
+
+        # A writer waits for the readers
+        thread = locked_later(path, False, events)
+        thread.join(0.2)
+        assert events == ["taken"]
+    thread.join(5)
+    assert events == ["taken", "taken"]
+
+
+def test_release_without_acquire_does_nothing():
+    lock = FileLock("../data/protected.csv")
+    lock.release()
+    with lock:
+        pass
+    lock.release()
+
+
+def test_deletion_rewrites_the_file_atomically(stored_games):
+    stored_games(10)
+    df = pd.read_csv(Database.DATA_FILE)
+    before = os.stat(Database.DATA_FILE).st_ino
+
+    Database.delete_and_update_indices(df[df["id"].isin([2, 5])])
+
+    remaining = pd.read_csv(Database.DATA_FILE)
+    assert list(remaining["id"]) == list(range(1, 9))
+    assert list(remaining["shots"]) == list(df[~df["id"].isin([2, 5])]["shots"])
+    assert os.stat(Database.DATA_FILE).st_ino != before
+    directory = os.path.dirname(Database.DATA_FILE)
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_failed_rewrite_keeps_the_file(stored_games, monkeypatch):
+    stored_games(3)
+    content = open(Database.DATA_FILE).read()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(pd.DataFrame, "to_csv", fail)
+    with pytest.raises(OSError):
+        Database._replace_csv(pd.DataFrame(columns=["id"]))
+
+    assert open(Database.DATA_FILE).read() == content
+    directory = os.path.dirname(Database.DATA_FILE)
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
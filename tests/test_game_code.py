@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from Game import Database, GameCode, Variant
+
+from conftest import random_games
+
+
+def test_codes_round_trip_on_every_board():
+    for rows, columns, connect in ((6, 7, 4), (9, 10, 5)):
+        for row in random_games(20, seed=columns, variant=Variant.get(rows, columns, connect)):
+            shots = row[-1]
+            code = GameCode.encode(shots, columns)
+            assert GameCode.length(code) == len(shots)
+            assert GameCode.decode(code, rows, columns) == shots
+            assert GameCode.from_bytes(GameCode.to_bytes(code)) == code
+
+
+def test_classic_game_fits_in_17_bytes():
+    code = GameCode.from_columns([6] * 6 * 7)
+    assert len(GameCode.to_bytes(code)) <= 17
+    assert GameCode.bits_per_move(7) == 3 and GameCode.bits_per_move(10) == 4
+
+
+def test_prefixes():
+    code = GameCode.from_columns([3, 3, 2, 4, 1])
+    assert GameCode.prefix(code, 2) == GameCode.from_columns([3, 3])
+    assert GameCode.is_prefix(GameCode.from_columns([3, 3, 2]), code)
+    assert not GameCode.is_prefix(GameCode.from_columns([3, 2]), code)
+    assert GameCode.common_prefix_length(code, GameCode.from_columns([3, 3, 2, 5])) == 3
+    assert GameCode.common_prefix_length(code, GameCode.from_columns([0])) == 0
+    assert GameCode.common_prefix_length(code, code) == 5
+
+
+def test_invalid_games_are_rejected():
+    with pytest.raises(ValueError):
+        GameCode.from_columns([7])
+    with pytest.raises(ValueError):
+        GameCode.from_columns([0] * (GameCode.MAX_MOVES + 1))
+    with pytest.raises(ValueError):
+        GameCode.decode(GameCode.from_columns([0] * 7))
+
+
+def test_repeated_games_are_dropped_once_per_starter():
+    shots = str([(5, 3), (4, 3), (5, 2)])
+    df = pd.DataFrame({"id": [1, 2, 3, 4], "player_who_starts": [1, 1, -1, 1],
+                       "shots": [shots, shots, shots, "not shots"]})
+    assert list(Database.drop_duplicate_games(df)["id"]) == [1, 3, 4]
@@ -0,0 +1,87 @@
+import pickle
+
+import pytest
+
+from Game import GameState, Variant
+
+from conftest import new_board, position
+
+
+def test_play_and_undo_keep_the_board_and_hashes():
+    state = GameState(starter=-1)
+    history = []
+    for col in [3, 2, 3, 4, 3, 0, 6, 6, 5]:
+        history.append((state.position, state.mask, bytes(state.heights), state.hash, state.mirror_hash))
+        row = state.play(col)
+        assert state.shots()[-1] == (row, col)
+    assert state.moves_played(-1) == 5 and state.moves_played(1) == 4
+    assert state.player_to_move() == 1
+
+    for col in [5, 6, 6, 0, 3, 4, 3, 2, 3]:
+        assert state.undo()[1] == col
+        assert (state.position, state.mask, bytes(state.heights), state.hash, state.mirror_hash) == history.pop()
+    assert state.mask == 0 and state.hash == 0
+    with pytest.raises(IndexError):
+        state.undo()
+
+
+def test_full_column_is_refused():
+    state = position([0] * 6)
+    assert state.is_column_full(0)
+    assert state.row_to_play(0) == -1
+    with pytest.raises(ValueError):
+        state.play(0)
+
+
+def test_winner_and_winning_moves():
+    state = position([0, 6, 1, 6, 2])
+    assert state.winning_moves(1) == [3]
+    assert state.winning_moves(-1) == []
+    assert state.winner() == 0
+    state.play(5)
+    state.play(3)
+    assert state.winner() == 1
+    assert state.has_won(1) and not state.has_won(-1)
+
+    # Lines never wrap from the top of a column to the bottom of the next
+    wrapped = position([1, 0, 2, 0, 2, 0, 0, 6, 0, 6, 0])
+    assert wrapped.cell(0, 0) == wrapped.cell(5, 1) == 1
+    assert wrapped.winner() == 0
+
+
+def test_diagonal_win_on_a_large_variant():
+    variant = Variant.get(9, 10, 5)
+    state = position([0, 1, 1, 2, 2, 3, 2, 3, 3, 4, 3, 4, 4, 5, 4, 9, 4], variant=variant)
+    assert state.winner() == 1
+    assert state.to_array()[variant.rows - 5][4] == 1
+
+
+def test_clone_is_independent():
+    state = position([3, 3, 2])
+    copy = state.clone()
+    copy.play(4)
+    assert len(state.moves) == 3 and len(copy.moves) == 4
+    assert state.heights[4] == 0
+    copy.undo()
+    assert (copy.position, copy.mask, copy.hash, copy.mirror_hash) == (state.position, state.mask, state.hash,
+                                                                       state.mirror_hash)
+
+
+def test_pickled_state_shares_the_variant():
+    state = position([3, 3, 2, 4], starter=-1, variant=Variant.get(7, 8, 4))
+    restored = pickle.loads(pickle.dumps(state))
+    assert restored.variant is state.variant
+    assert restored.shots() == state.shots()
+    assert (restored.position, restored.mask, restored.starter, restored.hash) == (state.position, state.mask,
+                                                                                   state.starter, state.hash)
+    restored.play(0)
+    assert len(state.moves) == 4
+
+
+def test_plateau_wraps_the_state():
+    plateau = new_board([3, 2, 3], starter=-1)
+    state = plateau.get_state()
+    assert state.moves == bytearray([3, 2, 3])
+    assert (plateau.get_plateau() == state.to_array()).all()
+    assert plateau.get_hash() == state.hash
+    assert plateau.get_player_to_move() == state.player_to_move() == 1
@@ -0,0 +1,94 @@
+import time
+from multiprocessing import get_context
+
+import pandas as pd
+import pytest
+
+from Game import Database, GameWriter
+
+from conftest import random_games
+
+
+def wait_for_games(count, timeout=5.0):
+    """Waits until the data file holds a number of games"""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            if len(pd.read_csv(Database.DATA_FILE)) >= count:
+                return True
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def write_games(seed):
+    """Saves games from a process of its own, in small batches"""
+    writer = GameWriter(Database.DATA_FILE, batch_size=7, flush_interval=0.01)
+    for row in random_games(40, seed):
+        writer.submit(row)
+    writer.close()
+
+
+def test_games_wait_for_a_full_batch():
+    writer = GameWriter(Database.DATA_FILE, batch_size=3, flush_interval=60)
+    rows = random_games(3)
+    writer.submit(rows[0])
+    writer.submit(rows[1])
+    time.sleep(0.1)
+    assert not wait_for_games(1, timeout=0)
+
+    writer.submit(rows[2])
+    assert wait_for_games(3)
+    df = pd.read_csv(Database.DATA_FILE)
+    assert list(df.columns) == GameWriter.COLUMNS
+    assert list(df["id"]) == [1, 2, 3]
+    assert list(df["shots"]) == [str(row[-1]) for row in rows]
+    writer.close()
+
+
+def test_waiting_games_are_written_after_the_flush_interval():
+    writer = GameWriter(Database.DATA_FILE, batch_size=100, flush_interval=0.05)
+    writer.submit(random_games(1)[0])
+    assert wait_for_games(1)
+    writer.close()
+
+
+def test_close_writes_the_waiting_games_and_refuses_new_ones():
+    writer = GameWriter(Database.DATA_FILE, batch_size=100, flush_interval=60, fsync="close")
+    for row in random_games(5):
+        writer.submit(row)
+    writer.close()
+    assert len(pd.read_csv(Database.DATA_FILE)) == 5
+    with pytest.raises(RuntimeError):
+        writer.submit(random_games(1)[0])
+    with pytest.raises(ValueError):
+        GameWriter(Database.DATA_FILE, fsync="sometimes")
+
+
+def test_ids_continue_after_a_cut_line():
+    writer = GameWriter(Database.DATA_FILE)
+    writer.submit(random_games(1)[0])
+    writer.flush()
+    with open(Database.DATA_FILE, 'a') as data_file:
+        data_file.write("2,2025-01-01 10:00:00,1")
+    writer.submit(random_games(1, seed=1)[0])
+    writer.close()
+
+    lines = open(Database.DATA_FILE).read().splitlines()
+    assert lines[-1].startswith("3,")
+    assert lines[-2] == "2,2025-01-01 10:00:00,1"
+
+
+def test_processes_share_the_file_with_consecutive_ids():
+    context = get_context("fork")
+    processes = [context.Process(target=write_games, args=(seed,)) for seed in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    df = pd.read_csv(Database.DATA_FILE)
+    assert list(df["id"]) == list(range(1, 161))
+    assert df["shots"].str.startswith("[(").all()
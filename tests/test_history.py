@@ -0,0 +1,63 @@
+import pytest
+
+from Game import Database, GameState, GameWriter, History, Variant
+
+
+def total_counts(history):
+    return int(history._counts.sum())
+
+
+def test_table_grows_past_its_starting_capacity(stored_games):
+    rows = stored_games(150)
+
+    history = History.get()
+    capacity = len(history._counts)
+    history.refresh(Database.DATA_FILE)
+
+    assert len(history._index) > capacity
+    assert total_counts(history) == sum(len(row[-1]) for row in rows)
+    openings = history.lookup([], 1).sum() + history.lookup([], -1).sum()
+    assert openings == len(rows)
+
+
+def test_new_games_are_added_incrementally(stored_games):
+    first = stored_games(80, seed=1)
+    history = History.get()
+    history.refresh(Database.DATA_FILE)
+    second = stored_games(80, seed=2)
+    history.refresh(Database.DATA_FILE)
+
+    assert total_counts(history) == sum(len(row[-1]) for row in first + second)
+
+
+def test_failed_refresh_does_not_count_games_twice(monkeypatch, stored_games):
+    rows = stored_games(40)
+    history = History.get()
+    add_games = History._add_games
+
+    def failing_add_games(self, arrays, start, end):
+        add_games(self, arrays, start, end)
+        raise KeyError("interrupted")
+
+    monkeypatch.setattr(History, "_add_games", failing_add_games)
+    with pytest.raises(KeyError):
+        history.refresh(Database.DATA_FILE)
+    monkeypatch.setattr(History, "_add_games", add_games)
+    history.refresh(Database.DATA_FILE)
+
+    assert total_counts(history) == sum(len(row[-1]) for row in rows)
+
+
+def test_lookup_folds_mirrored_positions():
+    state = GameState(Variant.get(), starter=1)
+    for col in [0, 3, 0, 3, 0, 3, 0]:
+        state.play(col)
+    writer = GameWriter(Database.DATA_FILE)
+    writer.submit(["2025-01-01 10:00:00", 1, state.winner(), 4, 3, state.shots()])
+    writer.close()
+    history = History.get()
+    history.refresh(Database.DATA_FILE)
+
+    mirrored = [(row, 6 - col) for row, col in state.shots()]
+    assert history.lookup(mirrored[:2], 1).tolist()[6] == [1, 0, 0]
+    assert history.lookup(state.shots()[:2], 1).tolist()[0] == [1, 0, 0]
@@ -0,0 +1,32 @@
+from Game import IA, MCTS
+
+from conftest import new_board
+
+
+def test_search_finds_the_winning_move():
+    # The AI (to move) completes its column
+    plateau = new_board([0, 6, 1, 6, 0, 6, 1])
+    assert MCTS(plateau, time_budget=0.3, batch_size=16, seed=1).search() == 6
+    assert len(plateau.get_shots()) == 7
+
+
+def test_search_without_time_returns_none():
+    plateau = new_board([3])
+    assert MCTS(plateau, time_budget=0).search() is None
+    assert plateau.get_shots() == [(5, 3)]
+
+
+def test_search_skips_excluded_columns():
+    plateau = new_board([3])
+    excluded = {0, 1, 2, 3, 4, 5}
+    assert MCTS(plateau, time_budget=0.1, batch_size=8, seed=2).search(excluded=excluded) == 6
+    # Every playable column excluded: all of them are searched
+    assert MCTS(plateau, time_budget=0.1, batch_size=8, seed=2).search(excluded=set(range(7))) is not None
+
+
+def test_mcts_choice_falls_back_to_the_heuristic_move():
+    plateau = new_board([3])
+    expected = IA.best_move(IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False), {3})
+
+    IA.mcts_choice(plateau, {"engine": "mcts", "mcts_time_budget": 0}, {3})
+    assert plateau.get_shots()[-1] == expected
@@ -0,0 +1,55 @@
+from Game import Database, GameState, History, Variant
+
+from conftest import new_board, position
+
+
+def mirrored(moves, variant):
+    return [variant.mirror_column(col) for col in moves]
+
+
+def test_mirrored_positions_share_their_canonical_hash():
+    for variant in (Variant.get(), Variant.get(9, 10, 5)):
+        moves = [0, 1, 1, 2, 5, 2]
+        state, mirror = GameState(variant), GameState(variant)
+        for col, mirror_col in zip(moves, mirrored(moves, variant)):
+            state.play(col)
+            mirror.play(mirror_col)
+            key, is_mirrored = state.canonical_hash()
+            mirror_key, mirror_is_mirrored = mirror.canonical_hash()
+            assert key == mirror_key
+            assert is_mirrored != mirror_is_mirrored or state.hash == state.mirror_hash
+
+
+def test_symmetric_positions_are_not_mirrored():
+    state = GameState()
+    for col in [3, 3, 3, 2, 4]:
+        state.play(col)
+    assert state.hash != state.mirror_hash
+    state.undo()
+    state.undo()
+    assert state.hash == state.mirror_hash
+    assert state.canonical_hash() == (state.hash, False)
+
+
+def test_plateau_and_history_fold_mirrors(stored_games):
+    plateau = new_board([0])
+    state = position([6])
+    assert plateau.get_canonical_hash()[0] == state.canonical_hash()[0]
+
+    rows = stored_games(40)
+    history = History.get()
+    history.refresh(Database.DATA_FILE)
+    variant = Variant.get()
+    for _, starter, _, _, _, game_shots in rows:
+        for plies in (1, 2, 3):
+            shots = game_shots[:plies]
+            mirror_shots = [(row, variant.mirror_column(col)) for row, col in shots]
+            player = starter if plies % 2 == 0 else -starter
+            counts = history.lookup(shots, player)
+            state = GameState(starter=starter)
+            for _, col in shots:
+                state.play(col)
+            # A position which is its own mirror keeps its columns
+            if state.hash != state.mirror_hash:
+                counts = counts[::-1]
+            assert (counts == history.lookup(mirror_shots, player)).all()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from Game import Variant
+
+from conftest import new_board
+
+
+def board_state(plateau):
+    evaluator = plateau.get_evaluator()
+    return (plateau.get_plateau().tolist(), list(plateau.get_shots()), plateau.get_hash(),
+            plateau.get_player_to_move(), evaluator.score(1), evaluator.score(-1), evaluator.winner())
+
+
+def test_undo_restores_the_board_move_after_move():
+    plateau = new_board(starter=-1)
+    states = []
+    for col in [3, 2, 3, 4, 3, 0, 6, 6, 5]:
+        states.append(board_state(plateau))
+        row = plateau.play(col)
+        assert plateau.get_shots()[-1] == (row, col)
+    while states:
+        plateau.undo()
+        assert board_state(plateau) == states.pop()
+    assert not plateau.get_plateau().any()
+
+
+def test_play_fills_columns_from_the_bottom():
+    plateau = new_board()
+    rows = [plateau.play(0) for _ in range(6)]
+    assert rows == [5, 4, 3, 2, 1, 0]
+    assert plateau.is_column_full(0)
+    assert plateau.get_row_to_play(0) == -1
+    with pytest.raises(ValueError):
+        plateau.play(0)
+    assert np.array_equal(plateau.get_plateau()[:, 0], [-1, 1, -1, 1, -1, 1])
+    assert (plateau.get_shots_played_player(), plateau.get_shots_played_ia()) == (3, 3)
+
+
+def test_undo_without_moves_raises():
+    with pytest.raises(IndexError):
+        new_board().undo()
+
+
+def test_clone_and_set_position_are_independent():
+    plateau = new_board()
+    for col in [3, 3, 4]:
+        plateau.play(col)
+    copy = plateau.clone()
+    copy.play(5)
+    assert len(plateau.get_shots()) == 3
+
+    other = new_board(starter=-1, variant=Variant.get(9, 10, 5))
+    other.play(0)
+    other.set_position(plateau.get_state())
+    assert board_state(other) == board_state(plateau)
@@ -0,0 +1,75 @@
+import threading
+
+from Game import IA, Ponder, Variant
+
+from conftest import new_board, position
+
+
+def test_set_position_replays_only_the_moves_that_differ():
+    board = new_board([3, 3, 2])
+    state = position([3, 3, 4, 4])
+    board.set_position(state)
+    assert bytes(board.get_state().moves) == bytes(state.moves)
+    assert board.get_hash() == state.hash
+    assert board.get_evaluator().winner() == 0
+
+    other = position([9], starter=-1, variant=Variant.get(9, 10, 5))
+    board.set_position(other)
+    assert board.get_variant() is other.variant
+    assert board.get_player_who_starts() == -1
+    assert board.get_shots() == [(8, 9)]
+
+
+def test_ponder_evaluates_every_reply_on_its_own_board():
+    plateau = new_board([3, 3])
+
+    ponder = Ponder()
+    ponder.start(plateau)
+    ponder._thread.join()
+
+    # The game board is left as it was
+    assert plateau.get_shots() == [(5, 3), (4, 3)]
+    plateau.play(2)
+    expected = IA.evaluate_moves(plateau, IA.generate_possible_moves(plateau), verbose=False)
+    assert ponder.lookup(plateau) == expected
+
+
+def test_stop_waits_for_the_thread(monkeypatch):
+    evaluating = threading.Event()
+    release = threading.Event()
+
+    def slow_evaluation(board, moves, verbose=True):
+        evaluating.set()
+        release.wait(5)
+        return {move: 0 for move in moves}
+
+    monkeypatch.setattr(IA, "evaluate_moves", slow_evaluation)
+    plateau = new_board()
+
+    ponder = Ponder()
+    ponder.start(plateau)
+    thread = ponder._thread
+    assert evaluating.wait(5)
+    threading.Timer(0.05, release.set).start()
+    ponder.stop()
+
+    assert not thread.is_alive()
+    # The evaluation computed while stopping is discarded
+    assert ponder._cache == {}
+
+
+def test_a_thread_still_busy_keeps_its_board(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(IA, "evaluate_moves", lambda board, moves, verbose=True: release.wait(5) and {})
+    plateau = new_board()
+
+    ponder = Ponder()
+    ponder.start(plateau)
+    board = ponder._board
+    ponder.stop(timeout=0.01)
+    release.set()
+
+    assert ponder._board is None
+    ponder.start(plateau)
+    assert ponder._board is not board
+    ponder.stop()
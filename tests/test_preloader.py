@@ -0,0 +1,56 @@
+import json
+import os
+import threading
+
+from Game import EvaluationCache, History, Preloader, Utils, Variant
+
+
+def test_configuration_is_parsed_once_until_it_changes(monkeypatch):
+    reads = []
+    load = json.load
+    monkeypatch.setattr(json, "load", lambda *args, **kwargs: reads.append(1) or load(*args, **kwargs))
+
+    config = Utils.load_points_config()
+    config["immediate_win"] = -1
+    assert Utils.load_points_config()["immediate_win"] != -1
+    assert len(reads) == 1
+
+    path = '../config/points_config.json'
+    with open(path, 'w') as json_file:
+        json.dump(dict(config, immediate_win=12345), json_file)
+    os.utime(path, ns=(0, 0))
+    assert Utils.load_points_config()["immediate_win"] == 12345
+    assert len(reads) == 2
+
+
+def test_missing_configuration_falls_back():
+    os.remove('../config/engine_config.json')
+    assert Utils.load_engine_config() == {"engine": "heuristic"}
+
+
+def test_singletons_are_created_once_across_threads():
+    Variant._instances.pop((5, 6, 4), None)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def get():
+        barrier.wait()
+        variant = Variant.get(5, 6, 4)
+        results.append((variant, History.get(variant), EvaluationCache.get(variant)))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == 1
+
+
+def test_preloader_loads_everything_in_the_background(stored_games):
+    stored_games(5)
+    preloader = Preloader()
+    preloader.start()
+    preloader.wait(30)
+    assert preloader.is_done()
+    assert Variant.get() in EvaluationCache._instances
+    assert History.get()._games == 5
@@ -0,0 +1,38 @@
+import os
+
+from Game import Plateau, RenderCache
+
+
+def test_report_is_vector_and_cached(stored_games, monkeypatch, tmp_path):
+    stored_games(30)
+    report = Plateau.generate_pdf_report(str(tmp_path / "report.pdf"))
+
+    with open(report, 'rb') as report_file:
+        content = report_file.read()
+    assert content.startswith(b"%PDF")
+    assert b"/Subtype /Image" not in content
+
+    # Unchanged data: the report is copied from the cache, without loading the games
+    monkeypatch.setattr(Plateau, "load_data", lambda: (_ for _ in ()).throw(AssertionError("data loaded")))
+    copy = Plateau.generate_pdf_report(str(tmp_path / "copy.pdf"))
+    with open(copy, 'rb') as copy_file:
+        assert copy_file.read() == content
+
+
+def test_new_games_change_the_report(stored_games, tmp_path):
+    stored_games(10)
+    Plateau.generate_pdf_report(str(tmp_path / "first.pdf"))
+    stored_games(10, seed=1)
+    Plateau.generate_pdf_report(str(tmp_path / "second.pdf"))
+
+    assert len(os.listdir(RenderCache.CACHE_DIR)) == 2
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(RenderCache, "MAX_ENTRIES", 2)
+    for index in range(3):
+        RenderCache.put(RenderCache.key("report", str(index)), b"%PDF")
+        os.utime(RenderCache.get(RenderCache.key("report", str(index))), ns=(index, index))
+
+    assert RenderCache.get(RenderCache.key("report", "0")) is None
+    assert RenderCache.get(RenderCache.key("report", "2")) is not None
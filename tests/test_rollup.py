@@ -0,0 +1,53 @@
+import json
+import os
+
+import pandas as pd
+
+from Game import Database, GameWriter, Rollup
+
+
+def expected_table(period):
+    return Rollup.aggregate(pd.read_csv(Database.DATA_FILE), period)
+
+
+def test_aggregate_counts_each_month(stored_games):
+    rows = stored_games(24)
+    table = Rollup.aggregate(pd.read_csv(Database.DATA_FILE), "monthly")
+
+    assert len(table) == 12
+    assert (table["games"] == 2).all()
+    assert table["player_wins"].sum() == sum(row[2] == 1 for row in rows)
+    assert table["ia_wins"].sum() == sum(row[2] == -1 for row in rows)
+    assert table["draws"].sum() == sum(row[2] == 0 for row in rows)
+    assert table["starter_wins"].sum() == sum(row[2] == row[1] for row in rows)
+    assert table["total_moves"].sum() == sum(row[3] + row[4] for row in rows)
+    assert Rollup.aggregate(pd.DataFrame(columns=GameWriter.COLUMNS)).empty
+
+
+def test_table_is_rebuilt_then_kept_up_to_date(stored_games):
+    stored_games(12)
+    pd.testing.assert_frame_equal(Rollup.table(Database.DATA_FILE, "daily"), expected_table("daily"),
+                                  check_freq=False, check_dtype=False)
+    assert os.path.exists(Rollup.ROLLUP_FILE)
+
+    # The games saved next are added by the writer, without a rebuild
+    stored_games(12, seed=1)
+    rollups = json.load(open(Rollup.ROLLUP_FILE))
+    assert rollups["size"] == os.path.getsize(Database.DATA_FILE)
+    assert sum(bucket[0] for bucket in rollups["monthly"].values()) == 24
+    pd.testing.assert_frame_equal(Rollup.table(Database.DATA_FILE, "monthly"), expected_table("monthly"),
+                                  check_freq=False, check_dtype=False)
+
+
+def test_tables_of_a_changed_file_are_rebuilt(stored_games):
+    stored_games(12)
+    Rollup.table(Database.DATA_FILE)
+    df = pd.read_csv(Database.DATA_FILE)
+    Database.delete_and_update_indices(df[df["id"] <= 3])
+
+    # The tables no longer describe the file: the writer leaves them to the next reader
+    stored_games(2, seed=1)
+    assert json.load(open(Rollup.ROLLUP_FILE))["size"] != os.path.getsize(Database.DATA_FILE)
+    table = Rollup.table(Database.DATA_FILE, "monthly")
+    assert table["games"].sum() == 11
+    pd.testing.assert_frame_equal(table, expected_table("monthly"), check_freq=False, check_dtype=False)
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from Game import SelfPlay, ThreatSearch, Tournament, Tuner
+
+from conftest import new_board, position
+
+
+class RecordingPool:
+    """Stands for the process pool, recording the tasks and splitting every pair"""
+    def __init__(self):
+        self.tasks = []
+
+    def imap_unordered(self, function, tasks):
+        self.tasks.extend(tasks)
+        return [(1, 0, 1) for _ in tasks]
+
+
+def test_opening_book_holds_distinct_balanced_positions():
+    book = SelfPlay.opening_book(4)
+    assert len(book) > 64
+    assert all(len(opening) == 4 for opening in book)
+
+    states = [position(opening) for opening in book]
+    assert len({state.canonical_hash()[0] for state in states}) == len(book)
+    for state in states:
+        assert not state.winning_moves(1) and not state.winning_moves(-1)
+        assert ThreatSearch(state).forced_win() is None
+    assert SelfPlay.opening_book(4) is book
+
+
+def test_draw_openings_without_replacement():
+    openings = SelfPlay.draw_openings(50, seed=3, plies=4)
+    assert len({bytes(opening) for opening in openings}) == 50
+    assert openings == SelfPlay.draw_openings(50, seed=3, plies=4)
+    # The book runs out
+    assert len(SelfPlay.draw_openings(10 ** 6, seed=3, plies=2)) == len(SelfPlay.opening_book(2))
+
+
+def test_play_game_starts_from_the_opening():
+    config = {"engine": "heuristic"}
+    wins, draws, losses = SelfPlay.play_pair(config, config, seed=1, opening=[3, 3, 2, 4])
+    assert wins + draws + losses == 2
+
+
+@pytest.mark.parametrize("engine", ["heuristic", "mcts"])
+def test_moves_go_through_the_threat_search(engine):
+    config = {"engine": engine, "mcts_time_budget": 0.05}
+    rng = random.Random(0)
+    assert SelfPlay.choose_column(new_board([2, 6, 3, 6]), config, rng) == 4
+    for _ in range(5):
+        assert SelfPlay.choose_column(new_board([2, 6, 3]), config, rng) in (1, 4)
+
+
+def test_tuner_plays_each_pair_from_its_own_opening():
+    tuner = Tuner(pairs_per_iteration=16, opening_plies=4, seed=5)
+    pool = RecordingPool()
+    assert tuner.step(pool) == 0.5
+
+    openings = [bytes(task[3]) for task in pool.tasks]
+    assert len(openings) == 16
+    assert len(set(openings)) == 16
+    assert tuner.get_iteration() == 1
+
+
+def test_tournament_pairs_never_share_an_opening():
+    config = {"engine": "heuristic"}
+    tournament = Tournament(config, config, opening_plies=4, seed=2)
+    tasks = tournament.tasks(100)
+    assert len({bytes(task[3]) for task in tasks}) == 100
+    assert tasks == tournament.tasks(100)
+
+    # The book runs out: the match is cut to the size of the book
+    assert len(Tournament(config, config, opening_plies=1).tasks(10)) == len(SelfPlay.opening_book(1))
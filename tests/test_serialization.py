@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from Game import GameCode, GameState, Plateau, Variant
+
+from conftest import new_board, position, random_games
+
+
+def header(version=GameState.SNAPSHOT_VERSION, starter=1):
+    return GameState.SNAPSHOT_HEADER.pack(version, 6, 7, 4, starter)
+
+
+def test_snapshots_round_trip_within_22_bytes():
+    for starter, winner, _, _, shots in [row[1:] for row in random_games(30)]:
+        state = position([col for _, col in shots], starter)
+        data = state.to_bytes()
+        assert len(data) <= 22
+        restored = GameState.from_bytes(data)
+        assert restored.moves == state.moves
+        assert (restored.starter, restored.hash, restored.winner()) == (state.starter, state.hash, winner)
+
+    empty = GameState.from_bytes(GameState(starter=-1).to_bytes())
+    assert (len(empty.moves), empty.starter) == (0, -1)
+
+
+def test_snapshots_keep_the_variant():
+    variant = Variant.get(9, 10, 5)
+    state = position([9, 8, 9, 0], starter=-1, variant=variant)
+    restored = GameState.from_bytes(state.to_bytes())
+    assert restored.variant is variant
+    assert restored.shots() == state.shots()
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    header(),
+    header(version=2) + b"\x00",
+    header(starter=0) + b"\x00",
+    header() + GameCode.to_bytes(GameCode.from_columns([7], 10)),
+    header() + GameCode.to_bytes(GameCode.from_columns([0] * 7)),
+])
+def test_invalid_snapshots_are_refused(data):
+    with pytest.raises(ValueError):
+        GameState.from_bytes(data)
+
+
+def test_plateau_restores_its_snapshot():
+    plateau = new_board([3, 2, 3, 4], starter=-1)
+
+    restored = Plateau()
+    restored.restore(plateau.snapshot())
+    assert restored.get_shots() == plateau.get_shots()
+    assert restored.get_player_who_starts() == -1
+    assert restored.get_current_player() == restored.get_player_to_move() == -1
+
+
+def test_suspended_game_is_resumed_once():
+    plateau = new_board([7, 0, 7], variant=Variant.get(7, 8, 4))
+    plateau.suspend_game()
+    assert plateau.is_suspended()
+    assert os.path.exists(Plateau.SUSPENDED_GAME_FILE)
+
+    resumed = Plateau()
+    assert resumed.resume_suspended_game()
+    assert resumed.get_variant() is Variant.get(7, 8, 4)
+    assert resumed.get_shots() == plateau.get_shots()
+    assert not os.path.exists(Plateau.SUSPENDED_GAME_FILE)
+    assert not Plateau().resume_suspended_game()
+
+
+def test_unreadable_suspended_game_is_kept():
+    with open(Plateau.SUSPENDED_GAME_FILE, 'wb') as snapshot_file:
+        snapshot_file.write(header(version=9) + b"\x00")
+    assert not Plateau().resume_suspended_game()
+    assert os.path.exists(Plateau.SUSPENDED_GAME_FILE)
@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+
+from Game import Database, GameCode, Snapshot
+
+
+def test_snapshot_matches_the_csv(stored_games):
+    rows = stored_games(30)
+    df = Snapshot.load_dataframe(Database.DATA_FILE, with_codes=True)
+    csv = pd.read_csv(Database.DATA_FILE)
+
+    assert list(df["id"]) == list(csv["id"])
+    assert list(df["shots"]) == list(csv["shots"])
+    assert list(df["winner"]) == [row[2] for row in rows]
+    assert list(df["date"]) == list(pd.to_datetime(csv["date"]))
+    assert list(df["code"]) == [GameCode.encode(row[-1]) for row in rows]
+    assert df["winner"].dtype == "int8"
+
+
+def test_refresh_reads_only_appended_complete_lines(stored_games):
+    stored_games(10)
+    meta = Snapshot.refresh(Database.DATA_FILE)
+    generation, offset = meta["generation"], meta["offset"]
+
+    stored_games(5, seed=1)
+    with open(Database.DATA_FILE, 'a') as data_file:
+        data_file.write("999,2025-12-31 10:00:00,1,0,")
+    meta = Snapshot.refresh(Database.DATA_FILE)
+    assert (meta["games"], meta["generation"]) == (15, generation)
+    assert meta["offset"] > offset
+
+    with open(Database.DATA_FILE, 'a') as data_file:
+        data_file.write('3,3,"[(5, 3), (4, 3), (5, 2), (4, 2), (5, 1), (4, 1)]"\n')
+    assert Snapshot.refresh(Database.DATA_FILE)["games"] == 16
+
+
+def test_rewritten_csv_rebuilds_the_snapshot(stored_games):
+    stored_games(10)
+    generation = Snapshot.refresh(Database.DATA_FILE)["generation"]
+
+    csv = pd.read_csv(Database.DATA_FILE)
+    csv.iloc[2:].to_csv(Database.DATA_FILE, index=False)
+    meta = Snapshot.refresh(Database.DATA_FILE)
+    assert (meta["games"], meta["generation"]) == (8, generation + 1)
+    assert list(Snapshot.load_dataframe(Database.DATA_FILE)["id"]) == list(csv["id"][2:])
+
+
+def test_rebuild_leaves_mapped_columns_intact(stored_games):
+    stored_games(10)
+    Snapshot.refresh(Database.DATA_FILE)
+    arrays = Snapshot.open()
+    ids = arrays["id"].tolist()
+    moves = arrays["move_columns"].tolist()
+
+    Database.delete_and_update_indices(pd.read_csv(Database.DATA_FILE).iloc[:5])
+    Snapshot.refresh(Database.DATA_FILE)
+
+    # A reader mapping the columns before the rebuild still reads the old games
+    assert arrays["id"].tolist() == ids
+    assert arrays["move_columns"].tolist() == moves
+    assert Snapshot.open()["id"].tolist() == list(range(1, 6))
+    assert not [name for name in os.listdir(Snapshot.SNAPSHOT_DIR) if name.endswith(".tmp")]
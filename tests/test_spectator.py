@@ -0,0 +1,67 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from Game import SpectatorServer, Variant
+
+
+@pytest.fixture
+def server():
+    with socket.socket() as probe:
+        probe.bind((SpectatorServer.HOST, 0))
+        port = probe.getsockname()[1]
+    spectator_server = SpectatorServer(port=port)
+    assert spectator_server.start()
+    yield spectator_server
+    spectator_server.stop()
+
+
+def connect(server):
+    connection = socket.create_connection((SpectatorServer.HOST, server._port), timeout=5)
+    # Wait for the server to register the spectator
+    deadline = time.monotonic() + 5
+    while len(server._clients) < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return connection
+
+
+def read_all(connection):
+    chunks = []
+    while True:
+        chunk = connection.recv(4096)
+        if not chunk:
+            return b"".join(chunks).decode()
+        chunks.append(chunk)
+
+
+def test_spectator_receives_the_game_so_far_then_the_live_events(server):
+    server.new_game(Variant.get())
+    server.move(5, 3, 1)
+    with connect(server) as connection:
+        server.move(5, 4, -1)
+        server.end(1)
+        server.stop()
+        assert read_all(connection) == "N 6 7\nM 5 3 1\nM 5 4 -1\nE 1\n"
+
+
+def test_slow_spectator_is_dropped_without_blocking_the_game(server, monkeypatch):
+    blocked = threading.Event()
+    monkeypatch.setattr(SpectatorServer, "_send", lambda self, client, events: blocked.wait(5))
+    server.new_game(Variant.get())
+    with connect(server):
+        start = time.perf_counter()
+        for index in range(SpectatorServer.MAX_PENDING + 1):
+            server.move(0, index % 7, 1)
+        assert time.perf_counter() - start < 0.5
+        assert server._clients == {}
+    blocked.set()
+
+
+def test_stopped_server_releases_its_port(server):
+    server.stop()
+    assert server._socket is None
+    with pytest.raises(OSError):
+        socket.create_connection((SpectatorServer.HOST, server._port), timeout=1).close()
+    assert server.start()
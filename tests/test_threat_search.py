@@ -0,0 +1,62 @@
+import sys
+
+import pytest
+
+from Game import EvaluationCache, IA, ThreatSearch, Variant
+
+from conftest import new_board, position
+
+
+def test_immediate_win_is_played():
+    search = ThreatSearch(position([0, 6, 1, 6, 2, 5]))
+    assert search.forced_win() == 3
+    assert search.get_nodes() == 0
+
+
+def test_double_threat_is_a_forced_win():
+    state = position([2, 6, 3, 6])
+    col = ThreatSearch(state).forced_win()
+    assert col == 4
+    state.play(col)
+    assert len(state.winning_moves(1)) == 2
+    # The search works on a copy
+    assert ThreatSearch(position([2, 6, 3, 6]))._state is not state
+
+
+def test_moves_letting_the_double_threat_through_are_losing():
+    search = ThreatSearch(position([2, 6, 3]))
+    assert search.forced_win() is None
+    assert search.losing_moves() == {0, 2, 3, 5, 6}
+    assert ThreatSearch(position([3])).losing_moves() == set()
+
+
+def test_search_gives_up_after_its_budget():
+    assert ThreatSearch(position([2, 6, 3, 6]), node_budget=0).forced_win() is None
+    assert ThreatSearch(position([2, 6, 3, 6]), max_depth=0).forced_win() is None
+    assert ThreatSearch(position([0, 6, 1, 6, 2, 5]), node_budget=0).forced_win() == 3
+
+
+def test_threat_solution_is_cached_for_the_mirror(monkeypatch):
+    plateau = new_board([2, 6, 3])
+    assert IA.threat_solution(plateau) == (None, {0, 2, 3, 5, 6})
+
+    def no_search(state):
+        raise AssertionError("the cached solution should be used")
+    monkeypatch.setattr(sys.modules["Game.Models.IA"], "ThreatSearch", no_search)
+    assert IA.threat_solution(new_board([4, 0, 3])) == (None, {0, 1, 3, 4, 6})
+    assert EvaluationCache.get(Variant.get()).lookup(position([2, 6, 3])) == (None, {0, 2, 3, 5, 6})
+
+
+def test_best_move_avoids_losing_moves_unless_all_lose():
+    moves = {(5, 0): 10.0, (5, 3): 5.0, (5, 4): 1.0}
+    assert IA.best_move(moves) == (5, 0)
+    assert IA.best_move(moves, {0}) == (5, 3)
+    assert IA.best_move(moves, {0, 3, 4}) == (5, 0)
+
+
+@pytest.mark.parametrize("moves", [[2, 6, 3, 6], [0, 6, 1, 6, 2, 5]])
+def test_ai_plays_the_forced_win(moves):
+    plateau = new_board(moves, starter=-1)
+    expected = ThreatSearch(plateau.get_state()).forced_win()
+    IA.ia_choice(plateau)
+    assert plateau.get_shots()[-1][1] == expected